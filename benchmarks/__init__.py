@@ -0,0 +1,6 @@
+"""Benchmarks do motor de execução, sem rede e sem navegador instalado.
+
+As suítes rodam contra um site de teste local (site.py) e um servidor local
+que fala o protocolo WebDriver (webdriver_local.py); o cliente Selenium e o
+ExecutorTestes são os mesmos usados de verdade.
+"""
@@ -0,0 +1,310 @@
+"""Executa os benchmarks e grava os resultados para comparação entre execuções.
+
+Mede, para suítes de 10, 100 e 1.000 passos (todas as ações e tipos de
+seletor), passos por segundo, percentis da latência por passo, tempo de
+abertura da sessão e pico de memória do processo Python; além do tempo de
+importação do motor, de inicialização da interface (até a janela aparecer)
+e de carregamento/compilação de uma suíte grande.
+"""
+import argparse
+import datetime
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from selenium import webdriver
+
+from e2e.dados import PoolDados
+from e2e.execucao import ExecutorTestes
+from e2e.historico import percentil
+from e2e.plano import ESPERA_POLLING, MODOS_ESPERA, MODOS_RESOLUCAO, compilar_suite
+from e2e.rastreamento import CATEGORIA_DRIVER, CATEGORIA_SUITE, Rastreador
+from e2e.suite import Suite, carregar_suite, salvar_suite
+
+from .site import SiteTeste, gerar_elementos
+from .webdriver_local import ServidorWebDriver
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DIRETORIO_RESULTADOS = os.path.join(RAIZ, 'benchmarks', 'resultados')
+TAMANHOS_PADRAO = [10, 100, 1000]
+PERCENTIS = [50, 90, 95, 99]
+
+
+class ExecutorBenchmark(ExecutorTestes):
+    """ExecutorTestes que abre sessões no WebDriver local."""
+
+    def __init__(self, url_webdriver, **kwargs):
+        super().__init__(**kwargs)
+        self.url_webdriver = url_webdriver
+
+    def configurar_driver(self):
+        with self.rastreador.span('abertura do navegador', CATEGORIA_DRIVER, navegador='local'):
+            return webdriver.Remote(command_executor=self.url_webdriver, options=webdriver.ChromeOptions())
+
+
+def _servir(fila, parar, latencia):
+    site = SiteTeste().iniciar()
+    servidor = ServidorWebDriver(latencia=latencia).iniciar()
+    fila.put((site.url, servidor.url))
+    parar.wait()
+    servidor.encerrar()
+    site.encerrar()
+
+
+class Servidores:
+    """Site de teste e WebDriver local em um processo separado.
+
+    Assim o pico de memória e o tempo de CPU medidos são só do motor.
+    """
+
+    def __init__(self, latencia=0.0):
+        self.latencia = latencia
+        self._parar = multiprocessing.Event()
+        self._fila = multiprocessing.Queue()
+        self._processo = multiprocessing.Process(target=_servir, args=(self._fila, self._parar, latencia),
+                                                 daemon=True)
+
+    def __enter__(self):
+        self._processo.start()
+        self.url_site, self.url_webdriver = self._fila.get(timeout=30)
+        return self
+
+    def __exit__(self, *excecao):
+        self._parar.set()
+        self._processo.join(timeout=5)
+
+    def url_suite(self, quantidade):
+        return f"{self.url_site}/suite/{quantidade}.html"
+
+
+def medir_importacao(repeticoes=3):
+    """Tempo (ms) para importar o motor em um processo Python novo."""
+    codigo = ("import time; inicio = time.perf_counter(); import e2e.execucao; "
+              "print(time.perf_counter() - inicio)")
+    ambiente = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [RAIZ, os.environ.get('PYTHONPATH')])))
+    tempos = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True,
+                               env=ambiente, cwd=RAIZ)
+        tempos.append(float(saida.stdout.strip()) * 1000)
+    return statistics.median(tempos)
+
+
+def medir_interface(repeticoes=3):
+    """Inicialização da interface (main.py --relatorio-inicializacao) em processos novos.
+
+    Devolve o relatório da execução mediana, com o tempo total do processo em
+    `processo_ms`, ou None se a interface não puder ser aberta (ex.: sem PyQt5).
+    """
+    ambiente = dict(os.environ, QT_QPA_PLATFORM='offscreen',
+                    PYTHONPATH=os.pathsep.join(filter(None, [RAIZ, os.environ.get('PYTHONPATH')])))
+    relatorios = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            try:
+                saida = subprocess.run([sys.executable, os.path.join(RAIZ, 'main.py'), '--relatorio-inicializacao'],
+                                       capture_output=True, text=True, check=True, env=ambiente, cwd=diretorio,
+                                       timeout=60)
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired):
+                return None
+            processo_ms = (time.perf_counter() - inicio) * 1000
+            linha = next((linha for linha in reversed(saida.stdout.splitlines()) if linha.startswith('{')), None)
+            if linha is None:
+                return None
+            relatorios.append(dict(json.loads(linha), processo_ms=processo_ms))
+    return sorted(relatorios, key=lambda relatorio: relatorio['total_ms'])[len(relatorios) // 2]
+
+
+def medir_carregamento(quantidade, repeticoes=5):
+    """Tempo (ms) para carregar e compilar uma suíte JSON de `quantidade` passos."""
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, 'suite.json')
+        salvar_suite(Suite('benchmark', gerar_elementos(quantidade), 'http://localhost/'), caminho)
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            compilar_suite(carregar_suite(caminho))
+            tempos.append((time.perf_counter() - inicio) * 1000)
+    return statistics.median(tempos)
+
+
+def _executar_uma_vez(servidores, plano, resolucao, espera, screenshot_dir, medir_memoria=False, metricas=False):
+    # Como no AgendadorSuites, os valores random: são gerados antes da execução.
+    dados = PoolDados(semente=0)
+    dados.preparar([plano])
+    valores = dados.reservar(plano)
+    rastreador = Rastreador()
+    executor = ExecutorBenchmark(servidores.url_webdriver, screenshot_dir=screenshot_dir, log=lambda mensagem: None,
+                                 resolucao=resolucao, espera=espera, rastreador=rastreador, dados=dados,
+                                 metricas=metricas)
+    if medir_memoria:
+        tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = executor.executar_plano(plano, valores)
+    duracao = time.perf_counter() - inicio
+    pico = None
+    if medir_memoria:
+        pico = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    if not resultado.sucesso:
+        falhas = [passo.erro for passo in resultado.passos if not passo.sucesso]
+        raise RuntimeError(f"Suíte de benchmark falhou: {resultado.erro or falhas[:3]}")
+
+    spans = {}
+    for nome, categoria, inicio_span, fim_span, _, _ in rastreador.spans:
+        spans.setdefault((categoria, nome), []).append(fim_span - inicio_span)
+    return {
+        'duracao': duracao,
+        'sessao': sum(spans.get((CATEGORIA_DRIVER, 'abertura do navegador'), [])),
+        'passos': spans.get((CATEGORIA_SUITE, 'passo'), []),
+        'comandos': resultado.comandos_webdriver,
+        'pico_memoria': pico,
+    }
+
+
+def medir_cenario(servidores, quantidade, resolucao, espera, repeticoes, metricas=False):
+    plano = compilar_suite(Suite(f"benchmark {quantidade}", gerar_elementos(quantidade),
+                                 servidores.url_suite(quantidade)))
+    with tempfile.TemporaryDirectory() as screenshot_dir:
+        # tracemalloc deixa a execução mais lenta: a memória é medida à parte.
+        execucoes = [_executar_uma_vez(servidores, plano, resolucao, espera, screenshot_dir, metricas=metricas)
+                     for _ in range(repeticoes)]
+        memoria = _executar_uma_vez(servidores, plano, resolucao, espera, screenshot_dir, medir_memoria=True,
+                                    metricas=metricas)
+
+    latencias = [duracao * 1000 for execucao in execucoes for duracao in execucao['passos']]
+    return {
+        'passos': quantidade,
+        'resolucao': resolucao,
+        'espera': espera,
+        'metricas': metricas,
+        'passos_por_segundo': statistics.median(
+            quantidade / (execucao['duracao'] - execucao['sessao']) for execucao in execucoes),
+        'latencia_passo_ms': dict({f"p{p}": percentil(latencias, p) for p in PERCENTIS}, max=max(latencias)),
+        'sessao_ms': statistics.median(execucao['sessao'] * 1000 for execucao in execucoes),
+        'comandos_webdriver': execucoes[0]['comandos'],
+        'pico_memoria_kb': memoria['pico_memoria'] / 1024,
+    }
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=RAIZ, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _ultimo_resultado(diretorio):
+    if not os.path.isdir(diretorio):
+        return None
+    arquivos = sorted(nome for nome in os.listdir(diretorio) if nome.endswith('.json'))
+    return os.path.join(diretorio, arquivos[-1]) if arquivos else None
+
+
+def _chave_cenario(cenario):
+    return cenario['passos'], cenario['resolucao'], cenario['espera'], cenario.get('metricas', False)
+
+
+def _variacao(atual, anterior):
+    if not anterior:
+        return ''
+    return f" ({(atual - anterior) / anterior * 100:+.1f}%)"
+
+
+def imprimir(resultados, anteriores=None):
+    interface_anterior = ((anteriores or {}).get('inicializacao') or {}).get('interface') or {}
+    anteriores = {_chave_cenario(cenario): cenario for cenario in (anteriores or {}).get('cenarios', [])}
+    print(f"Importação do motor: {resultados['inicializacao']['importacao_ms']:.1f} ms")
+    interface = resultados['inicializacao'].get('interface')
+    if interface:
+        print(f"Interface: janela exibida em {interface['total_ms']:.1f} ms"
+              f"{_variacao(interface['total_ms'], interface_anterior.get('total_ms'))}, "
+              f"processo {interface['processo_ms']:.1f} ms")
+        if interface['modulos_adiados_carregados']:
+            print(f"⚠️ Carregados na inicialização: {', '.join(interface['modulos_adiados_carregados'])}")
+    carregamento = resultados['carregamento']
+    print(f"Carregar + compilar suíte de {carregamento['passos']} passos: {carregamento['ms']:.1f} ms")
+    print()
+    print(f"{'Passos':>6} {'Resolução':<9} {'Espera':<8} {'Métricas':<8} {'Passos/s':>18} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+          f"{'p99 (ms)':>9} {'Sessão (ms)':>11} {'Comandos':>8} {'Memória (KB)':>20}")
+    for cenario in resultados['cenarios']:
+        anterior = anteriores.get(_chave_cenario(cenario), {})
+        latencia = cenario['latencia_passo_ms']
+        passos_por_segundo = f"{cenario['passos_por_segundo']:.1f}" + _variacao(
+            cenario['passos_por_segundo'], anterior.get('passos_por_segundo'))
+        memoria = f"{cenario['pico_memoria_kb']:.0f}" + _variacao(
+            cenario['pico_memoria_kb'], anterior.get('pico_memoria_kb'))
+        metricas = 'sim' if cenario.get('metricas') else 'não'
+        print(f"{cenario['passos']:>6} {cenario['resolucao']:<9} {cenario['espera']:<8} {metricas:<8} "
+              f"{passos_por_segundo:>18} "
+              f"{latencia['p50']:>9.2f} {latencia['p95']:>9.2f} {latencia['p99']:>9.2f} "
+              f"{cenario['sessao_ms']:>11.1f} {cenario['comandos_webdriver']:>8} {memoria:>20}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.splitlines()[0])
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO,
+                        help='Quantidade de passos de cada suíte (padrão: 10 100 1000)')
+    parser.add_argument('--resolucao', nargs='+', choices=MODOS_RESOLUCAO, default=list(MODOS_RESOLUCAO),
+                        help='Modos de resolução de elementos a medir')
+    parser.add_argument('--espera', nargs='+', choices=MODOS_ESPERA, default=[ESPERA_POLLING],
+                        help='Modos de espera a medir')
+    parser.add_argument('--metricas-pagina', action='store_true',
+                        help='Mede também cada cenário com a leitura das métricas de desempenho da página')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Execuções por cenário (padrão: 3)')
+    parser.add_argument('--latencia-ms', type=float, default=0.0,
+                        help='Atraso simulado por comando no WebDriver local (padrão: 0)')
+    parser.add_argument('--resultados', default=DIRETORIO_RESULTADOS,
+                        help='Diretório onde os resultados são gravados')
+    parser.add_argument('--comparar', metavar='ARQUIVO',
+                        help='Resultado anterior para comparação (padrão: o mais recente do diretório)')
+    parser.add_argument('--nao-salvar', action='store_true', help='Não grava o resultado desta execução')
+    args = parser.parse_args(argv)
+
+    resultados = {
+        'data': datetime.datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit_atual(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'parametros': {'repeticoes': args.repeticoes, 'latencia_ms': args.latencia_ms},
+        'inicializacao': {'importacao_ms': medir_importacao(), 'interface': medir_interface()},
+        'carregamento': {'passos': max(args.tamanhos), 'ms': medir_carregamento(max(args.tamanhos))},
+        'cenarios': [],
+    }
+
+    with Servidores(args.latencia_ms / 1000) as servidores:
+        for espera in args.espera:
+            for resolucao in args.resolucao:
+                for quantidade in args.tamanhos:
+                    for metricas in ([False, True] if args.metricas_pagina else [False]):
+                        print(f"⏳ {quantidade} passos, resolução {resolucao}, espera {espera}"
+                              f"{', com métricas da página' if metricas else ''}...", flush=True)
+                        resultados['cenarios'].append(
+                            medir_cenario(servidores, quantidade, resolucao, espera, args.repeticoes, metricas))
+
+    comparar = args.comparar or _ultimo_resultado(args.resultados)
+    anteriores = None
+    if comparar:
+        with open(comparar, 'r', encoding='utf-8') as arquivo:
+            anteriores = json.load(arquivo)
+        print(f"\nComparando com {comparar} (commit {anteriores.get('commit')})")
+    print()
+    imprimir(resultados, anteriores)
+
+    if not args.nao_salvar:
+        os.makedirs(args.resultados, exist_ok=True)
+        caminho = os.path.join(args.resultados, datetime.datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultado salvo em {caminho}")
+    return 0
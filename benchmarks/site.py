@@ -0,0 +1,104 @@
+"""Site de teste local e suítes representativas para os benchmarks.
+
+A página /suite/N.html tem os elementos usados pela suíte de N passos gerada
+por gerar_elementos; os passos alternam todas as ações e tipos de seletor.
+"""
+import html
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# (ação, tipo de seletor) de cada passo, em ciclo.
+CICLO_PASSOS = [
+    ('Inserir Texto', 'ID'),
+    ('Inserir Texto', 'Name'),
+    ('Verificar Texto', 'CSS Selector'),
+    ('Verificar Existência', 'Class Name'),
+    ('Clicar', 'XPath'),
+    ('Clicar', 'Link Text'),
+]
+
+
+def gerar_elementos(quantidade):
+    """Lista de elementos (formato da suíte) com `quantidade` passos."""
+    elementos = []
+    for i in range(quantidade):
+        acao, tipo_seletor = CICLO_PASSOS[i % len(CICLO_PASSOS)]
+        seletor, valor = {
+            'ID': (f"campo_{i}", f"texto {i}"),
+            'Name': (f"campo_{i}", 'random:email'),
+            'CSS Selector': (f"#texto_{i}", f"Texto {i}"),
+            'Class Name': (f"item_{i}", ''),
+            'XPath': (f"//button[@id='botao_{i}']", ''),
+            'Link Text': (f"Link {i}", ''),
+        }[tipo_seletor]
+        elementos.append({
+            'elemento': f"{acao} {i}",
+            'tipo_seletor': tipo_seletor,
+            'seletor': seletor,
+            'acao': acao,
+            'valor': valor,
+        })
+    return elementos
+
+
+def gerar_pagina(quantidade):
+    linhas = ['<!DOCTYPE html>', '<html><head><title>Benchmark</title></head><body>', '<form>']
+    for i in range(quantidade):
+        acao, tipo_seletor = CICLO_PASSOS[i % len(CICLO_PASSOS)]
+        if tipo_seletor == 'ID':
+            linhas.append(f'<input type="text" id="campo_{i}">')
+        elif tipo_seletor == 'Name':
+            linhas.append(f'<input type="email" name="campo_{i}">')
+        elif tipo_seletor == 'CSS Selector':
+            linhas.append(f'<p id="texto_{i}">Texto {i}</p>')
+        elif tipo_seletor == 'Class Name':
+            linhas.append(f'<div class="item item_{i}">Item {i}</div>')
+        elif tipo_seletor == 'XPath':
+            linhas.append(f'<button type="button" id="botao_{i}">Botão {i}</button>')
+        else:
+            linhas.append(f'<a href="#">{html.escape(f"Link {i}")}</a>')
+    linhas += ['</form>', '</body></html>']
+    return "\n".join(linhas)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        encontrado = re.fullmatch(r'/suite/(\d+)\.html', self.path)
+        if not encontrado:
+            self.send_error(404)
+            return
+        corpo = gerar_pagina(int(encontrado.group(1))).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+class SiteTeste:
+    """Servidor HTTP local do site de teste, em uma thread."""
+
+    def __init__(self, host='127.0.0.1', porta=0):
+        self.servidor = ThreadingHTTPServer((host, porta), _Handler)
+        self.servidor.daemon_threads = True
+        self._thread = threading.Thread(target=self.servidor.serve_forever, name='site-teste', daemon=True)
+
+    @property
+    def url(self):
+        host, porta = self.servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def url_suite(self, quantidade):
+        return f"{self.url}/suite/{quantidade}.html"
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def encerrar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
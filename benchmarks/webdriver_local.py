@@ -0,0 +1,368 @@
+"""Servidor local que responde ao protocolo WebDriver (W3C) sem navegador.
+
+Implementa só os comandos usados pelo ExecutorTestes: a página é baixada do
+site de teste e interpretada com html.parser, e os scripts conhecidos
+(visibilidade, resolução em lote, espera por eventos, clique, limpeza de
+campo, captura e restauração de storage) são emulados em Python. Cookies e
+storage valem para a sessão inteira, sem separação por origem. Todos os
+elementos são considerados visíveis.
+Uma `latencia` opcional por comando simula o custo do navegador real.
+"""
+import base64
+import hashlib
+import json
+import re
+import struct
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+import zlib
+from html.parser import HTMLParser
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CHAVE_ELEMENTO = 'element-6066-11e4-a52e-4f735466cecf'
+ELEMENTOS_VAZIOS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta', 'source', 'wbr'}
+
+LARGURA_SCREENSHOT = 64
+
+
+def gerar_png(semente, largura=LARGURA_SCREENSHOT, altura=LARGURA_SCREENSHOT):
+    """PNG em tons de cinza cujo conteúdo depende de `semente` (bytes)."""
+    padrao = hashlib.sha256(semente).digest()
+    linhas = b''.join(b'\x00' + bytes(padrao[(y + x) % len(padrao)] for x in range(largura))
+                      for y in range(altura))
+
+    def bloco(tipo, conteudo):
+        return (struct.pack('>I', len(conteudo)) + tipo + conteudo
+                + struct.pack('>I', zlib.crc32(tipo + conteudo) & 0xffffffff))
+
+    cabecalho = struct.pack('>IIBBBBB', largura, altura, 8, 0, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + bloco(b'IHDR', cabecalho)
+            + bloco(b'IDAT', zlib.compress(linhas, 1)) + bloco(b'IEND', b''))
+
+
+class ErroWebDriver(Exception):
+    def __init__(self, status, erro, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+        self.erro = erro
+
+
+class No:
+    def __init__(self, tag, atributos):
+        self.id = uuid.uuid4().hex
+        self.tag = tag
+        self.atributos = atributos
+        self.partes_texto = []
+        self.valor = atributos.get('value', '')
+
+    @property
+    def texto(self):
+        return " ".join("".join(self.partes_texto).split())
+
+    @property
+    def classes(self):
+        return self.atributos.get('class', '').split()
+
+
+class _Interpretador(HTMLParser):
+    def __init__(self):
+        super().__init__()
+        self.nos = []
+        self._abertos = []
+
+    def handle_starttag(self, tag, attrs):
+        no = No(tag, {nome: valor or '' for nome, valor in attrs})
+        self.nos.append(no)
+        if tag not in ELEMENTOS_VAZIOS:
+            self._abertos.append(no)
+
+    def handle_endtag(self, tag):
+        for posicao in range(len(self._abertos) - 1, -1, -1):
+            if self._abertos[posicao].tag == tag:
+                del self._abertos[posicao:]
+                break
+
+    def handle_data(self, data):
+        for no in self._abertos:
+            no.partes_texto.append(data)
+
+
+def _filtro_css(seletor):
+    if re.fullmatch(r'#[\w-]+', seletor):
+        return lambda no: no.atributos.get('id') == seletor[1:]
+    if re.fullmatch(r'\.[\w-]+', seletor):
+        return lambda no: seletor[1:] in no.classes
+    atributo = re.fullmatch(r'''(\w*)\[([\w-]+)=["']?(.*?)["']?\]''', seletor)
+    if atributo:
+        tag, nome, valor = atributo.groups()
+        return lambda no: (not tag or no.tag == tag) and no.atributos.get(nome) == valor
+    if re.fullmatch(r'\w+', seletor):
+        return lambda no: no.tag == seletor
+    return None
+
+
+def _filtro_xpath(seletor):
+    encontrado = re.fullmatch(r'''//(\*|\w+)\[@([\w-]+)=["'](.*)["']\]''', seletor)
+    if not encontrado:
+        return None
+    tag, nome, valor = encontrado.groups()
+    return lambda no: (tag == '*' or no.tag == tag) and no.atributos.get(nome) == valor
+
+
+def filtro_localizador(por, seletor):
+    """Função que diz se um nó corresponde ao localizador; None se não suportado."""
+    if por == 'id':
+        return lambda no: no.atributos.get('id') == seletor
+    if por == 'name':
+        return lambda no: no.atributos.get('name') == seletor
+    if por == 'class name':
+        return lambda no: seletor in no.classes
+    if por == 'link text':
+        return lambda no: no.tag == 'a' and no.texto == seletor
+    if por == 'css selector':
+        return _filtro_css(seletor)
+    if por == 'xpath':
+        return _filtro_xpath(seletor)
+    return None
+
+
+class Sessao:
+    def __init__(self):
+        self.id = uuid.uuid4().hex
+        self.url = 'about:blank'
+        self.nos = []
+        self.por_id = {}
+        self.cliques = 0
+        self.tamanho_janela = {'x': 0, 'y': 0, 'width': 1280, 'height': 800}
+        self.cookies = {}
+        self.storage = {'local': {}, 'sessao': {}}
+        self.navegacao_informada = False
+        self.janelas = ['janela-1']
+        self.janela = 'janela-1'
+
+    def nova_janela(self):
+        # Uma aba nova começa sem sessionStorage.
+        self.janela = f"janela-{len(self.janelas) + 1}"
+        self.janelas.append(self.janela)
+        self.storage['sessao'] = {}
+        self.navegar('about:blank')
+        return self.janela
+
+    def navegar(self, url):
+        interpretador = _Interpretador()
+        if url != 'about:blank':
+            try:
+                with urllib.request.urlopen(url) as resposta:
+                    interpretador.feed(resposta.read().decode('utf-8'))
+            except urllib.error.HTTPError as erro:
+                # Como o navegador, mostra a página de erro do servidor.
+                interpretador.feed(erro.read().decode('utf-8', 'replace'))
+        self.url = url
+        self.nos = interpretador.nos
+        self.por_id = {no.id: no for no in self.nos}
+        self.navegacao_informada = False
+
+    def localizar(self, por, seletor):
+        filtro = filtro_localizador(por, seletor)
+        if filtro is None:
+            raise ErroWebDriver(400, 'invalid selector', f"Seletor não suportado: {por} {seletor}")
+        return next((no for no in self.nos if filtro(no)), None)
+
+    def no(self, elemento_id):
+        no = self.por_id.get(elemento_id)
+        if no is None:
+            raise ErroWebDriver(404, 'stale element reference', f"Elemento desconhecido: {elemento_id}")
+        return no
+
+    def screenshot(self, no=None):
+        """PNG que muda conforme o estado da página (valores dos campos, cliques)."""
+        nos = [no] if no else self.nos
+        estado = "|".join(f"{no.id}={no.valor}" for no in nos) + f"|{self.url}|{self.cliques}"
+        return base64.b64encode(gerar_png(estado.encode('utf-8'))).decode('ascii')
+
+    def referencia(self, no):
+        return {CHAVE_ELEMENTO: no.id} if no else None
+
+    def executar_script(self, script, argumentos):
+        argumentos = [self.no(a[CHAVE_ELEMENTO]) if isinstance(a, dict) and CHAVE_ELEMENTO in a else a
+                      for a in argumentos]
+        if '/* isDisplayed */' in script:
+            return True
+        if 'arguments[0].map(localizar)' in script:
+            return [self.referencia(self.localizar(por, seletor)) for por, seletor in argumentos[0]]
+        if 'new MutationObserver' in script:
+            return self.referencia(self.localizar(*argumentos[0]))
+        if '/* capturarEstado */' in script:
+            return {tipo: dict(valores) for tipo, valores in self.storage.items()}
+        if '/* restaurarEstado */' in script:
+            for tipo, valores in argumentos[0].items():
+                self.storage[tipo].update(valores)
+            return None
+        if '/* coletarMetricas */' in script:
+            # Sem motor de renderização: só o "carregamento" é informado, uma vez por página.
+            metricas = {'recursos': 0, 'bytes_recursos': 0, 'recurso_mais_lento_ms': 0}
+            if not self.navegacao_informada:
+                self.navegacao_informada = True
+                metricas.update(ttfb_ms=1.0, dom_carregado_ms=2.0, carregamento_ms=2.0, bytes_documento=0)
+            return metricas
+        if 'localStorage.clear()' in script:
+            self.storage = {'local': {}, 'sessao': {}}
+            partes = urllib.parse.urlsplit(self.url)
+            return f"{partes.scheme}://{partes.netloc}" if partes.netloc else 'null'
+        if "arguments[0].value = ''" in script:
+            argumentos[0].valor = ''
+        elif 'arguments[0].click()' in script:
+            self.cliques += 1
+        return None
+
+
+class ServidorWebDriver:
+    """Servidor WebDriver local, em uma thread."""
+
+    def __init__(self, host='127.0.0.1', porta=0, latencia=0.0):
+        self.sessoes = {}
+        self.latencia = latencia
+        self.comandos = 0
+        self.servidor = ThreadingHTTPServer((host, porta), _HandlerWebDriver)
+        self.servidor.daemon_threads = True
+        self.servidor.webdriver = self
+        self._thread = threading.Thread(target=self.servidor.serve_forever, name='webdriver-local', daemon=True)
+
+    @property
+    def url(self):
+        host, porta = self.servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def iniciar(self):
+        self._thread.start()
+        return self
+
+    def encerrar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+    def tratar(self, metodo, caminho, corpo):
+        self.comandos += 1
+        if self.latencia:
+            time.sleep(self.latencia)
+
+        partes = [parte for parte in caminho.split('/') if parte]
+        if partes == ['status']:
+            return {'ready': True, 'message': 'webdriver local'}
+        if partes == ['session'] and metodo == 'POST':
+            sessao = Sessao()
+            self.sessoes[sessao.id] = sessao
+            return {'sessionId': sessao.id, 'capabilities': {'browserName': 'local', 'browserVersion': '1'}}
+        if len(partes) < 2 or partes[0] != 'session' or partes[1] not in self.sessoes:
+            raise ErroWebDriver(404, 'invalid session id', f"Sessão desconhecida: {caminho}")
+
+        sessao = self.sessoes[partes[1]]
+        comando = partes[2:]
+        if not comando and metodo == 'DELETE':
+            del self.sessoes[sessao.id]
+            return None
+        if comando == ['url']:
+            if metodo == 'POST':
+                sessao.navegar(corpo['url'])
+                return None
+            return sessao.url
+        if comando == ['title']:
+            titulo = next((no.texto for no in sessao.nos if no.tag == 'title'), '')
+            return titulo
+        if comando in (['element'], ['elements']):
+            filtro = filtro_localizador(corpo['using'], corpo['value'])
+            if filtro is None:
+                raise ErroWebDriver(400, 'invalid selector', f"Seletor não suportado: {corpo}")
+            nos = [no for no in sessao.nos if filtro(no)]
+            if comando == ['elements']:
+                return [sessao.referencia(no) for no in nos]
+            if not nos:
+                raise ErroWebDriver(404, 'no such element', f"Elemento não encontrado: {corpo['value']}")
+            return sessao.referencia(nos[0])
+        if comando[:1] == ['element'] and len(comando) == 3:
+            no = sessao.no(comando[1])
+            if comando[2] == 'text':
+                return no.texto
+            if comando[2] == 'value':
+                no.valor += corpo.get('text', '')
+                return None
+            if comando[2] == 'clear':
+                no.valor = ''
+                return None
+            if comando[2] == 'click':
+                sessao.cliques += 1
+                return None
+            if comando[2] == 'displayed':
+                return True
+            if comando[2] == 'name':
+                return no.tag
+            if comando[2] == 'screenshot':
+                return sessao.screenshot(no)
+        if comando in (['execute', 'sync'], ['execute', 'async']):
+            return sessao.executar_script(corpo['script'], corpo.get('args', []))
+        if comando == ['timeouts']:
+            return None
+        if comando == ['screenshot']:
+            return sessao.screenshot()
+        if comando == ['window']:
+            if metodo == 'DELETE':
+                sessao.janelas.remove(sessao.janela)
+                return list(sessao.janelas)
+            if metodo == 'POST':
+                if corpo['handle'] not in sessao.janelas:
+                    raise ErroWebDriver(404, 'no such window', f"Janela desconhecida: {corpo['handle']}")
+                sessao.janela = corpo['handle']
+                return None
+            return sessao.janela
+        if comando == ['window', 'new']:
+            return {'handle': sessao.nova_janela(), 'type': 'tab'}
+        if comando == ['window', 'handles']:
+            return list(sessao.janelas)
+        if comando == ['window', 'rect']:
+            if metodo == 'POST':
+                sessao.tamanho_janela.update({chave: valor for chave, valor in corpo.items() if valor is not None})
+            return sessao.tamanho_janela
+        if comando == ['cookie']:
+            if metodo == 'POST':
+                sessao.cookies[corpo['cookie']['name']] = corpo['cookie']
+                return None
+            if metodo == 'DELETE':
+                sessao.cookies.clear()
+                return None
+            return list(sessao.cookies.values())
+        raise ErroWebDriver(404, 'unknown command', f"Comando não suportado: {metodo} {caminho}")
+
+
+class _HandlerWebDriver(BaseHTTPRequestHandler):
+    def _responder(self, metodo):
+        tamanho = int(self.headers.get('Content-Length') or 0)
+        corpo = json.loads(self.rfile.read(tamanho) or b'{}') if tamanho else {}
+        try:
+            status, resposta = 200, {'value': self.server.webdriver.tratar(metodo, self.path, corpo)}
+        except ErroWebDriver as e:
+            status, resposta = e.status, {'value': {'error': e.erro, 'message': str(e), 'stacktrace': ''}}
+        except Exception as e:
+            status, resposta = 500, {'value': {'error': 'unknown error', 'message': str(e), 'stacktrace': ''}}
+
+        dados = json.dumps(resposta).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_GET(self):
+        self._responder('GET')
+
+    def do_POST(self):
+        self._responder('POST')
+
+    def do_DELETE(self):
+        self._responder('DELETE')
+
+    def log_message(self, formato, *args):
+        pass
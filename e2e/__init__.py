@@ -0,0 +1 @@
+"""Núcleo de execução dos testes E2E, utilizável sem interface gráfica."""
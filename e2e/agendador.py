@@ -0,0 +1,121 @@
+"""Execução paralela de vários planos em um conjunto de sessões de navegador.
+
+Cada navegador tem seu próprio limite de sessões simultâneas; as suítes são
+distribuídas entre essas sessões e cada uma recebe pasta de screenshots e
+arquivo de log próprios.
+"""
+import datetime
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .dados import PoolDados
+from .execucao import ErroDriver, ExecutorTestes, ResultadoSuite
+from .suite import NAVEGADOR_PADRAO
+
+
+class AgendadorSuites:
+    """Distribui suítes entre `sessoes[navegador]` navegadores simultâneos.
+
+    `sessoes` mapeia o nome do navegador para o número de sessões; navegadores
+    ausentes usam uma única sessão. `log` recebe as mensagens de todas as
+    suítes, prefixadas com o identificador da suíte. Com um `pool`, cada
+    sessão reaproveita o navegador entre as suítes que executa.
+    `opcoes_executor` é repassado a cada ExecutorTestes. Os valores
+    `random:` de todas as suítes saem de um único PoolDados (o de
+    `opcoes_executor['dados']`, se houver), reservados na ordem dos planos.
+    As suítes que salvam um estado de sessão terminam antes que as demais
+    comecem.
+    """
+
+    def __init__(self, sessoes=None, screenshot_dir='error_screenshots', log_dir='logs', log=None,
+                 pool=None, opcoes_executor=None):
+        self.sessoes = sessoes or {}
+        self.pool = pool
+        self.opcoes_executor = dict(opcoes_executor or {})
+        self.dados = self.opcoes_executor.get('dados') or PoolDados()
+        self.opcoes_executor['dados'] = self.dados
+        self.screenshot_dir = screenshot_dir
+        self.log_dir = log_dir
+        self.log = log or (lambda mensagem: None)
+        self.cancelado = threading.Event()
+        self._executores = set()
+        self._lock = threading.Lock()
+
+    def sessoes_para(self, navegador):
+        return max(1, self.sessoes.get(navegador, 1))
+
+    def cancelar(self):
+        self.cancelado.set()
+        with self._lock:
+            for executor in self._executores:
+                executor.cancelar()
+
+    def executar(self, planos):
+        """Executa os planos compilados e devolve os ResultadoSuite na ordem recebida."""
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        # Reservar antes de distribuir deixa os valores de cada suíte iguais
+        # aos de outra execução com a mesma semente, qualquer que seja a ordem
+        # em que as sessões terminem.
+        self.dados.preparar(planos)
+        valores = [self.dados.reservar(plano) for plano in planos]
+
+        # Suítes que salvam um estado de sessão rodam antes das demais, que
+        # podem restaurá-lo em vez de repetir o login.
+        etapas = [[indice for indice, plano in enumerate(planos) if plano.salvar_estado],
+                  [indice for indice, plano in enumerate(planos) if not plano.salvar_estado]]
+
+        resultados = [None] * len(planos)
+        pools = {}
+        try:
+            for etapa in etapas:
+                futuros = {}
+                for indice in etapa:
+                    navegador = planos[indice].navegador or NAVEGADOR_PADRAO
+                    if navegador not in pools:
+                        pools[navegador] = ThreadPoolExecutor(max_workers=self.sessoes_para(navegador),
+                                                              thread_name_prefix=f'sessao-{navegador}')
+                    futuro = pools[navegador].submit(self._executar_plano, indice, planos[indice], navegador,
+                                                     valores[indice])
+                    futuros[futuro] = indice
+
+                for futuro in as_completed(futuros):
+                    resultados[futuros[futuro]] = futuro.result()
+
+        except KeyboardInterrupt:
+            self.cancelar()
+            raise
+
+        finally:
+            for pool in pools.values():
+                pool.shutdown(wait=True)
+
+        return resultados
+
+    def _executar_plano(self, indice, plano, navegador, valores):
+        identificador = f"{indice + 1:03d}_{plano.nome}"
+        if self.cancelado.is_set():
+            return ResultadoSuite(plano.nome, cancelado=True)
+
+        caminho_log = os.path.join(self.log_dir, f"{identificador}.log")
+        with open(caminho_log, 'w', encoding='utf-8') as arquivo_log:
+            def log(mensagem):
+                arquivo_log.write(f"{datetime.datetime.now():%Y-%m-%d %H:%M:%S} {mensagem}\n")
+                self.log(f"[{identificador}] {mensagem}")
+
+            executor = ExecutorTestes(navegador, os.path.join(self.screenshot_dir, identificador),
+                                      log=log, pool=self.pool, **self.opcoes_executor)
+            with self._lock:
+                self._executores.add(executor)
+            if self.cancelado.is_set():
+                executor.cancelar()
+
+            try:
+                return executor.executar_plano(plano, valores)
+            except ErroDriver as e:
+                log(f"❌ {e}")
+                return ResultadoSuite(plano.nome, erro=str(e))
+            finally:
+                with self._lock:
+                    self._executores.discard(executor)
@@ -0,0 +1,234 @@
+"""Teste de carga: a mesma suíte executada por vários usuários virtuais.
+
+Cada usuário virtual é uma thread com o seu navegador (reaproveitado entre
+as iterações por um PoolSessoes) que repete a suíte até o fim da duração,
+com uma pausa de "pensamento" entre os passos e entre as iterações. Os
+usuários entram aos poucos ao longo da rampa. Durante a execução, um resumo
+parcial é enviado ao `log` a cada intervalo; ao final, cada passo tem vazão,
+taxa de erros e percentis p50/p95/p99 da latência.
+"""
+import logging
+import os
+import random
+import threading
+import time
+from dataclasses import dataclass
+
+from .dados import PoolDados
+from .execucao import ErroDriver, ExecutorTestes, ResultadoSuite
+from .historico import percentil
+from .pool import PoolSessoes
+from .registro import registrar_evento
+from .suite import NAVEGADOR_PADRAO
+
+PERCENTIS_CARGA = (50, 95, 99)
+# Pausa mínima antes de tentar de novo quando o navegador não abre.
+PAUSA_ERRO_DRIVER = 1.0
+
+
+@dataclass
+class ConfiguracaoCarga:
+    """Usuários simultâneos, rampa e duração em segundos e pausa média entre passos.
+
+    A pausa de cada passo varia aleatoriamente em ±`variacao_pensamento`
+    (fração) em torno de `pensamento`.
+    """
+    usuarios: int = 1
+    rampa: float = 0.0
+    duracao: float = 60.0
+    pensamento: float = 1.0
+    variacao_pensamento: float = 0.5
+    intervalo_relatorio: float = 5.0
+
+
+class EstatisticasCarga:
+    """Durações e erros por passo, acumulados por todos os usuários; thread-safe."""
+
+    def __init__(self, plano):
+        self.plano = plano
+        self.iteracoes = 0
+        self.iteracoes_com_falha = 0
+        self.erros_criticos = 0
+        self._duracoes = {passo.indice: [] for passo in plano.passos}
+        self._erros = {passo.indice: 0 for passo in plano.passos}
+        self._parcial = []
+        self._lock = threading.Lock()
+
+    def registrar(self, resultado):
+        with self._lock:
+            self.iteracoes += 1
+            if not resultado.sucesso:
+                self.iteracoes_com_falha += 1
+            if resultado.erro:
+                # Navegador que não abriu, página que não carregou...: a iteração parou antes do fim.
+                self.erros_criticos += 1
+            for passo, resultado_passo in zip(self.plano.passos, resultado.passos):
+                if resultado_passo.pulado:
+                    continue
+                if resultado_passo.sucesso:
+                    # Só passos aprovados entram na latência: um erro costuma medir o timeout.
+                    self._duracoes[passo.indice].append(resultado_passo.duracao)
+                else:
+                    self._erros[passo.indice] += 1
+                self._parcial.append((resultado_passo.duracao, resultado_passo.sucesso))
+
+    def parcial(self):
+        """Passos executados, erros e p95 (ms) desde a chamada anterior."""
+        with self._lock:
+            parcial, self._parcial = self._parcial, []
+        duracoes = [duracao for duracao, sucesso in parcial if sucesso]
+        return len(parcial), len(parcial) - len(duracoes), percentil(duracoes, 95) * 1000
+
+    def resumo(self, decorrido):
+        """Uma entrada por passo: execuções, vazão (por segundo), taxa de erros e percentis em ms."""
+        with self._lock:
+            passos = []
+            for passo in self.plano.passos:
+                duracoes = self._duracoes[passo.indice]
+                erros = self._erros[passo.indice]
+                execucoes = len(duracoes) + erros
+                passos.append(dict(
+                    {'indice': passo.indice, 'elemento': passo.elemento, 'execucoes': execucoes,
+                     'vazao_por_s': execucoes / decorrido if decorrido else 0.0,
+                     'taxa_erros': erros / execucoes if execucoes else 0.0},
+                    **{f"p{p}_ms": percentil(duracoes, p) * 1000 for p in PERCENTIS_CARGA}))
+            return {'iteracoes': self.iteracoes, 'iteracoes_com_falha': self.iteracoes_com_falha,
+                    'erros_criticos': self.erros_criticos, 'duracao_s': decorrido, 'passos': passos}
+
+
+def tabela_carga(resumo):
+    """Texto com uma linha por passo, para o terminal."""
+    linhas = [f"{'Passo':<30} {'Execuções':>9} {'Vazão (/s)':>10} {'Erros':>7} {'p50 (ms)':>9} {'p95 (ms)':>9} "
+              f"{'p99 (ms)':>9}"]
+    for passo in resumo['passos']:
+        nome = f"{passo['indice'] + 1}. {passo['elemento']}"
+        linhas.append(f"{nome[:30]:<30} {passo['execucoes']:>9} {passo['vazao_por_s']:>10.2f} "
+                      f"{passo['taxa_erros']:>7.1%} {passo['p50_ms']:>9.0f} {passo['p95_ms']:>9.0f} "
+                      f"{passo['p99_ms']:>9.0f}")
+    return "\n".join(linhas)
+
+
+class TesteCarga:
+    """Executa `plano` com `configuracao.usuarios` usuários virtuais simultâneos.
+
+    `opcoes_executor` é repassado a cada ExecutorTestes. Os valores `random:`
+    de todas as iterações saem de um único PoolDados (o de
+    `opcoes_executor['dados']`, se houver), para que os únicos não se
+    repitam entre usuários e a semente reproduza o teste. O
+    `log` recebe o resumo parcial e os erros de navegador; as mensagens de
+    cada passo vão só para o logging, em nível DEBUG.
+    """
+
+    def __init__(self, plano, configuracao, screenshot_dir='error_screenshots', log=None, opcoes_executor=None):
+        self.plano = plano
+        self.configuracao = configuracao
+        self.screenshot_dir = screenshot_dir
+        self.log = log or (lambda mensagem: None)
+        self.opcoes_executor = dict(opcoes_executor or {})
+        self.dados = self.opcoes_executor.get('dados') or PoolDados()
+        self.opcoes_executor['dados'] = self.dados
+        self.estatisticas = EstatisticasCarga(plano)
+        self.cancelado = threading.Event()
+        self.ativos = 0
+        self._executores = set()
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def cancelar(self):
+        self.cancelado.set()
+        with self._lock:
+            for executor in self._executores:
+                executor.cancelar()
+
+    def _pensamento(self):
+        configuracao = self.configuracao
+        variacao = configuracao.pensamento * configuracao.variacao_pensamento
+        return max(0.0, random.uniform(configuracao.pensamento - variacao, configuracao.pensamento + variacao))
+
+    def _usuario(self, numero, partida, fim):
+        if self.cancelado.wait(max(0.0, partida - time.monotonic())):
+            return
+        executor = ExecutorTestes(self.plano.navegador or NAVEGADOR_PADRAO,
+                                  os.path.join(self.screenshot_dir, f"usuario_{numero:03d}"), log=logging.debug,
+                                  pool=self._pool, pensamento=self._pensamento, **self.opcoes_executor)
+        with self._lock:
+            self._executores.add(executor)
+            self.ativos += 1
+        if self.cancelado.is_set():
+            executor.cancelar()
+        try:
+            while time.monotonic() < fim and not self.cancelado.is_set():
+                try:
+                    resultado = executor.executar_plano(self.plano)
+                except ErroDriver as e:
+                    self.log(f"[usuário {numero}] ❌ {e}")
+                    resultado = ResultadoSuite(self.plano.nome, erro=str(e))
+                if resultado.cancelado:
+                    break
+                self.estatisticas.registrar(resultado)
+                pausa = self._pensamento()
+                if resultado.erro:
+                    pausa = max(pausa, PAUSA_ERRO_DRIVER)
+                if self.cancelado.wait(pausa):
+                    break
+        finally:
+            with self._lock:
+                self._executores.discard(executor)
+                self.ativos -= 1
+
+    def _relatar(self, inicio, terminou):
+        anterior = inicio
+        while not terminou.wait(self.configuracao.intervalo_relatorio):
+            agora = time.monotonic()
+            passos, erros, p95 = self.estatisticas.parcial()
+            self.log(f"📈 {agora - inicio:>5.0f} s | {self.ativos} usuário(s) | "
+                     f"{self.estatisticas.iteracoes} iteração(ões) | {passos / (agora - anterior):.1f} passos/s | "
+                     f"erros {erros / passos if passos else 0:.1%} | p95 {p95:.0f} ms")
+            anterior = agora
+
+    def executar(self):
+        """Executa o teste até o fim da duração e devolve o resumo (ver EstatisticasCarga.resumo).
+
+        As iterações em andamento no fim da duração terminam normalmente.
+        """
+        configuracao = self.configuracao
+        self._pool = PoolSessoes(max_ociosas=configuracao.usuarios)
+        inicio = time.monotonic()
+        fim = inicio + configuracao.duracao
+        intervalo_entrada = configuracao.rampa / configuracao.usuarios
+        usuarios = [threading.Thread(target=self._usuario,
+                                     args=(numero, inicio + (numero - 1) * intervalo_entrada, fim),
+                                     name=f"usuario-{numero:03d}", daemon=True)
+                    for numero in range(1, configuracao.usuarios + 1)]
+        terminou = threading.Event()
+        relator = threading.Thread(target=self._relatar, args=(inicio, terminou), name='carga-relatorio',
+                                   daemon=True)
+        self.log(f"🚦 {configuracao.usuarios} usuário(s) virtual(is), rampa de {configuracao.rampa:.0f} s, "
+                 f"duração de {configuracao.duracao:.0f} s, pausa média de {configuracao.pensamento:.1f} s")
+        try:
+            for usuario in usuarios:
+                usuario.start()
+            relator.start()
+            for usuario in usuarios:
+                # join com timeout para que o Ctrl+C chegue à thread principal.
+                while usuario.is_alive():
+                    usuario.join(0.5)
+        except KeyboardInterrupt:
+            self.cancelar()
+            for usuario in usuarios:
+                usuario.join()
+            raise
+        finally:
+            terminou.set()
+            relator.join()
+            self._pool.encerrar_todas()
+            self._pool = None
+
+        resumo = self.estatisticas.resumo(time.monotonic() - inicio)
+        resumo['cancelado'] = self.cancelado.is_set()
+        resumo['semente_dados'] = self.dados.semente
+        registrar_evento('carga', f"Teste de carga {self.plano.nome}: {resumo['iteracoes']} iteração(ões)",
+                         suite=self.plano.nome, usuarios=configuracao.usuarios,
+                         duracao_s=round(resumo['duracao_s'], 1), iteracoes=resumo['iteracoes'],
+                         iteracoes_com_falha=resumo['iteracoes_com_falha'], erros_criticos=resumo['erros_criticos'])
+        return resumo
@@ -0,0 +1,597 @@
+"""Executor de suítes em linha de comando, sem criar QApplication.
+
+    python -m e2e executar suite1.json suite2.json --navegador Chrome
+    python -m e2e executar suites/*.json --sessoes Chrome=4 --sessoes Firefox=2
+    python -m e2e regressoes
+    python -m e2e metricas --janela 10
+    python -m e2e comparar-perfis suite.json --perfis padrao rapido leve
+    python -m e2e carga suite.json --usuarios 20 --rampa 60 --duracao 300
+
+Retorna 0 quando todas as suítes passam, 1 quando alguma falha (ou, em
+`regressoes`, quando algum passo ficou mais lento; em `carga`, quando a taxa
+de erros passa do limite).
+"""
+import argparse
+import dataclasses
+import json
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+
+from .dados import PoolDados
+from .estado import DIRETORIO_ESTADOS, ArmazemEstados
+from .drivers import configurar_resolucao
+from .historico import (CAMINHO_HISTORICO_PADRAO, JANELA_BASE, LIMIAR_REGRESSAO, MINIMO_MS, RECENTES,
+                        VALIDADE_APROVACAO, HistoricoExecucoes, tabela_metricas, tabela_regressoes)
+from .perfis import PERFIL_PADRAO, PERFIS
+from .plano import (ESPERA_POLLING, MODOS_ESPERA, MODOS_RESOLUCAO, RESOLUCAO_PADRAO, ErroValidacao, compilar_suite,
+                    locale_disponivel)
+from .pool import PoolSessoes
+from .rastreamento import CATEGORIA_DRIVER, CATEGORIA_NAVEGACAO, Rastreador
+from .registro import configurar_logging
+from .screenshots import ConfiguracaoScreenshots, podar_screenshots
+from .suite import NAVEGADOR_PADRAO, NAVEGADORES, carregar_suite
+
+SAIDA_OK = 0
+SAIDA_FALHA = 1
+
+_lock_console = threading.Lock()
+
+
+def _imprimir(mensagem):
+    """print para as threads das sessões: uma linha inteira por vez, sem misturar suítes."""
+    with _lock_console:
+        print(mensagem, flush=True)
+
+
+def _sessoes(texto):
+    """Converte 'Chrome=4' em ('Chrome', 4); só um número vale para todos."""
+    navegador, _, quantidade = texto.rpartition('=')
+    if navegador and navegador not in NAVEGADORES:
+        raise argparse.ArgumentTypeError(f"navegador inválido: {navegador}")
+    try:
+        quantidade = int(quantidade)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"número de sessões inválido: {texto}")
+    if quantidade < 1:
+        raise argparse.ArgumentTypeError("o número de sessões deve ser maior que zero")
+    return navegador or None, quantidade
+
+
+def _versao_fixa(texto):
+    """Converte 'Chrome=114.0.5735.90' em ('Chrome', '114.0.5735.90')."""
+    navegador, _, versao = texto.partition('=')
+    if navegador not in NAVEGADORES or not versao:
+        raise argparse.ArgumentTypeError(f"use NAVEGADOR=VERSAO, ex.: Chrome=114.0.5735.90 (recebido {texto})")
+    return navegador, versao
+
+
+def _locale(texto):
+    if not locale_disponivel(texto):
+        raise argparse.ArgumentTypeError(f"locale desconhecido: {texto} (ex.: pt_BR, en_US)")
+    return texto
+
+
+def _positivo(tipo, zero=False):
+    """Conversor do argparse para números maiores que zero (ou que não sejam negativos)."""
+    def converter(texto):
+        try:
+            valor = tipo(texto)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"número inválido: {texto}")
+        if valor < 0 or (valor == 0 and not zero):
+            raise argparse.ArgumentTypeError(f"deve ser {'zero ou ' if zero else ''}maior que zero: {texto}")
+        return valor
+    return converter
+
+
+def _ajustar_suite(suite, args):
+    """Aplica à suíte as opções da linha de comando que sobrepõem as gravadas nela."""
+    suite.url = args.url or suite.url
+    suite.navegador = args.navegador or suite.navegador or NAVEGADOR_PADRAO
+    for opcao in ('timeout', 'perfil', 'falha_rapida', 'max_falhas_consecutivas'):
+        valor = getattr(args, opcao, None)
+        if valor is not None:
+            suite.opcoes[opcao] = valor
+    return suite
+
+
+def _argumentos_drivers(parser):
+    """Opções de resolução dos drivers, comuns aos comandos que abrem navegadores."""
+    parser.add_argument('--offline', action='store_true',
+                        help='Não baixa drivers: usa apenas o cache local ou o PATH')
+    parser.add_argument('--fixar-driver', type=_versao_fixa, action='append', default=[],
+                        metavar='NAVEGADOR=VERSAO', help='Fixa a versão do driver de um navegador')
+    parser.add_argument('--cache-drivers', help='Arquivo do cache de resolução de drivers')
+
+
+def _criar_parser():
+    parser = argparse.ArgumentParser(prog='python -m e2e',
+                                     description='Sistema de Testes Automatizados E2E')
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    executar = subparsers.add_parser('executar', help='Executa uma ou mais suítes salvas')
+    executar.add_argument('suites', nargs='+', help='Arquivos JSON das suítes')
+    executar.add_argument('--url', help='URL do teste (sobrepõe a URL salva na suíte)')
+    executar.add_argument('--navegador', choices=NAVEGADORES,
+                          help='Navegador (padrão: o salvo na suíte ou Chrome)')
+    executar.add_argument('--screenshots', default='error_screenshots',
+                          help='Pasta para screenshots de erro (uma subpasta por suíte)')
+    executar.add_argument('--screenshot-elemento', action='store_true',
+                          help='Captura só o elemento do passo com erro, quando ele foi localizado')
+    executar.add_argument('--screenshot-compressao', type=int, choices=range(10), metavar='0-9',
+                          help='Recomprime os PNGs sem perdas (9 = menor arquivo)')
+    executar.add_argument('--screenshots-max-mb', type=float, default=500,
+                          help='Tamanho máximo da pasta de screenshots; as mais antigas são removidas '
+                               '(padrão: 500, 0 = sem limite)')
+    executar.add_argument('--screenshots-max-arquivos', type=int,
+                          help='Quantidade máxima de screenshots mantidas na pasta')
+    executar.add_argument('--screenshots-max-dias', type=float,
+                          help='Remove screenshots com mais dias que este valor')
+    executar.add_argument('--logs', default='logs', help='Pasta para os logs de cada suíte')
+    executar.add_argument('--sessoes', type=_sessoes, action='append', default=[],
+                          metavar='[NAVEGADOR=]N',
+                          help='Sessões simultâneas por navegador (ex.: Chrome=4); pode repetir')
+    executar.add_argument('--reutilizar-sessoes', action='store_true',
+                          help='Mantém os navegadores abertos e os reaproveita entre as suítes')
+    executar.add_argument('--resolucao', choices=MODOS_RESOLUCAO, default=RESOLUCAO_PADRAO,
+                          help="'lote' localiza elementos com scripts em lote, com menos comandos WebDriver")
+    executar.add_argument('--espera', choices=MODOS_ESPERA, default=ESPERA_POLLING,
+                          help="'eventos' aguarda os elementos observando o DOM em vez de consultar a cada 0,5 s")
+    executar.add_argument('--timeout', type=_positivo(float),
+                          help='Espera máxima por elemento, em segundos (sobrepõe o timeout da suíte)')
+    executar.add_argument('--perfil', choices=list(PERFIS),
+                          help="Perfil de desempenho do navegador (sobrepõe a chave 'perfil' da suíte)")
+    executar.add_argument('--falha-rapida', action='store_true', default=None,
+                          help='Pula os passos seguintes assim que um passo falha (sobrepõe a suíte)')
+    executar.add_argument('--max-falhas-consecutivas', type=_positivo(int), metavar='N',
+                          help='Pula os passos restantes depois de N falhas seguidas (sobrepõe a suíte)')
+    executar.add_argument('--semente', type=int,
+                          help='Semente dos valores random: (repete os dados de uma execução anterior)')
+    executar.add_argument('--locale', type=_locale, help="Idioma dos valores random: (ex.: pt_BR); a chave 'locale' da "
+                                           "suíte tem prioridade")
+    _argumentos_drivers(executar)
+    executar.add_argument('--trace', metavar='ARQUIVO',
+                          help='Grava os tempos de cada etapa e comando WebDriver em formato de trace '
+                               'do Chrome (chrome://tracing, Perfetto) e mostra um resumo')
+    executar.add_argument('--dados', metavar='ARQUIVO',
+                          help="Conjunto de dados CSV/JSONL: a suíte roda uma vez por linha e os valores "
+                               "'dados:coluna' recebem a coluna da linha (sobrepõe a chave 'dados' da suíte)")
+    executar.add_argument('--resultados-linhas', default='resultados_linhas',
+                          help='Pasta dos resultados por linha (um JSONL por suíte, também usado como checkpoint)')
+    executar.add_argument('--retomar', action='store_true',
+                          help='Continua uma execução com conjunto de dados, pulando as linhas já registradas')
+    executar.add_argument('--relatorio', help='Grava o resultado de cada suíte neste arquivo JSON')
+    executar.add_argument('--historico', default=CAMINHO_HISTORICO_PADRAO,
+                          help='Banco SQLite onde o resultado e a duração de cada passo são gravados')
+    executar.add_argument('--sem-historico', action='store_true', help='Não grava a execução no histórico')
+    executar.add_argument('--incremental', action='store_true',
+                          help='Executa só as suítes alteradas, as que falharam na última execução e as '
+                               'aprovadas há mais de --validade-aprovacao horas (usa o histórico)')
+    executar.add_argument('--validade-aprovacao', type=float, default=VALIDADE_APROVACAO / 3600, metavar='HORAS',
+                          help=f'No modo incremental, horas em que uma aprovação continua valendo '
+                               f'(padrão: {VALIDADE_APROVACAO / 3600:.0f})')
+    executar.add_argument('--estados', default=DIRETORIO_ESTADOS,
+                          help="Pasta dos estados de sessão das chaves 'salvar_estado' e 'restaurar_estado'")
+    executar.add_argument('--metricas-pagina', action='store_true',
+                          help='Lê as métricas de desempenho da página (carregamento, FCP, LCP, CLS, tarefas '
+                               'longas, recursos) após a navegação e cada clique')
+    executar.set_defaults(funcao=_comando_executar)
+
+    regressoes = subparsers.add_parser('regressoes',
+                                       help='Lista os passos cuja latência (p50/p95) piorou no histórico')
+    regressoes.add_argument('--historico', default=CAMINHO_HISTORICO_PADRAO, help='Banco SQLite do histórico')
+    regressoes.add_argument('--recentes', type=int, default=RECENTES,
+                            help=f'Execuções mais recentes comparadas com a base (padrão: {RECENTES})')
+    regressoes.add_argument('--janela', type=int, default=JANELA_BASE,
+                            help=f'Execuções anteriores que formam a linha de base (padrão: {JANELA_BASE})')
+    regressoes.add_argument('--limiar', type=float, default=LIMIAR_REGRESSAO * 100,
+                            help=f'Aumento mínimo, em %%, para considerar regressão '
+                                 f'(padrão: {LIMIAR_REGRESSAO * 100:.0f})')
+    regressoes.add_argument('--minimo-ms', type=float, default=MINIMO_MS,
+                            help=f'Aumento mínimo em milissegundos (padrão: {MINIMO_MS})')
+    regressoes.add_argument('--relatorio', help='Grava as regressões neste arquivo JSON')
+    regressoes.set_defaults(funcao=_comando_regressoes)
+
+    metricas = subparsers.add_parser('metricas',
+                                     help='Resume (p50/p95) as métricas de desempenho da página gravadas no histórico')
+    metricas.add_argument('--historico', default=CAMINHO_HISTORICO_PADRAO, help='Banco SQLite do histórico')
+    metricas.add_argument('--janela', type=_positivo(int), default=JANELA_BASE,
+                          help=f'Execuções mais recentes de cada suíte consideradas (padrão: {JANELA_BASE})')
+    metricas.add_argument('--relatorio', help='Grava o resumo neste arquivo JSON')
+    metricas.set_defaults(funcao=_comando_metricas)
+
+    comparar = subparsers.add_parser('comparar-perfis',
+                                     help='Executa uma suíte com cada perfil de desempenho e compara os tempos')
+    comparar.add_argument('suite', help='Arquivo JSON da suíte')
+    comparar.add_argument('--perfis', nargs='+', choices=list(PERFIS), default=list(PERFIS),
+                          help='Perfis comparados (padrão: todos)')
+    comparar.add_argument('--repeticoes', type=_positivo(int), default=3, help='Execuções por perfil (padrão: 3)')
+    comparar.add_argument('--url', help='URL do teste (sobrepõe a URL salva na suíte)')
+    comparar.add_argument('--navegador', choices=NAVEGADORES,
+                          help='Navegador (padrão: o salvo na suíte ou Chrome)')
+    _argumentos_drivers(comparar)
+    comparar.set_defaults(funcao=_comando_comparar_perfis)
+
+    carga = subparsers.add_parser('carga', help='Executa uma suíte com vários usuários virtuais simultâneos '
+                                                 'e mede vazão, erros e latência de cada passo')
+    carga.add_argument('suite', help='Arquivo JSON da suíte')
+    carga.add_argument('--usuarios', type=_positivo(int), default=5, help='Usuários virtuais simultâneos (padrão: 5)')
+    carga.add_argument('--rampa', type=_positivo(float, zero=True), default=0.0,
+                       help='Segundos até todos os usuários começarem (padrão: 0, todos juntos)')
+    carga.add_argument('--duracao', type=_positivo(float), default=60.0,
+                       help='Segundos em que os usuários repetem a suíte (padrão: 60)')
+    carga.add_argument('--pensamento', type=_positivo(float, zero=True), default=1.0,
+                       help='Pausa média entre passos e entre iterações, em segundos (padrão: 1; varia ±50%%)')
+    carga.add_argument('--intervalo', type=_positivo(float), default=5.0,
+                       help='Segundos entre os resumos parciais (padrão: 5)')
+    carga.add_argument('--max-erros', type=_positivo(float, zero=True), default=0.0, metavar='PCT',
+                       help='Taxa de erros por passo, em %%, acima da qual o código de saída é 1 (padrão: 0)')
+    carga.add_argument('--url', help='URL do teste (sobrepõe a URL salva na suíte)')
+    carga.add_argument('--navegador', choices=NAVEGADORES, help='Navegador (padrão: o salvo na suíte ou Chrome)')
+    carga.add_argument('--perfil', choices=list(PERFIS),
+                       help="Perfil de desempenho do navegador (sobrepõe a chave 'perfil' da suíte)")
+    carga.add_argument('--screenshots', default='error_screenshots', help='Pasta das screenshots de erro')
+    carga.add_argument('--semente', type=int,
+                       help='Semente dos valores random:, para repetir os mesmos valores em outro teste')
+    carga.add_argument('--locale', type=_locale, help="Idioma dos valores random: (ex.: pt_BR); a chave 'locale' da "
+                                                      "suíte tem precedência")
+    carga.add_argument('--estados', default=DIRETORIO_ESTADOS,
+                       help="Pasta dos estados de sessão das chaves 'salvar_estado' e 'restaurar_estado'")
+    carga.add_argument('--relatorio', help='Grava o resumo por passo neste arquivo JSON')
+    carga.set_defaults(funcao=_comando_carga)
+
+    return parser
+
+
+def _comando_executar(args):
+    # O motor (e o Selenium) só é importado pelos comandos que executam suítes:
+    # --help, regressoes e metricas funcionam sem ele.
+    from .agendador import AgendadorSuites
+    from .conjuntos import ExecucaoConjunto, validar_colunas
+
+    configurar_resolucao(args.cache_drivers, args.offline, dict(args.fixar_driver))
+
+    falhas = 0
+    planos = []
+    conjuntos = []
+    # As suítes de captura relidas ao vencer um estado recebem as mesmas opções.
+    estados = ArmazemEstados(args.estados, ajustar_suite=lambda suite: _ajustar_suite(suite, args))
+    for caminho in args.suites:
+        try:
+            suite = carregar_suite(caminho)
+        except (OSError, ValueError) as e:
+            print(f"❌ Não foi possível ler a suíte {caminho}: {e}")
+            falhas += 1
+            continue
+
+        _ajustar_suite(suite, args)
+        if not suite.url:
+            print(f"❌ Suíte {suite.nome} sem URL; informe --url")
+            falhas += 1
+            continue
+
+        estados.registrar_suite(suite, caminho)
+        # O caminho gravado na suíte é relativo à pasta do arquivo da suíte.
+        caminho_dados = args.dados or (suite.opcoes.get('dados') and
+                                       os.path.join(os.path.dirname(caminho), suite.opcoes['dados']))
+        try:
+            plano = compilar_suite(suite)
+            if caminho_dados:
+                validar_colunas(plano, caminho_dados)
+                conjuntos.append((plano, caminho_dados))
+            elif plano.colunas:
+                raise ErroValidacao([f"Passos usam colunas ({', '.join(sorted(plano.colunas))}) mas nenhum "
+                                     "conjunto de dados foi informado (--dados)"])
+            else:
+                planos.append(plano)
+        except (OSError, ValueError) as e:
+            print(f"❌ Não foi possível ler o conjunto de dados da suíte {suite.nome}: {e}")
+            falhas += 1
+        except ErroValidacao as e:
+            print(f"❌ Suíte {suite.nome} inválida:")
+            for erro in e.erros:
+                print(f"   - {erro}")
+            falhas += 1
+
+    sessoes = {}
+    for navegador, quantidade in args.sessoes:
+        for nome in ([navegador] if navegador else NAVEGADORES):
+            sessoes[nome] = quantidade
+
+    historico = None
+    if not args.sem_historico:
+        try:
+            historico = HistoricoExecucoes(args.historico)
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Histórico indisponível ({args.historico}): {e}")
+    if args.incremental:
+        if not historico:
+            print("❌ O modo incremental precisa do histórico (remova --sem-historico)")
+            return SAIDA_FALHA
+        planos = _selecionar_incremental(historico, planos, args.validade_aprovacao * 3600)
+
+    pool = PoolSessoes(max_ociosas=max(sessoes.values(), default=1)) if args.reutilizar_sessoes else None
+    rastreador = Rastreador() if args.trace else None
+    # A retenção vale para a pasta inteira; é aplicada uma vez ao final, não por suíte.
+    screenshots = ConfiguracaoScreenshots(args.screenshot_elemento, args.screenshot_compressao,
+                                          max_arquivos=None, max_megabytes=None, max_dias=None)
+    dados = PoolDados(args.semente, args.locale)
+    agendador = AgendadorSuites(sessoes, args.screenshots, args.logs, log=_imprimir, pool=pool,
+                                opcoes_executor={'resolucao': args.resolucao, 'espera': args.espera,
+                                                 'rastreador': rastreador, 'screenshots': screenshots,
+                                                 'dados': dados, 'estados': estados,
+                                                 'metricas': args.metricas_pagina})
+    print(f"🚀 Iniciando execução de {len(planos) + len(conjuntos)} suíte(s)...")
+    todos_planos = planos + [plano for plano, _ in conjuntos]
+    if any(passo.gerador for plano in todos_planos for passo in plano.passos):
+        print(f"🎲 Semente dos valores aleatórios: {dados.semente} (use --semente {dados.semente} para repetir)")
+    resumos = []
+    try:
+        resultados = agendador.executar(planos)
+        if historico:
+            for plano, resultado in zip(planos, resultados):
+                historico.registrar(plano, resultado)
+        for plano, caminho_dados in conjuntos:
+            caminho_resultados = os.path.join(args.resultados_linhas, f"{plano.nome}.jsonl")
+            print(f"📄 {plano.nome}: uma execução por linha de {caminho_dados}")
+            execucao = ExecucaoConjunto(plano, caminho_dados, caminho_resultados,
+                                        sessoes=agendador.sessoes_para(plano.navegador),
+                                        screenshot_dir=os.path.join(args.screenshots, plano.nome), log=_imprimir,
+                                        pool=pool, opcoes_executor=agendador.opcoes_executor,
+                                        retomar=args.retomar, historico=historico)
+            resumos.append((plano, caminho_resultados, execucao.executar()))
+    finally:
+        if pool:
+            pool.encerrar_todas()
+
+    if os.path.isdir(args.screenshots):
+        removidos = podar_screenshots(
+            args.screenshots, args.screenshots_max_arquivos,
+            args.screenshots_max_mb * 1024 * 1024 if args.screenshots_max_mb else None,
+            args.screenshots_max_dias * 86400 if args.screenshots_max_dias else None)
+        if removidos:
+            print(f"🧹 {removidos} screenshot(s) antiga(s) removida(s) de {args.screenshots}")
+
+    for resultado in resultados:
+        if not resultado.sucesso:
+            falhas += 1
+        aprovados = sum(1 for passo in resultado.passos if passo.sucesso)
+        status = '✅' if resultado.sucesso else '❌'
+        pulados = f", {resultado.pulados} pulados" if resultado.pulados else ''
+        print(f"{status} {resultado.nome}: {aprovados}/{len(resultado.passos)} passos aprovados{pulados}, "
+              f"{resultado.comandos_webdriver} comandos WebDriver")
+
+    for plano, caminho_resultados, resumo in resumos:
+        sucesso = not resumo['falhas'] and not resumo['cancelado'] and not resumo['erro']
+        if not sucesso:
+            falhas += 1
+        puladas = f", {resumo['puladas']} já executadas" if resumo['puladas'] else ''
+        print(f"{'✅' if sucesso else '❌'} {plano.nome}: {resumo['aprovadas']}/{resumo['linhas']} linhas "
+              f"aprovadas{puladas} (resultados em {caminho_resultados})")
+        if resumo['erro']:
+            print(f"   ⚠️ Conjunto interrompido: {resumo['erro']}")
+
+    if historico:
+        _avisar_regressoes(historico, todos_planos)
+
+    if rastreador:
+        rastreador.exportar(args.trace)
+        print(f"\n⏱️ Tempo por etapa (trace completo em {args.trace}):")
+        print(rastreador.tabela_resumo())
+        print()
+
+    if args.relatorio:
+        with open(args.relatorio, 'w', encoding='utf-8') as arquivo:
+            json.dump([resultado.para_dict() for resultado in resultados]
+                      + [dict(resumo, nome=plano.nome, resultados=caminho_resultados)
+                         for plano, caminho_resultados, resumo in resumos],
+                      arquivo, indent=4, ensure_ascii=False)
+
+    print(f"🏁 {len(args.suites) - falhas}/{len(args.suites)} suítes aprovadas")
+    return SAIDA_FALHA if falhas else SAIDA_OK
+
+
+def _selecionar_incremental(historico, planos, validade):
+    """Planos que precisam rodar de novo; os demais são informados e dispensados."""
+    selecionados = []
+    for plano in planos:
+        try:
+            motivo = historico.motivo_execucao(plano, plano.navegador or NAVEGADOR_PADRAO, validade)
+        except (sqlite3.Error, ValueError) as e:
+            motivo = f"histórico ilegível ({e})"
+        if motivo:
+            print(f"🔁 {plano.nome}: {motivo}")
+            selecionados.append(plano)
+        else:
+            print(f"⏭️ {plano.nome}: sem alterações desde a última aprovação, não será executada")
+    dispensados = len(planos) - len(selecionados)
+    if dispensados:
+        print(f"📦 Modo incremental: {dispensados} suíte(s) dispensada(s), {len(selecionados)} a executar")
+    return selecionados
+
+
+def _avisar_regressoes(historico, planos):
+    """Mostra os passos das suítes executadas que ficaram mais lentos que a linha de base."""
+    chaves = {(plano.hash_conteudo, plano.navegador or NAVEGADOR_PADRAO, plano.perfil.nome, plano.url): plano.nome
+              for plano in planos}
+    try:
+        regressoes = [regressao for chave, nome in chaves.items()
+                      for regressao in historico.regressoes(*chave, nome)]
+    except sqlite3.Error as e:
+        print(f"⚠️ Não foi possível consultar o histórico: {e}")
+        return
+    if regressoes:
+        print(f"\n🐢 {len(regressoes)} passo(s) mais lento(s) que nas execuções anteriores:")
+        print(tabela_regressoes(regressoes))
+        print()
+
+
+def _comando_regressoes(args):
+    if not os.path.exists(args.historico):
+        print(f"❌ Histórico não encontrado: {args.historico}")
+        return SAIDA_FALHA
+    historico = HistoricoExecucoes(args.historico)
+    regressoes = historico.relatorio(janela=args.janela, recentes=args.recentes, limiar=args.limiar / 100,
+                                     minimo_ms=args.minimo_ms)
+
+    if args.relatorio:
+        with open(args.relatorio, 'w', encoding='utf-8') as arquivo:
+            json.dump([dict(dataclasses.asdict(regressao), variacao=regressao.variacao)
+                       for regressao in regressoes], arquivo, indent=4, ensure_ascii=False)
+
+    if not regressoes:
+        print(f"✅ Nenhuma regressão de latência nas últimas {args.recentes} execuções de cada suíte")
+        return SAIDA_OK
+    print(f"🐢 {len(regressoes)} passo(s) com regressão de latência "
+          f"(últimas {args.recentes} execuções contra as {args.janela} anteriores):")
+    print(tabela_regressoes(regressoes))
+    return SAIDA_FALHA
+
+
+def _comando_metricas(args):
+    if not os.path.exists(args.historico):
+        print(f"❌ Histórico não encontrado: {args.historico}")
+        return SAIDA_FALHA
+    resumo = HistoricoExecucoes(args.historico).resumo_metricas(args.janela)
+
+    if args.relatorio:
+        with open(args.relatorio, 'w', encoding='utf-8') as arquivo:
+            json.dump(resumo, arquivo, indent=4, ensure_ascii=False)
+
+    if not resumo:
+        print("ℹ️ Nenhuma métrica de página no histórico; execute as suítes com --metricas-pagina")
+        return SAIDA_OK
+    print(f"📊 Métricas de página (últimas {args.janela} execuções de cada suíte):")
+    print(tabela_metricas(resumo))
+    return SAIDA_OK
+
+
+def _medir_perfil(plano, repeticoes, screenshot_dir):
+    """Executa o plano `repeticoes` vezes; devolve as medições de cada execução."""
+    from .execucao import ExecutorTestes
+
+    medicoes = []
+    for _ in range(repeticoes):
+        rastreador = Rastreador()
+        executor = ExecutorTestes(plano.navegador, screenshot_dir, log=lambda mensagem: None,
+                                  rastreador=rastreador)
+        inicio = time.perf_counter()
+        resultado = executor.executar_plano(plano)
+        total = time.perf_counter() - inicio
+        por_categoria = {}
+        for categoria, _, _, duracao, _, _ in rastreador.resumo():
+            por_categoria[categoria] = por_categoria.get(categoria, 0) + duracao
+        medicoes.append({'sucesso': resultado.sucesso, 'total': total,
+                         'abertura': por_categoria.get(CATEGORIA_DRIVER, 0),
+                         'navegacao': por_categoria.get(CATEGORIA_NAVEGACAO, 0),
+                         'passos': sum(passo.duracao for passo in resultado.passos)})
+    return medicoes
+
+
+def _comando_comparar_perfis(args):
+    from .execucao import ErroDriver
+
+    configurar_resolucao(args.cache_drivers, args.offline, dict(args.fixar_driver))
+    try:
+        suite = carregar_suite(args.suite)
+    except (OSError, ValueError) as e:
+        print(f"❌ Não foi possível ler a suíte {args.suite}: {e}")
+        return SAIDA_FALHA
+    _ajustar_suite(suite, args)
+    suite.opcoes.pop('dados', None)
+
+    linhas = []
+    with tempfile.TemporaryDirectory(prefix='e2e-perfis-') as screenshot_dir:
+        for nome in args.perfis:
+            suite.opcoes['perfil'] = nome
+            try:
+                plano = compilar_suite(suite)
+            except ErroValidacao as e:
+                print(f"❌ Suíte {suite.nome} inválida:\n{e}")
+                return SAIDA_FALHA
+            if plano.colunas:
+                print("❌ A comparação não usa conjunto de dados; remova os valores 'dados:' da suíte")
+                return SAIDA_FALHA
+            print(f"⏳ Perfil {nome}: {args.repeticoes} execução(ões) de {suite.nome} no {suite.navegador}...")
+            try:
+                medicoes = _medir_perfil(plano, args.repeticoes, screenshot_dir)
+            except ErroDriver as e:
+                print(f"❌ {e}")
+                return SAIDA_FALHA
+            linhas.append((nome, medicoes))
+
+    # Medianas: uma execução lenta isolada não decide a comparação.
+    medianas = {nome: {chave: statistics.median(medicao[chave] for medicao in medicoes)
+                       for chave in ('total', 'abertura', 'navegacao', 'passos')}
+                for nome, medicoes in linhas}
+    referencia = medianas.get(PERFIL_PADRAO, medianas[linhas[0][0]])['total']
+    print(f"\n{'Perfil':<12} {'Aprovadas':>9} {'Abertura (ms)':>14} {'Navegação (ms)':>15} {'Passos (ms)':>12} "
+          f"{'Total (ms)':>11} {'Variação':>9}")
+    for nome, medicoes in linhas:
+        mediana = medianas[nome]
+        aprovadas = f"{sum(1 for medicao in medicoes if medicao['sucesso'])}/{len(medicoes)}"
+        print(f"{nome:<12} {aprovadas:>9} {mediana['abertura'] * 1000:>14.0f} {mediana['navegacao'] * 1000:>15.0f} "
+              f"{mediana['passos'] * 1000:>12.0f} {mediana['total'] * 1000:>11.0f} "
+              f"{mediana['total'] / referencia - 1:>+9.0%}")
+
+    reprovados = [nome for nome, medicoes in linhas if not all(medicao['sucesso'] for medicao in medicoes)]
+    if reprovados:
+        print(f"\n⚠️ A suíte falhou com o(s) perfil(is) {', '.join(reprovados)}: verifique se a página depende "
+              "do que foi bloqueado antes de adotá-lo")
+    return SAIDA_FALHA if reprovados else SAIDA_OK
+
+
+def _comando_carga(args):
+    from .carga import ConfiguracaoCarga, TesteCarga, tabela_carga
+
+    try:
+        suite = carregar_suite(args.suite)
+    except (OSError, ValueError) as e:
+        print(f"❌ Não foi possível ler a suíte {args.suite}: {e}")
+        return SAIDA_FALHA
+    _ajustar_suite(suite, args)
+    estados = ArmazemEstados(args.estados, ajustar_suite=lambda suite_captura: _ajustar_suite(suite_captura, args))
+    estados.registrar_suite(suite, args.suite)
+    try:
+        plano = compilar_suite(suite)
+    except ErroValidacao as e:
+        print(f"❌ Suíte {suite.nome} inválida:\n{e}")
+        return SAIDA_FALHA
+    if plano.colunas:
+        print("❌ O teste de carga não usa conjunto de dados; troque os valores 'dados:' por 'random:'")
+        return SAIDA_FALHA
+
+    configuracao = ConfiguracaoCarga(args.usuarios, args.rampa, args.duracao, args.pensamento,
+                                     intervalo_relatorio=args.intervalo)
+    dados = PoolDados(args.semente, args.locale)
+    if any(passo.gerador for passo in plano.passos):
+        print(f"🎲 Semente dos valores aleatórios: {dados.semente} (use --semente {dados.semente} para repetir)")
+    teste = TesteCarga(plano, configuracao, args.screenshots, log=_imprimir,
+                       opcoes_executor={'estados': estados, 'dados': dados})
+    resumo = teste.executar()
+
+    print(f"\n🏁 {resumo['iteracoes']} iteração(ões) em {resumo['duracao_s']:.0f} s, "
+          f"{resumo['iteracoes_com_falha']} com falha ({resumo['erros_criticos']} interrompida(s) por erro crítico)")
+    print(tabela_carga(resumo))
+    if args.relatorio:
+        with open(args.relatorio, 'w', encoding='utf-8') as arquivo:
+            json.dump(dict(resumo, suite=plano.nome, configuracao=dataclasses.asdict(configuracao)), arquivo,
+                      indent=4, ensure_ascii=False)
+
+    acima = [passo for passo in resumo['passos'] if passo['taxa_erros'] * 100 > args.max_erros]
+    criticos = resumo['erros_criticos'] / resumo['iteracoes'] * 100 if resumo['iteracoes'] else 100
+    if acima:
+        print(f"\n⚠️ {len(acima)} passo(s) com taxa de erros acima de {args.max_erros:g}%")
+    if criticos > args.max_erros:
+        print(f"\n⚠️ {criticos:.1f}% das iterações interrompidas por erro crítico")
+    return SAIDA_FALHA if acima or criticos > args.max_erros else SAIDA_OK
+
+
+def main(argv=None):
+    args = _criar_parser().parse_args(argv)
+    configurar_logging()
+    return args.funcao(args)
@@ -0,0 +1,258 @@
+"""Execução orientada a dados: uma execução da suíte por linha de um CSV/JSONL.
+
+Os passos com valor 'dados:coluna' recebem o valor da coluna na linha. As
+linhas são lidas sob demanda (o arquivo nunca fica inteiro em memória) e o
+resultado de cada linha é gravado assim que ela termina em um arquivo JSONL,
+que também serve de checkpoint: com `retomar`, as linhas já registradas são
+puladas. Um registro JSONL malformado conta como linha com falha; um erro
+que impede continuar a leitura (CSV corrompido, codificação inválida)
+interrompe o conjunto, depois de concluídas as linhas em andamento.
+"""
+import csv
+import json
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .dados import PoolDados
+from .execucao import ErroDriver, ExecutorTestes, ResultadoSuite
+from .plano import ErroValidacao
+from .pool import PoolSessoes
+
+EXTENSOES_CSV = ('.csv',)
+EXTENSOES_JSONL = ('.jsonl', '.ndjson')
+
+
+def ler_linhas(caminho):
+    """Gera (número da linha, dict, erro) para cada registro do CSV ou JSONL.
+
+    `erro` é '' ou a descrição de um registro JSONL inválido (o dict fica
+    vazio). Lança ValueError se o arquivo não puder mais ser lido.
+    """
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao in EXTENSOES_CSV:
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as arquivo:
+            leitor = csv.DictReader(arquivo)
+            try:
+                for numero, linha in enumerate(leitor, 1):
+                    yield numero, linha, ''
+            except csv.Error as e:
+                raise ValueError(f"{caminho}: CSV inválido perto da linha {leitor.line_num} do arquivo: {e}") from e
+    elif extensao in EXTENSOES_JSONL:
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            numero = 0
+            for texto in arquivo:
+                if not texto.strip():
+                    continue
+                numero += 1
+                try:
+                    registro = json.loads(texto)
+                except ValueError as e:
+                    yield numero, {}, f"JSON inválido: {e}"
+                    continue
+                if not isinstance(registro, dict):
+                    yield numero, {}, "o registro não é um objeto JSON"
+                    continue
+                yield numero, registro, ''
+    else:
+        raise ValueError(f"Formato de conjunto de dados não suportado: {caminho} (use .csv ou .jsonl)")
+
+
+def colunas_conjunto(caminho):
+    """Colunas do conjunto: o cabeçalho do CSV ou as chaves do primeiro registro JSONL."""
+    if os.path.splitext(caminho)[1].lower() in EXTENSOES_CSV:
+        with open(caminho, 'r', encoding='utf-8-sig', newline='') as arquivo:
+            return set(next(csv.reader(arquivo), []))
+    for _, registro, erro in ler_linhas(caminho):
+        if not erro:
+            return set(registro)
+    return set()
+
+
+def validar_colunas(plano, caminho):
+    """Lança ErroValidacao se o plano usa colunas que o conjunto não tem."""
+    faltando = sorted(plano.colunas - colunas_conjunto(caminho))
+    if faltando:
+        raise ErroValidacao([f"Coluna '{coluna}' não existe em {caminho}" for coluna in faltando])
+
+
+def linhas_concluidas(caminho_resultados):
+    """Números das linhas já registradas no arquivo de resultados."""
+    concluidas = set()
+    if not os.path.exists(caminho_resultados):
+        return concluidas
+    with open(caminho_resultados, 'r', encoding='utf-8') as arquivo:
+        for texto in arquivo:
+            try:
+                concluidas.add(json.loads(texto)['linha'])
+            except (ValueError, KeyError, TypeError):
+                # Última linha incompleta de uma execução interrompida.
+                continue
+    return concluidas
+
+
+def _descartar_linha_incompleta(caminho_resultados):
+    """Remove o registro parcial deixado no fim do arquivo por uma interrupção."""
+    if not os.path.exists(caminho_resultados):
+        return
+    with open(caminho_resultados, 'rb+') as arquivo:
+        conteudo = arquivo.read()
+        if conteudo and not conteudo.endswith(b'\n'):
+            arquivo.truncate(conteudo.rfind(b'\n') + 1)
+
+
+class ExecucaoConjunto:
+    """Executa `plano` uma vez por linha de `caminho_dados`.
+
+    As linhas são distribuídas entre `sessoes` navegadores, reaproveitados
+    entre as linhas por um PoolSessoes. Os valores `random:` continuam vindo
+    do PoolDados, reservados na ordem das linhas. Com um `historico`
+    (historico.HistoricoExecucoes), cada linha é gravada como uma execução.
+    """
+
+    def __init__(self, plano, caminho_dados, caminho_resultados, sessoes=1,
+                 screenshot_dir='error_screenshots', log=None, pool=None, opcoes_executor=None, retomar=False,
+                 historico=None):
+        self.plano = plano
+        self.caminho_dados = caminho_dados
+        self.caminho_resultados = caminho_resultados
+        self.sessoes = max(1, sessoes)
+        self.screenshot_dir = screenshot_dir
+        self.log = log or (lambda mensagem: None)
+        self.pool = pool
+        self.opcoes_executor = dict(opcoes_executor or {})
+        self.dados = self.opcoes_executor.get('dados') or PoolDados()
+        self.opcoes_executor['dados'] = self.dados
+        self.retomar = retomar
+        self.historico = historico
+        self.cancelado = threading.Event()
+        self._executores = set()
+        self._lock = threading.Lock()
+
+    def cancelar(self):
+        self.cancelado.set()
+        with self._lock:
+            for executor in self._executores:
+                executor.cancelar()
+
+    def _valores(self, linha, valores):
+        """Completa os valores reservados com as colunas da linha; lança KeyError se faltar uma."""
+        for passo in self.plano.passos:
+            if passo.coluna:
+                if passo.coluna not in linha:
+                    raise KeyError(passo.coluna)
+                valor = linha[passo.coluna]
+                valores[passo.indice] = '' if valor is None else str(valor)
+        return valores
+
+    def _executar_linha(self, numero, valores):
+        def log(mensagem):
+            self.log(f"[linha {numero}] {mensagem}")
+
+        executor = ExecutorTestes(self.plano.navegador, self.screenshot_dir, log=log, pool=self.pool,
+                                  **self.opcoes_executor)
+        with self._lock:
+            self._executores.add(executor)
+        if self.cancelado.is_set():
+            executor.cancelar()
+        try:
+            return executor.executar_plano(self.plano, valores)
+        except ErroDriver as e:
+            log(f"❌ {e}")
+            return ResultadoSuite(self.plano.nome, erro=str(e))
+        finally:
+            with self._lock:
+                self._executores.discard(executor)
+
+    def executar(self):
+        """Executa todas as linhas e devolve um resumo com as contagens.
+
+        `erro` no resumo descreve a falha de leitura que interrompeu o conjunto.
+        """
+        validar_colunas(self.plano, self.caminho_dados)
+        if self.retomar:
+            _descartar_linha_incompleta(self.caminho_resultados)
+        concluidas = linhas_concluidas(self.caminho_resultados) if self.retomar else set()
+        if concluidas:
+            self.log(f"⏩ Retomando: {len(concluidas)} linha(s) já executada(s) serão puladas")
+
+        resumo = {'linhas': 0, 'aprovadas': 0, 'falhas': 0, 'puladas': len(concluidas), 'cancelado': False,
+                  'erro': ''}
+        pool_proprio = self.pool is None
+        if pool_proprio:
+            self.pool = PoolSessoes(max_ociosas=self.sessoes)
+
+        pasta = os.path.dirname(self.caminho_resultados)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        modo = 'a' if self.retomar else 'w'
+        pendentes = {}
+        try:
+            # O pool só é encerrado depois que o ThreadPoolExecutor esperou as
+            # linhas em andamento, que ainda devolvem suas sessões a ele.
+            with open(self.caminho_resultados, modo, encoding='utf-8') as resultados, \
+                    ThreadPoolExecutor(max_workers=self.sessoes, thread_name_prefix='linha') as execucao:
+
+                def registrar(numero, resultado):
+                    if resultado.cancelado:
+                        # Fica fora do checkpoint para ser executada ao retomar.
+                        return
+                    resumo['linhas'] += 1
+                    resumo['aprovadas' if resultado.sucesso else 'falhas'] += 1
+                    resultados.write(json.dumps(dict(resultado.para_dict(), linha=numero), ensure_ascii=False)
+                                     + '\n')
+                    resultados.flush()
+                    if self.historico:
+                        self.historico.registrar(self.plano, resultado)
+
+                def coletar(concluidos):
+                    for futuro in concluidos:
+                        registrar(pendentes.pop(futuro), futuro.result())
+
+                try:
+                    for numero, linha, erro in ler_linhas(self.caminho_dados):
+                        if self.cancelado.is_set():
+                            break
+                        if numero in concluidas:
+                            # Mantém a sequência dos random: igual à da execução original.
+                            self.dados.reservar(self.plano)
+                            continue
+                        # Toda linha consome os seus random:, mesmo a que falha antes de
+                        # executar: ao retomar, as linhas concluídas reservam igual.
+                        valores = self.dados.reservar(self.plano)
+                        if erro:
+                            self.log(f"[linha {numero}] ❌ {erro}")
+                            registrar(numero, ResultadoSuite(self.plano.nome, erro=erro))
+                            continue
+                        try:
+                            valores = self._valores(linha, valores)
+                        except KeyError as e:
+                            self.log(f"[linha {numero}] ❌ Coluna {e} ausente")
+                            registrar(numero, ResultadoSuite(self.plano.nome, erro=f"Coluna {e} ausente na linha"))
+                            continue
+                        pendentes[execucao.submit(self._executar_linha, numero, valores)] = numero
+
+                        # Limita as linhas em memória a poucas por sessão.
+                        if len(pendentes) >= self.sessoes * 2:
+                            coletar(wait(pendentes, return_when=FIRST_COMPLETED).done)
+
+                except ValueError as e:
+                    resumo['erro'] = str(e)
+                    self.log(f"❌ Leitura de {self.caminho_dados} interrompida: {e}")
+
+                except KeyboardInterrupt:
+                    self.cancelar()
+                    coletar(wait(pendentes).done)
+                    raise
+
+                coletar(wait(pendentes).done)
+
+        finally:
+            resumo['cancelado'] = self.cancelado.is_set()
+            if pool_proprio:
+                self.pool.encerrar_todas()
+                self.pool = None
+
+        logging.info(f"Conjunto {self.caminho_dados}: {resumo}")
+        return resumo
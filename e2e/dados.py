@@ -0,0 +1,130 @@
+"""Massa de dados para os valores `random:` das suítes.
+
+Os valores são gerados em bloco antes da execução, a partir de uma semente:
+a mesma semente (e a mesma ordem de suítes) reproduz exatamente os mesmos
+dados. Cada tipo, em cada locale, tem sua própria sequência; tipos únicos
+(email, CPF, CNPJ, UUID) nunca se repetem dentro do pool, mesmo entre
+sessões paralelas que compartilham o mesmo PoolDados.
+"""
+import random
+import threading
+from collections import defaultdict
+
+from .plano import GERADOR_PADRAO
+
+TAMANHO_BLOCO = 256
+TIPOS_UNICOS = {'email', 'cpf', 'cnpj', 'uuid'}
+
+
+def _digitos_verificadores(digitos, pesos):
+    soma = sum(digito * peso for digito, peso in zip(digitos, pesos))
+    resto = soma % 11
+    return 0 if resto < 2 else 11 - resto
+
+
+def gerar_cpf(faker, indice):
+    digitos = [faker.random_int(0, 9) for _ in range(9)]
+    digitos.append(_digitos_verificadores(digitos, range(10, 1, -1)))
+    digitos.append(_digitos_verificadores(digitos, range(11, 1, -1)))
+    texto = ''.join(map(str, digitos))
+    return f"{texto[:3]}.{texto[3:6]}.{texto[6:9]}-{texto[9:]}"
+
+
+def gerar_cnpj(faker, indice):
+    digitos = [faker.random_int(0, 9) for _ in range(8)] + [0, 0, 0, 1]
+    pesos = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    digitos.append(_digitos_verificadores(digitos, pesos))
+    digitos.append(_digitos_verificadores(digitos, [6] + pesos))
+    texto = ''.join(map(str, digitos))
+    return f"{texto[:2]}.{texto[2:5]}.{texto[5:8]}/{texto[8:12]}-{texto[12:]}"
+
+
+# Cada gerador recebe o Faker da sequência e a posição do valor nela.
+GERADORES_DADOS = {
+    'nome': lambda faker, indice: faker.name(),
+    # A posição no email garante que ele não se repete na sequência.
+    'email': lambda faker, indice: f"{faker.user_name()}.{indice}@{faker.free_email_domain()}",
+    'telefone': lambda faker, indice: faker.phone_number(),
+    'endereço': lambda faker, indice: faker.address(),
+    'número': lambda faker, indice: str(faker.random_number(digits=5)),
+    'cpf': gerar_cpf,
+    'cnpj': gerar_cnpj,
+    'cep': lambda faker, indice: faker.postcode(),
+    'data': lambda faker, indice: faker.date(pattern='%d/%m/%Y'),
+    'senha': lambda faker, indice: faker.password(length=12),
+    'uuid': lambda faker, indice: faker.uuid4(),
+    'empresa': lambda faker, indice: faker.company(),
+    GERADOR_PADRAO: lambda faker, indice: faker.text(max_nb_chars=20),
+}
+
+
+class PoolDados:
+    """Sequências de valores pré-gerados por (locale, tipo), a partir de `semente`.
+
+    Sem semente, uma é sorteada; ela fica em `semente` para reproduzir a
+    execução. Pode ser compartilhado entre threads.
+    """
+
+    def __init__(self, semente=None, locale=None, tamanho_bloco=TAMANHO_BLOCO):
+        self.semente = semente if semente is not None else random.SystemRandom().randrange(2 ** 32)
+        self.locale = locale
+        self.tamanho_bloco = tamanho_bloco
+        self._fakers = {}
+        self._valores = defaultdict(list)
+        self._proximo = defaultdict(int)
+        self._vistos = defaultdict(set)
+        self._lock = threading.RLock()
+
+    def _chave(self, tipo, locale=None):
+        return locale or self.locale or '', tipo
+
+    def _gerar(self, chave, quantidade):
+        locale, tipo = chave
+        faker = self._fakers.get(chave)
+        if faker is None:
+            # Importado no primeiro valor gerado: suítes sem 'random:' não carregam o Faker.
+            from faker import Faker
+            faker = self._fakers[chave] = Faker(locale or None)
+            faker.seed_instance(f"{self.semente}:{locale}:{tipo}")
+
+        valores = self._valores[chave]
+        vistos = self._vistos[tipo]
+        gerador = GERADORES_DADOS[tipo]
+        alvo = len(valores) + quantidade
+        while len(valores) < alvo:
+            valor = gerador(faker, len(valores))
+            if tipo in TIPOS_UNICOS:
+                if valor in vistos:
+                    continue
+                vistos.add(valor)
+            valores.append(valor)
+
+    def preparar(self, planos):
+        """Gera de uma vez os valores que os planos vão consumir."""
+        necessarios = defaultdict(int)
+        for plano in planos:
+            for passo in plano.passos:
+                if passo.gerador:
+                    necessarios[self._chave(passo.gerador, plano.locale)] += 1
+
+        with self._lock:
+            for chave, quantidade in necessarios.items():
+                faltam = self._proximo[chave] + quantidade - len(self._valores[chave])
+                if faltam > 0:
+                    self._gerar(chave, faltam)
+
+    def proximo(self, tipo, locale=None):
+        """Consome o próximo valor da sequência do tipo."""
+        chave = self._chave(tipo, locale)
+        with self._lock:
+            indice = self._proximo[chave]
+            if indice >= len(self._valores[chave]):
+                self._gerar(chave, self.tamanho_bloco)
+            self._proximo[chave] += 1
+            return self._valores[chave][indice]
+
+    def reservar(self, plano):
+        """Valores dos passos `random:` do plano: {indice do passo: valor}."""
+        with self._lock:
+            return {passo.indice: self.proximo(passo.gerador, plano.locale)
+                    for passo in plano.passos if passo.gerador}
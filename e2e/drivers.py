@@ -0,0 +1,205 @@
+"""Cache persistente de resolução dos binários de WebDriver.
+
+O webdriver_manager consulta a internet a cada `install()` para descobrir a
+versão do driver. Aqui o caminho resolvido fica gravado por navegador e versão
+do navegador; no caso comum a inicialização é só uma leitura do cache e uma
+verificação de que o arquivo existe. Também permite fixar a versão do driver
+e trabalhar totalmente offline.
+"""
+import importlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+
+CAMINHO_CACHE_PADRAO = os.path.join(os.path.expanduser('~'), '.cache', 'e2e-tester', 'drivers.json')
+
+# Gerenciador do webdriver_manager (módulo, classe), tipo de navegador usado na
+# detecção de versão (valores de ChromeType) e binário do driver. O
+# webdriver_manager só é importado quando o cache não resolve o driver.
+GERENCIADORES = {
+    'Chrome': (('webdriver_manager.chrome', 'ChromeDriverManager'), 'google-chrome', 'chromedriver'),
+    'Firefox': (('webdriver_manager.firefox', 'GeckoDriverManager'), 'firefox', 'geckodriver'),
+    'Edge': (('webdriver_manager.microsoft', 'EdgeChromiumDriverManager'), 'edge', 'msedgedriver'),
+}
+
+# Onde procurar o executável de cada navegador: nomes no PATH e caminhos fixos
+# (macOS e Windows). Só o tamanho e a data dele são lidos, para perceber uma
+# atualização do navegador sem executá-lo.
+EXECUTAVEIS_NAVEGADOR = {
+    'Chrome': (('google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser'), (
+        '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome',
+        r'%PROGRAMFILES%\Google\Chrome\Application\chrome.exe',
+        r'%PROGRAMFILES(X86)%\Google\Chrome\Application\chrome.exe',
+        r'%LOCALAPPDATA%\Google\Chrome\Application\chrome.exe')),
+    'Firefox': (('firefox',), (
+        '/Applications/Firefox.app/Contents/MacOS/firefox',
+        r'%PROGRAMFILES%\Mozilla Firefox\firefox.exe',
+        r'%PROGRAMFILES(X86)%\Mozilla Firefox\firefox.exe')),
+    'Edge': (('microsoft-edge', 'microsoft-edge-stable'), (
+        '/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge',
+        r'%PROGRAMFILES(X86)%\Microsoft\Edge\Application\msedge.exe',
+        r'%PROGRAMFILES%\Microsoft\Edge\Application\msedge.exe')),
+}
+
+VERSAO_DESCONHECIDA = 'desconhecida'
+
+
+class ErroResolucaoDriver(Exception):
+    """Não foi possível obter o binário do driver."""
+
+
+class ResolvedorDrivers:
+    """Resolve o caminho do driver de cada navegador usando cache em disco.
+
+    `versoes_fixas` mapeia navegador para a versão do driver a usar.
+    Com `offline=True` nada é baixado: usa-se o cache ou o driver no PATH.
+    """
+
+    def __init__(self, caminho_cache=CAMINHO_CACHE_PADRAO, offline=False, versoes_fixas=None):
+        self.caminho_cache = caminho_cache
+        self.offline = offline
+        self.versoes_fixas = versoes_fixas or {}
+        self.ultima_resolucao = {}
+        self._lock = threading.Lock()
+
+    def resolver(self, navegador):
+        """Devolve o caminho do driver de `navegador`.
+
+        Tenta primeiro o último driver usado pelo navegador, se o executável
+        do navegador não mudou desde então; senão detecta a versão instalada
+        do navegador e consulta o cache por ela; só então baixa (ou, offline,
+        procura no PATH).
+        """
+        inicio = time.perf_counter()
+        origem = 'cache'
+        with self._lock:
+            cache = self._ler_cache()
+            assinatura = self._assinatura_navegador(navegador)
+            caminho = self._consultar_ultima(cache, navegador, assinatura)
+
+            if caminho is None:
+                versao_navegador = self._versao_navegador(navegador)
+                caminho = self._consultar(cache, navegador, versao_navegador)
+                if caminho is None:
+                    caminho, origem = self._resolver_sem_cache(navegador)
+                    self._registrar(cache, navegador, versao_navegador, caminho)
+                self._registrar_ultima(cache, navegador, versao_navegador, assinatura)
+
+        duracao = time.perf_counter() - inicio
+        self.ultima_resolucao[navegador] = {'origem': origem, 'duracao': duracao, 'caminho': caminho}
+        logging.info(f"Driver de {navegador} resolvido via {origem} em {duracao * 1000:.1f} ms: {caminho}")
+        return caminho
+
+    def invalidar(self, navegador):
+        """Remove do cache o último driver usado por `navegador`."""
+        with self._lock:
+            cache = self._ler_cache()
+            ultima = cache.get('ultima', {}).pop(self._chave(navegador), None)
+            versao = ultima.get('versao') if isinstance(ultima, dict) else ultima
+            if versao:
+                cache.get('drivers', {}).get(self._chave(navegador), {}).pop(versao, None)
+                self._gravar_cache(cache)
+
+    def _chave(self, navegador):
+        versao_fixa = self.versoes_fixas.get(navegador)
+        return f"{navegador}@{versao_fixa}" if versao_fixa else navegador
+
+    def _consultar_ultima(self, cache, navegador, assinatura):
+        # Sem como saber se o navegador foi atualizado, a versão é detectada de novo.
+        ultima = cache.get('ultima', {}).get(self._chave(navegador))
+        if assinatura is None or not isinstance(ultima, dict) or ultima.get('assinatura') != assinatura:
+            return None
+        return self._consultar(cache, navegador, ultima.get('versao'))
+
+    def _consultar(self, cache, navegador, versao_navegador):
+        entrada = cache.get('drivers', {}).get(self._chave(navegador), {}).get(versao_navegador)
+        if entrada and os.path.isfile(entrada['caminho']):
+            return entrada['caminho']
+        return None
+
+    def _registrar(self, cache, navegador, versao_navegador, caminho):
+        chave = self._chave(navegador)
+        cache.setdefault('drivers', {}).setdefault(chave, {})[versao_navegador] = {
+            'caminho': caminho,
+            'versao_driver': self.versoes_fixas.get(navegador, ''),
+            'resolvido_em': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+        self._gravar_cache(cache)
+
+    def _registrar_ultima(self, cache, navegador, versao_navegador, assinatura):
+        ultima = {'versao': versao_navegador, 'assinatura': assinatura}
+        if cache.get('ultima', {}).get(self._chave(navegador)) != ultima:
+            cache.setdefault('ultima', {})[self._chave(navegador)] = ultima
+            self._gravar_cache(cache)
+
+    def _assinatura_navegador(self, navegador):
+        """Caminho, tamanho e data do executável do navegador; None se não for encontrado."""
+        nomes, caminhos = EXECUTAVEIS_NAVEGADOR.get(navegador, ((), ()))
+        candidatos = [shutil.which(nome) for nome in nomes] + [os.path.expandvars(caminho) for caminho in caminhos]
+        for candidato in filter(None, candidatos):
+            try:
+                estado = os.stat(candidato)
+            except OSError:
+                continue
+            return f"{candidato}:{estado.st_size}:{estado.st_mtime_ns}"
+        return None
+
+    def _versao_navegador(self, navegador):
+        try:
+            from webdriver_manager.core.utils import get_browser_version_from_os
+            versao = get_browser_version_from_os(GERENCIADORES[navegador][1])
+        except Exception as e:
+            logging.warning(f"Não foi possível detectar a versão do {navegador}: {e}")
+            versao = None
+        return versao or VERSAO_DESCONHECIDA
+
+    def _resolver_sem_cache(self, navegador):
+        if navegador not in GERENCIADORES:
+            raise ErroResolucaoDriver(f"Navegador não suportado: {navegador}")
+        (modulo, classe), _, binario = GERENCIADORES[navegador]
+
+        if self.offline:
+            caminho = shutil.which(binario)
+            if not caminho:
+                raise ErroResolucaoDriver(
+                    f"Modo offline: nenhum {binario} em cache nem no PATH para o {navegador}")
+            return caminho, 'PATH'
+
+        gerenciador = getattr(importlib.import_module(modulo), classe)
+        return gerenciador(version=self.versoes_fixas.get(navegador)).install(), 'download'
+
+    def _ler_cache(self):
+        try:
+            with open(self.caminho_cache, 'r', encoding='utf-8') as arquivo:
+                cache = json.load(arquivo)
+        except (OSError, ValueError):
+            return {}
+        # Um arquivo que não é um objeto JSON (ex.: `[]`) é tratado como cache vazio.
+        return cache if isinstance(cache, dict) else {}
+
+    def _gravar_cache(self, cache):
+        os.makedirs(os.path.dirname(self.caminho_cache), exist_ok=True)
+        temporario = f"{self.caminho_cache}.{os.getpid()}.tmp"
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(cache, arquivo, indent=4)
+        os.replace(temporario, self.caminho_cache)
+
+
+_resolvedor_padrao = ResolvedorDrivers()
+
+
+def resolvedor_padrao():
+    return _resolvedor_padrao
+
+
+def configurar_resolucao(caminho_cache=None, offline=None, versoes_fixas=None):
+    """Ajusta o resolvedor usado por configurar_driver()."""
+    if caminho_cache is not None:
+        _resolvedor_padrao.caminho_cache = caminho_cache
+    if offline is not None:
+        _resolvedor_padrao.offline = offline
+    if versoes_fixas is not None:
+        _resolvedor_padrao.versoes_fixas = dict(versoes_fixas)
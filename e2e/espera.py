@@ -0,0 +1,83 @@
+"""Espera por elementos guiada por eventos do DOM.
+
+O WebDriverWait consulta o navegador a cada 0,5 s: o passo espera até meio
+segundo a mais do que o necessário e cada consulta é uma ida e volta ao
+WebDriver. Aqui um script assíncrono fica dentro da página observando o DOM
+(MutationObserver) e responde assim que o elemento aparece visível. Para
+mudanças que não geram mutações (animações de CSS, carregamento de folhas de
+estilo) há também uma verificação local a cada INTERVALO_LOCAL_MS, sem custo
+de comunicação com o WebDriver.
+"""
+import math
+import time
+
+from selenium.common.exceptions import JavascriptException, TimeoutException
+
+from .resolucao import FUNCOES_LOCALIZACAO
+
+# Cada chamada espera no máximo FATIA segundos, para que o cancelamento e a
+# navegação entre páginas sejam percebidos.
+FATIA = 5
+INTERVALO_LOCAL_MS = 100
+
+SCRIPT_AGUARDAR = FUNCOES_LOCALIZACAO + """
+var localizador = arguments[0];
+var limite = arguments[1];
+var concluir = arguments[arguments.length - 1];
+var encontrado = localizar(localizador);
+if (encontrado) {
+    concluir(encontrado);
+    return;
+}
+var finalizado = false;
+function finalizar(resultado) {
+    if (finalizado) { return; }
+    finalizado = true;
+    observador.disconnect();
+    clearTimeout(temporizador);
+    clearInterval(verificacao);
+    concluir(resultado);
+}
+function verificar() {
+    var el = localizar(localizador);
+    if (el) { finalizar(el); }
+}
+var observador = new MutationObserver(verificar);
+observador.observe(document.documentElement || document,
+                   {childList: true, subtree: true, attributes: true, characterData: true});
+var verificacao = setInterval(verificar, %d);
+var temporizador = setTimeout(function () { finalizar(null); }, limite);
+""" % INTERVALO_LOCAL_MS
+
+
+class EsperaEventos:
+    """Aguarda elementos visíveis com um script assíncrono na página.
+
+    `verificar_cancelamento` é chamado entre as fatias de espera e deve lançar
+    uma exceção para interrompê-la.
+    """
+
+    def __init__(self, driver, verificar_cancelamento=None):
+        self.driver = driver
+        self.verificar_cancelamento = verificar_cancelamento or (lambda: None)
+        self.driver.set_script_timeout(FATIA + 5)
+
+    def aguardar(self, passo, timeout):
+        """Devolve o WebElement visível do passo; lança TimeoutException."""
+        limite = time.monotonic() + timeout
+        while True:
+            self.verificar_cancelamento()
+            restante = limite - time.monotonic()
+            if restante <= 0:
+                raise TimeoutException(f"Elemento não encontrado ou invisível: {passo.seletor}")
+
+            try:
+                elemento = self.driver.execute_async_script(
+                    SCRIPT_AGUARDAR, [passo.por, passo.seletor], math.ceil(min(restante, FATIA) * 1000))
+            except (JavascriptException, TimeoutException):
+                # A página mudou durante a espera e o script foi descartado.
+                elemento = None
+                time.sleep(0.05)
+
+            if elemento is not None:
+                return elemento
@@ -0,0 +1,169 @@
+"""Estados de sessão salvos: cookies, localStorage e sessionStorage.
+
+Uma suíte de preparação (ex.: login) grava o estado do navegador ao terminar
+com sucesso (chave 'salvar_estado'). Outras suítes restauram esse estado antes
+do primeiro passo (chave 'restaurar_estado') em vez de repetir o login. O
+estado vale por um tempo limitado; vencido, a suíte de preparação é executada
+de novo, no mesmo navegador, e o estado é gravado outra vez.
+
+São gravados só os cookies e o storage da origem em que a suíte de
+preparação terminou.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass, field
+
+from .suite import carregar_suite
+
+DIRETORIO_ESTADOS = 'estados_sessao'
+VALIDADE_PADRAO = 3600
+
+SCRIPT_CAPTURAR_STORAGE = """/* capturarEstado */
+var copiar = function (storage) {
+    var copia = {};
+    for (var i = 0; i < storage.length; i++) {
+        var chave = storage.key(i);
+        copia[chave] = storage.getItem(chave);
+    }
+    return copia;
+};
+return {local: copiar(window.localStorage), sessao: copiar(window.sessionStorage)};
+"""
+
+SCRIPT_RESTAURAR_STORAGE = """/* restaurarEstado */
+var estado = arguments[0];
+Object.keys(estado.local).forEach(function (chave) { window.localStorage.setItem(chave, estado.local[chave]); });
+Object.keys(estado.sessao).forEach(function (chave) { window.sessionStorage.setItem(chave, estado.sessao[chave]); });
+"""
+
+
+class ErroEstado(Exception):
+    """Estado de sessão indisponível e impossível de recapturar."""
+
+
+@dataclass
+class EstadoSessao:
+    nome: str
+    url: str
+    cookies: list = field(default_factory=list)
+    local_storage: dict = field(default_factory=dict)
+    session_storage: dict = field(default_factory=dict)
+    criado_em: float = field(default_factory=time.time)
+    suite: str = ''
+
+    @property
+    def idade(self):
+        return time.time() - self.criado_em
+
+    def expirado(self, validade):
+        """Vencido pela idade ou por algum cookie com data de expiração já passada."""
+        if validade is not None and self.idade > validade:
+            return True
+        agora = time.time()
+        return any(cookie.get('expiry') is not None and cookie['expiry'] <= agora for cookie in self.cookies)
+
+
+def capturar_estado(driver, nome, suite=''):
+    """Lê cookies e storage da página atual do navegador."""
+    storage = driver.execute_script(SCRIPT_CAPTURAR_STORAGE) or {}
+    return EstadoSessao(nome, driver.current_url, driver.get_cookies() or [], storage.get('local') or {},
+                        storage.get('sessao') or {}, suite=suite)
+
+
+def restaurar_estado(driver, estado):
+    """Abre a página em que o estado foi capturado e grava nela os cookies e o storage.
+
+    Cookies e storage só podem ser gravados na origem a que pertencem; a
+    página da suíte deve ser aberta em seguida, já com a sessão restaurada.
+    """
+    driver.get(estado.url)
+    for cookie in estado.cookies:
+        try:
+            driver.add_cookie(cookie)
+        except Exception:
+            # Alguns drivers recusam o domínio com ponto inicial; sem ele vale o host atual.
+            driver.add_cookie({chave: valor for chave, valor in cookie.items() if chave != 'domain'})
+    if estado.local_storage or estado.session_storage:
+        driver.execute_script(SCRIPT_RESTAURAR_STORAGE,
+                              {'local': estado.local_storage, 'sessao': estado.session_storage})
+
+
+def _nome_arquivo(nome):
+    return re.sub(r'[^\w-]+', '_', nome).strip('_') or 'estado'
+
+
+class ArmazemEstados:
+    """Pasta com um arquivo JSON por estado salvo; pode ser usada por várias threads.
+
+    `registrar_suite` informa de qual arquivo de suíte cada estado vem, para
+    que ele possa ser recapturado quando vencer. `ajustar_suite`, se
+    informado, recebe a suíte de captura lida do disco e aplica a ela os
+    mesmos ajustes da execução (ex.: --url da linha de comando).
+    """
+
+    def __init__(self, diretorio=DIRETORIO_ESTADOS, ajustar_suite=None):
+        self.diretorio = diretorio
+        self.ajustar_suite = ajustar_suite
+        self._suites = {}
+        self._bloqueios = defaultdict(threading.Lock)
+        self._lock = threading.Lock()
+
+    def caminho(self, nome):
+        return os.path.join(self.diretorio, f"{_nome_arquivo(nome)}.json")
+
+    def registrar_suite(self, suite, caminho):
+        """Associa os estados citados pela suíte ao arquivo da suíte que os captura."""
+        pasta = os.path.dirname(os.path.abspath(caminho))
+        salvar = suite.opcoes.get('salvar_estado')
+        if isinstance(salvar, str) and salvar:
+            self._suites[salvar] = os.path.abspath(caminho)
+        restaurar = suite.opcoes.get('restaurar_estado')
+        if isinstance(restaurar, dict) and restaurar.get('nome') and restaurar.get('suite'):
+            self._suites.setdefault(restaurar['nome'], os.path.join(pasta, restaurar['suite']))
+
+    def suite_captura(self, nome):
+        """Arquivo da suíte que captura o estado: o registrado ou o gravado no próprio estado."""
+        if nome in self._suites:
+            return self._suites[nome]
+        estado = self.carregar(nome)
+        return estado.suite if estado else ''
+
+    def carregar_suite_captura(self, caminho):
+        """Suíte que recaptura um estado, com os ajustes da execução; lança OSError/ValueError."""
+        suite = carregar_suite(caminho)
+        return self.ajustar_suite(suite) if self.ajustar_suite else suite
+
+    def bloqueio(self, nome):
+        """Lock do estado: só uma sessão por vez o recaptura."""
+        with self._lock:
+            return self._bloqueios[nome]
+
+    def carregar(self, nome, validade=None):
+        """Estado salvo, ou None se não existir, estiver corrompido ou vencido."""
+        try:
+            with open(self.caminho(nome), 'r', encoding='utf-8') as arquivo:
+                estado = EstadoSessao(**json.load(arquivo))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logging.warning(f"Estado de sessão '{nome}' ilegível, será recapturado: {e}")
+            return None
+        return None if validade is not None and estado.expirado(validade) else estado
+
+    def salvar(self, estado):
+        if not estado.suite:
+            estado.suite = self._suites.get(estado.nome, '')
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho = self.caminho(estado.nome)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        # Cookies de sessão dão acesso à conta: só o dono do arquivo pode lê-lo.
+        descritor = os.open(temporario, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+            json.dump(asdict(estado), arquivo, indent=4, ensure_ascii=False)
+        os.replace(temporario, caminho)
+        return caminho
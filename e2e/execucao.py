@@ -0,0 +1,604 @@
+"""Motor de execução dos testes E2E, independente do Qt.
+
+Usado tanto pela interface gráfica (main.py) quanto pelo executor de linha
+de comando (python -m e2e).
+"""
+import logging
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+from .dados import PoolDados
+from .drivers import ErroResolucaoDriver, resolvedor_padrao
+from .plano import (ESPERA_EVENTOS, ESPERA_POLLING, RESOLUCAO_LOTE, RESOLUCAO_PADRAO, ErroValidacao, compilar,
+                    compilar_suite, resolver_gerador)
+from .espera import EsperaEventos
+from .estado import ArmazemEstados, ErroEstado, capturar_estado, restaurar_estado
+from .metricas import coletar_metricas, resumo_metricas
+from .perfis import PERFIL_PADRAO, PERFIS, aplicar_perfil, opcoes_navegador
+from .pool import origem_url
+from .rastreamento import (CATEGORIA_ACAO, CATEGORIA_DRIVER, CATEGORIA_ELEMENTO, CATEGORIA_ESPERA,
+                           CATEGORIA_NAVEGACAO, CATEGORIA_SCREENSHOT, CATEGORIA_SUITE,
+                           CATEGORIA_WEBDRIVER, RASTREADOR_NULO)
+from .registro import registrar_evento
+from .resolucao import ResolvedorLote, comandos_modo_padrao
+from .screenshots import GravadorScreenshots
+
+
+class ErroDriver(Exception):
+    """Falha ao iniciar o navegador/WebDriver."""
+
+
+class ExecucaoCancelada(Exception):
+    """Execução interrompida por ExecutorTestes.cancelar()."""
+
+
+@dataclass
+class ResultadoPasso:
+    elemento: str
+    acao: str
+    sucesso: bool
+    erro: str = ''
+    screenshot: str = ''
+    duracao: float = 0.0
+    pulado: bool = False
+    metricas: dict = field(default_factory=dict)
+
+
+@dataclass
+class ResultadoSuite:
+    nome: str
+    passos: list = field(default_factory=list)
+    erro: str = ''
+    cancelado: bool = False
+    comandos_webdriver: int = 0
+    comandos_economizados: int = 0
+    semente_dados: Optional[int] = None
+    perfil: str = PERFIL_PADRAO
+    metricas_navegacao: dict = field(default_factory=dict)
+
+    @property
+    def sucesso(self):
+        return not self.erro and not self.cancelado and all(passo.sucesso for passo in self.passos)
+
+    @property
+    def pulados(self):
+        return sum(1 for passo in self.passos if passo.pulado)
+
+    def para_dict(self):
+        dados = asdict(self)
+        dados['sucesso'] = self.sucesso
+        return dados
+
+
+def _iniciar_navegador(navegador, caminho_driver, perfil):
+    if navegador == 'Chrome':
+        driver = webdriver.Chrome(service=ChromeService(caminho_driver), options=opcoes_navegador(navegador, perfil))
+    elif navegador == 'Firefox':
+        driver = webdriver.Firefox(service=FirefoxService(caminho_driver), options=opcoes_navegador(navegador, perfil))
+    elif navegador == 'Edge':
+        driver = webdriver.Edge(service=EdgeService(caminho_driver), options=opcoes_navegador(navegador, perfil))
+    else:
+        raise ErroDriver(f"Navegador não suportado: {navegador}")
+
+    try:
+        aplicar_perfil(driver, navegador, perfil)
+    except Exception:
+        driver.quit()
+        raise
+    return driver
+
+
+def configurar_driver(navegador, resolvedor=None, rastreador=RASTREADOR_NULO, perfil=None):
+    """Configuração robusta de WebDrivers
+
+    O driver vem do cache de resolução; se o navegador não abrir com o driver
+    em cache (ex.: navegador atualizado), o cache é invalidado e a resolução
+    é refeita uma vez. `perfil` (perfis.PerfilNavegador) define as opções de
+    desempenho do navegador.
+    """
+    perfil = perfil or PERFIS[PERFIL_PADRAO]
+    resolvedor = resolvedor or resolvedor_padrao()
+    try:
+        with rastreador.span('resolução do driver', CATEGORIA_DRIVER, navegador=navegador):
+            caminho_driver = resolvedor.resolver(navegador)
+        try:
+            with rastreador.span('abertura do navegador', CATEGORIA_DRIVER, navegador=navegador):
+                return _iniciar_navegador(navegador, caminho_driver, perfil)
+        except WebDriverException as e:
+            if resolvedor.ultima_resolucao.get(navegador, {}).get('origem') != 'cache':
+                raise
+            logging.warning(f"Driver em cache falhou para {navegador}, resolvendo novamente: {e}")
+            resolvedor.invalidar(navegador)
+            with rastreador.span('resolução do driver', CATEGORIA_DRIVER, navegador=navegador):
+                caminho_driver = resolvedor.resolver(navegador)
+            with rastreador.span('abertura do navegador', CATEGORIA_DRIVER, navegador=navegador):
+                return _iniciar_navegador(navegador, caminho_driver, perfil)
+
+    except ErroDriver:
+        raise
+
+    except ErroResolucaoDriver as e:
+        logging.error(f"Erro ao configurar WebDriver: {e}")
+        raise ErroDriver(str(e)) from e
+
+    except Exception as e:
+        # webdriver_manager falha com exceções próprias (ex.: sem rede)
+        logging.error(f"Erro ao configurar WebDriver: {e}")
+        raise ErroDriver(f"Não foi possível iniciar o navegador {navegador}. "
+                         "Verifique a instalação do driver.") from e
+
+
+class ExecutorTestes:
+    """Executa os elementos de uma suíte em um navegador.
+
+    `log` recebe cada mensagem de progresso; por padrão usa o logging.
+    `cancelar()` pode ser chamado de outra thread: a execução para no próximo
+    passo ou na próxima verificação de espera e o navegador é encerrado.
+    Com um `pool` (PoolSessoes), o navegador vem do pool e volta para ele ao
+    final em vez de ser encerrado. `resolucao='lote'` localiza os elementos
+    com scripts em lote (ver resolucao.py) e relata os comandos economizados;
+    `espera='eventos'` aguarda os elementos observando o DOM (ver espera.py).
+    Um `rastreador` (rastreamento.Rastreador) recebe spans de cada etapa e de
+    cada comando enviado ao WebDriver. As screenshots de erro são gravadas em
+    segundo plano conforme `screenshots` (screenshots.ConfiguracaoScreenshots).
+    Os valores `random:` vêm de `dados` (dados.PoolDados), gerados antes do
+    primeiro passo. Os estados de sessão salvos e restaurados pelas suítes
+    ficam em `estados` (estado.ArmazemEstados). `pensamento`, se informado,
+    é chamado antes de cada passo a partir do segundo e devolve a pausa em
+    segundos (o tempo de "pensar" de um usuário); a pausa não entra na
+    duração do passo. Com `metricas`, as métricas de desempenho da página
+    (metricas.coletar_metricas) são lidas depois da navegação inicial
+    (ResultadoSuite.metricas_navegacao) e de cada clique (ResultadoPasso.metricas),
+    fora da duração do passo.
+    """
+
+    def __init__(self, navegador='Chrome', screenshot_dir='error_screenshots', log=None, pool=None,
+                 resolucao=RESOLUCAO_PADRAO, espera=ESPERA_POLLING, rastreador=None, screenshots=None,
+                 dados=None, estados=None, pensamento=None, metricas=False):
+        self.navegador = navegador
+        self.screenshot_dir = screenshot_dir
+        self.log = log or logging.info
+        self.pool = pool
+        self.resolucao = resolucao
+        self.espera = espera
+        self.rastreador = rastreador or RASTREADOR_NULO
+        self.configuracao_screenshots = screenshots
+        self.dados = dados or PoolDados()
+        self.estados = estados or ArmazemEstados()
+        self.pensamento = pensamento
+        self.metricas = metricas
+        self.driver = None
+        self.sessao = None
+        self.cancelado = threading.Event()
+        self.comandos = 0
+        self._plano = None
+        self._lote = None
+        self._espera = None
+        self._screenshots = None
+        self._valores = {}
+        self._perfil = None
+
+        self.acoes = {
+            'Inserir Texto': self._inserir_texto,
+            'Clicar': self._clicar,
+            'Verificar Texto': self._verificar_texto,
+            'Verificar Existência': self._verificar_existencia,
+        }
+
+    def cancelar(self):
+        self.cancelado.set()
+
+    def _verificar_cancelamento(self):
+        if self.cancelado.is_set():
+            raise ExecucaoCancelada()
+
+    def _aguardar(self, wait, condicao):
+        """wait.until que também interrompe a espera quando há cancelamento."""
+        def condicao_cancelavel(driver):
+            self._verificar_cancelamento()
+            return condicao(driver)
+        return wait.until(condicao_cancelavel)
+
+    def _erro(self, erro_msg):
+        self.log(erro_msg)
+        logging.error(erro_msg)
+
+    def gerar_valor_aleatorio(self, tipo):
+        """Gera valores aleatórios baseados no tipo de campo"""
+        return self.dados.proximo(resolver_gerador(tipo))
+
+    def configurar_driver(self):
+        return configurar_driver(self.navegador, rastreador=self.rastreador, perfil=self._perfil)
+
+    def salvar_screenshot(self, erro_msg, passo=None, elemento_web=None):
+        """Captura a screenshot de erro e a envia para gravação em segundo plano.
+
+        Devolve o caminho do arquivo, ou '' se a captura falhar.
+        """
+        if not self.driver:
+            return ''
+
+        try:
+            if self._screenshots is None:
+                self._screenshots = GravadorScreenshots(self.screenshot_dir, self.configuracao_screenshots,
+                                                        self.log)
+            nome_arquivo = self._screenshots.nome_arquivo(passo.indice if passo else None,
+                                                          passo.elemento if passo else '')
+
+            with self.rastreador.span('screenshot', CATEGORIA_SCREENSHOT):
+                if elemento_web is not None and self._screenshots.configuracao.recorte_elemento:
+                    png = elemento_web.screenshot_as_png
+                else:
+                    png = self.driver.get_screenshot_as_png()
+            nome_arquivo = self._screenshots.enviar(png, nome_arquivo)
+
+            self.log(f"🖼️ Screenshot de erro salvo em: {nome_arquivo}")
+            return nome_arquivo
+
+        except Exception as e:
+            logging.error(f"Erro ao salvar screenshot: {e}")
+            self.log(f"❌ Falha ao salvar screenshot: {e}")
+            return ''
+
+    def executar_suite(self, suite):
+        return self.executar_plano(compilar_suite(suite))
+
+    def executar(self, url, elementos, nome=''):
+        """Compila os elementos e executa o plano resultante.
+
+        Lança ErroValidacao (antes de abrir o navegador) se a suíte for
+        inválida.
+        """
+        return self.executar_plano(compilar(elementos, url, nome, self.navegador))
+
+    def executar_plano(self, plano, valores=None):
+        """Abre o navegador, navega até a URL do plano e executa cada passo.
+
+        `valores` mapeia o índice do passo para o valor a usar: os `random:`
+        já reservados (PoolDados.reservar) e os 'dados:coluna' da linha do
+        conjunto de dados; sem eles, a reserva é feita aqui. Lança
+        ErroDriver se o navegador não puder ser iniciado; qualquer outra
+        falha fica registrada no ResultadoSuite devolvido.
+        """
+        resultado = ResultadoSuite(plano.nome)
+        inicio = time.perf_counter()
+
+        if valores is None:
+            self.dados.preparar([plano])
+            valores = self.dados.reservar(plano)
+        self._valores = valores
+        if any(passo.gerador for passo in plano.passos):
+            resultado.semente_dados = self.dados.semente
+            self.log(f"🎲 Valores aleatórios gerados com a semente {self.dados.semente}")
+
+        self._perfil = plano.perfil
+        resultado.perfil = plano.perfil.nome
+        self._abrir_driver()
+        self._instrumentar_driver()
+
+        try:
+            self._verificar_cancelamento()
+            if plano.restaurar_estado:
+                self._restaurar_estado(plano)
+            with self.rastreador.span('navegação', CATEGORIA_NAVEGACAO, url=plano.url):
+                self.driver.get(plano.url)
+            self.log(f"🌐 Navegando para: {plano.url}")
+            if self.metricas:
+                resultado.metricas_navegacao = self._coletar_metricas()
+
+            self._executar_passos(plano, resultado)
+            if plano.salvar_estado and resultado.sucesso:
+                self._salvar_estado(plano.salvar_estado)
+
+            if resultado.pulados:
+                self.log(f"⏭️ {resultado.pulados} passo(s) pulado(s)")
+            self.log("✅ Testes concluídos!")
+            if self._lote:
+                self.log(f"📉 Resolução em lote: {resultado.comandos_economizados} comandos WebDriver "
+                         "a menos que o modo padrão")
+
+        except ExecucaoCancelada:
+            resultado.cancelado = True
+            self.log("⛔ Execução cancelada")
+
+        except Exception as erro:
+            erro_msg = f"❌ Erro crítico durante execução dos testes: {erro}"
+            logging.error(erro_msg)
+            self.log(erro_msg)
+            resultado.erro = str(erro)
+            self.salvar_screenshot(erro_msg)
+
+        finally:
+            resultado.comandos_webdriver = self.comandos
+            self._plano = self._lote = self._espera = None
+            self._valores = {}
+            self._liberar_driver(saudavel=not resultado.erro and not resultado.cancelado)
+            if self._screenshots:
+                self._screenshots.fechar()
+                self._screenshots = None
+            fim = time.perf_counter()
+            self.rastreador.registrar('suíte', CATEGORIA_SUITE, inicio, fim,
+                                      {'nome': plano.nome, 'sucesso': resultado.sucesso})
+            registrar_evento('suite', f"Suíte {plano.nome or plano.url}: "
+                             f"{'aprovada' if resultado.sucesso else 'falhou'}",
+                             suite=plano.nome, url=plano.url, navegador=self.navegador,
+                             sucesso=resultado.sucesso, cancelado=resultado.cancelado, erro=resultado.erro,
+                             passos=len(resultado.passos), pulados=resultado.pulados,
+                             duracao_ms=round((fim - inicio) * 1000, 1), comandos=resultado.comandos_webdriver)
+
+        return resultado
+
+    def _executar_passos(self, plano, resultado):
+        """Executa os passos do plano na página atual, acrescentando-os ao resultado."""
+        self._plano = plano
+        self._espera = self._lote = None
+        if self.espera == ESPERA_EVENTOS:
+            self._espera = EsperaEventos(self.driver, self._verificar_cancelamento)
+        if self.resolucao == RESOLUCAO_LOTE:
+            self._lote = ResolvedorLote(self.driver, plano.passos, self._verificar_cancelamento,
+                                        plano.timeout, espera=self._espera)
+
+        falhas_seguidas = 0
+        motivo_parada = ''
+        for passo in plano.passos:
+            self._verificar_cancelamento()
+            motivo = motivo_parada or self._dependencia_falhou(passo, resultado.passos)
+            if motivo:
+                resultado.passos.append(self._pular_passo(plano, passo, motivo))
+                continue
+            if self.pensamento and passo is not plano.passos[0] and self.cancelado.wait(self.pensamento()):
+                raise ExecucaoCancelada()
+
+            comandos_antes = self.comandos
+            inicio_passo = time.perf_counter()
+            with self.rastreador.span('passo', CATEGORIA_SUITE, indice=passo.indice, elemento=passo.elemento):
+                resultado_passo = self._executar_passo(passo)
+            resultado_passo.duracao = time.perf_counter() - inicio_passo
+            resultado.passos.append(resultado_passo)
+            comandos_passo = self.comandos - comandos_antes
+            if self.metricas and passo.acao == 'Clicar' and resultado_passo.sucesso:
+                resultado_passo.metricas = self._coletar_metricas()
+            registrar_evento('passo', f"Passo {passo.indice + 1} ({passo.elemento}): "
+                             f"{'ok' if resultado_passo.sucesso else 'falhou'}",
+                             suite=plano.nome, passo=passo.indice + 1, elemento=passo.elemento,
+                             acao=passo.acao, sucesso=resultado_passo.sucesso, erro=resultado_passo.erro,
+                             duracao_ms=round(resultado_passo.duracao * 1000, 1),
+                             comandos=comandos_passo, metricas=resultado_passo.metricas)
+            if self._lote:
+                resultado.comandos_economizados += comandos_modo_padrao(passo) - comandos_passo
+
+            falhas_seguidas = 0 if resultado_passo.sucesso else falhas_seguidas + 1
+            if falhas_seguidas and plano.falha_rapida:
+                motivo_parada = f"falha rápida após o erro no passo {passo.indice + 1} ({passo.elemento})"
+            elif plano.max_falhas_consecutivas and falhas_seguidas >= plano.max_falhas_consecutivas:
+                motivo_parada = f"{falhas_seguidas} falha(s) seguida(s), limite da suíte atingido"
+            if motivo_parada and passo is not plano.passos[-1]:
+                self.log(f"🛑 Interrompendo a suíte: {motivo_parada}")
+
+    def _coletar_metricas(self):
+        with self.rastreador.span('métricas da página', CATEGORIA_NAVEGACAO):
+            metricas = coletar_metricas(self.driver)
+        if metricas:
+            self.log(f"📊 {resumo_metricas(metricas)}")
+        return metricas
+
+    def _restaurar_estado(self, plano):
+        """Restaura o estado de sessão do plano, recapturando-o se estiver vencido.
+
+        Só uma sessão por vez recaptura o mesmo estado; as outras esperam e
+        usam o estado recém-gravado. Lança ErroEstado se não houver estado
+        válido nem suíte de captura que passe.
+        """
+        nome = plano.restaurar_estado
+        with self.estados.bloqueio(nome):
+            estado = self.estados.carregar(nome, plano.validade_estado)
+            if estado is None:
+                # A suíte de captura roda neste navegador: a sessão já fica pronta.
+                self._recapturar_estado(nome)
+                return
+            self._verificar_cancelamento()
+            with self.rastreador.span('restaurar estado', CATEGORIA_NAVEGACAO, estado=nome):
+                restaurar_estado(self.driver, estado)
+        self.log(f"🍪 Estado de sessão '{nome}' restaurado ({len(estado.cookies)} cookie(s), "
+                 f"capturado há {estado.idade / 60:.0f} min)")
+
+    def _recapturar_estado(self, nome):
+        caminho = self.estados.suite_captura(nome)
+        if not caminho:
+            raise ErroEstado(f"estado de sessão '{nome}' vencido ou inexistente e nenhuma suíte o salva")
+        self.log(f"🔑 Estado de sessão '{nome}' vencido ou inexistente; executando {os.path.basename(caminho)}")
+        try:
+            preparacao = compilar_suite(self.estados.carregar_suite_captura(caminho))
+        except (OSError, ValueError, ErroValidacao) as e:
+            raise ErroEstado(f"não foi possível carregar a suíte que salva o estado '{nome}' ({caminho}): {e}") from e
+
+        self.dados.preparar([preparacao])
+        valores, self._valores = self._valores, self.dados.reservar(preparacao)
+        resultado = ResultadoSuite(preparacao.nome)
+        try:
+            with self.rastreador.span('captura de estado', CATEGORIA_SUITE, estado=nome, suite=preparacao.nome):
+                self.driver.get(preparacao.url)
+                self._executar_passos(preparacao, resultado)
+        finally:
+            self._valores = valores
+        if not resultado.sucesso:
+            falha = next(passo for passo in resultado.passos if not passo.sucesso)
+            raise ErroEstado(f"a suíte {preparacao.nome} não salvou o estado '{nome}': "
+                             f"falha em {falha.elemento} ({falha.erro})")
+        self._salvar_estado(nome, caminho)
+
+    def _salvar_estado(self, nome, suite=''):
+        """Grava o estado de sessão atual; uma falha ao gravar não reprova a suíte."""
+        try:
+            with self.rastreador.span('salvar estado', CATEGORIA_NAVEGACAO, estado=nome):
+                estado = capturar_estado(self.driver, nome, suite)
+            caminho = self.estados.salvar(estado)
+        except (OSError, WebDriverException) as e:
+            logging.error(f"Erro ao salvar o estado de sessão '{nome}': {e}")
+            self.log(f"⚠️ Estado de sessão '{nome}' não foi salvo: {e}")
+            return
+        self.log(f"💾 Estado de sessão '{nome}' salvo em {caminho} ({len(estado.cookies)} cookie(s))")
+
+    def _instrumentar_driver(self):
+        """Conta (e rastreia) cada comando enviado ao WebDriver durante a execução."""
+        self.comandos = 0
+        execute = getattr(self.driver, 'execute', None)
+        if execute is None:
+            return
+
+        def execute_instrumentado(comando, params=None):
+            self.comandos += 1
+            if comando == Command.GET and self.sessao:
+                # O pool limpa o storage de cada origem visitada antes de reusar a sessão.
+                origem = origem_url((params or {}).get('url'))
+                if origem:
+                    self.sessao.origens.add(origem)
+            with self.rastreador.span(comando, CATEGORIA_WEBDRIVER):
+                return execute(comando, params)
+        self.driver.execute = execute_instrumentado
+
+    def _abrir_driver(self):
+        if self.pool:
+            self.log(f"🔧 Obtendo sessão de {self.navegador} do pool")
+            with self.rastreador.span('sessão do pool', CATEGORIA_DRIVER, navegador=self.navegador):
+                self.sessao = self.pool.obter(self.navegador, self._perfil)
+            self.driver = self.sessao.driver
+        else:
+            perfil = f" (perfil {self._perfil.nome})" if self._perfil.nome != PERFIL_PADRAO else ''
+            self.log(f"🔧 Configurando navegador: {self.navegador}{perfil}")
+            self.driver = self.configurar_driver()
+            resolucao = resolvedor_padrao().ultima_resolucao.get(self.navegador)
+            if resolucao:
+                self.log(f"⏱️ Driver resolvido via {resolucao['origem']} em {resolucao['duracao'] * 1000:.0f} ms")
+
+    def _liberar_driver(self, saudavel):
+        # Remove a instrumentação, já que a sessão pode ser reutilizada.
+        vars(self.driver).pop('execute', None)
+        if self.sessao:
+            self.pool.devolver(self.sessao, saudavel)
+            self.log("♻️ Navegador devolvido ao pool" if saudavel else "🔒 Sessão descartada do pool")
+            self.sessao = None
+        else:
+            try:
+                self.driver.quit()
+                self.log("🔒 Navegador encerrado")
+            except Exception as e:
+                logging.warning(f"Erro ao fechar navegador: {e}")
+        self.driver = None
+
+    @staticmethod
+    def _dependencia_falhou(passo, resultados):
+        """Motivo para pular o passo se algum passo de que ele depende não passou."""
+        for dependencia in passo.dependencias:
+            anterior = resultados[dependencia]
+            if not anterior.sucesso:
+                situacao = 'foi pulado' if anterior.pulado else 'falhou'
+                return f"depende do passo {dependencia + 1} ({anterior.elemento}), que {situacao}"
+        return ''
+
+    def _pular_passo(self, plano, passo, motivo):
+        self.log(f"⏭️ Pulando {passo.elemento}: {motivo}")
+        registrar_evento('passo', f"Passo {passo.indice + 1} ({passo.elemento}): pulado",
+                         suite=plano.nome, passo=passo.indice + 1, elemento=passo.elemento, acao=passo.acao,
+                         sucesso=False, pulado=True, erro=motivo)
+        return ResultadoPasso(passo.elemento, passo.acao, False, motivo, pulado=True)
+
+    def _executar_passo(self, passo):
+        elemento = passo.elemento
+        self.log(f"⏳ Processando elemento: {elemento}")
+
+        try:
+            with self.rastreador.span('localizar elemento', CATEGORIA_ELEMENTO):
+                elemento_web = self._localizar(passo)
+
+        except ExecucaoCancelada:
+            raise
+
+        except Exception as e:
+            erro_msg = f"❌ Erro no elemento {elemento}: {str(e)}"
+            self._erro(erro_msg)
+            screenshot = self.salvar_screenshot(erro_msg, passo)
+            return ResultadoPasso(elemento, passo.acao, False, str(e), screenshot)
+
+        valor = self._valores.get(passo.indice, passo.valor)
+
+        try:
+            with self.rastreador.span(f"ação: {passo.acao}", CATEGORIA_ACAO):
+                try:
+                    erro_msg = self.acoes[passo.acao](passo, elemento_web, valor)
+                except StaleElementReferenceException:
+                    if not self._lote:
+                        raise
+                    # Elemento localizado antecipadamente saiu do DOM: localiza de novo.
+                    self._lote.descartar()
+                    elemento_web = self._lote.localizar(passo, self._plano.timeout_do_passo(passo),
+                                                        usar_lote=False)
+                    erro_msg = self.acoes[passo.acao](passo, elemento_web, valor)
+        except Exception as erro_interacao:
+            erro_msg = f"❌ Erro na interação com {elemento}: {erro_interacao}"
+            self._erro(erro_msg)
+            screenshot = self.salvar_screenshot(erro_msg, passo, elemento_web)
+            return ResultadoPasso(elemento, passo.acao, False, str(erro_interacao), screenshot)
+
+        if erro_msg:
+            screenshot = self.salvar_screenshot(erro_msg, passo, elemento_web)
+            return ResultadoPasso(elemento, passo.acao, False, erro_msg, screenshot)
+        return ResultadoPasso(elemento, passo.acao, True)
+
+    def _localizar(self, passo):
+        timeout = self._plano.timeout_do_passo(passo)
+        if self._lote:
+            return self._lote.localizar(passo, timeout)
+        if self._espera:
+            with self.rastreador.span('espera: eventos', CATEGORIA_ESPERA):
+                return self._espera.aguardar(passo, timeout)
+
+        wait = WebDriverWait(self.driver, timeout)
+        with self.rastreador.span('espera: presença', CATEGORIA_ESPERA):
+            elemento_web = self._aguardar(wait, EC.presence_of_element_located((passo.por, passo.seletor)))
+
+        self.driver.execute_script("arguments[0].scrollIntoView(true);", elemento_web)
+        with self.rastreador.span('espera: visibilidade', CATEGORIA_ESPERA):
+            self._aguardar(wait, EC.visibility_of(elemento_web))
+        return elemento_web
+
+    @property
+    def _rolagem(self):
+        # Nos modos em lote e por eventos o scroll vai no mesmo script da ação.
+        return "arguments[0].scrollIntoView(true);" if self._lote or self._espera else ""
+
+    # Cada ação devolve uma mensagem de erro quando a verificação falha.
+
+    def _inserir_texto(self, passo, elemento_web, valor):
+        self.driver.execute_script(self._rolagem + "arguments[0].value = '';", elemento_web)
+        elemento_web.send_keys(valor)
+        self.log(f"✏️ Inserindo texto em {passo.elemento}: {valor}")
+
+    def _clicar(self, passo, elemento_web, valor):
+        self.driver.execute_script(self._rolagem + "arguments[0].click();", elemento_web)
+        if self._lote:
+            self._lote.descartar()
+        self.log(f"👆 Clicando em {passo.elemento}")
+
+    def _verificar_texto(self, passo, elemento_web, valor):
+        if valor in elemento_web.text:
+            self.log(f"✅ Verificação de texto OK para {passo.elemento}")
+            return None
+        erro_msg = f"❌ Falha na verificação de texto para {passo.elemento}"
+        self.log(erro_msg)
+        return erro_msg
+
+    def _verificar_existencia(self, passo, elemento_web, valor):
+        self.log(f"✅ Elemento {passo.elemento} existe")
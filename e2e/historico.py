@@ -0,0 +1,300 @@
+"""Histórico das execuções em SQLite e detecção de regressões de latência.
+
+Cada execução grava o resultado e a duração de cada passo, identificada pelo
+conteúdo da suíte (PlanoExecucao.hash_conteudo), navegador, perfil de
+desempenho e URL. O relatório
+compara os percentis p50/p95 da duração de cada passo nas execuções mais
+recentes com os das execuções anteriores (a linha de base móvel). As métricas
+de desempenho da página (metricas.py), quando coletadas, também são gravadas
+e resumidas por passo em `metricas`.
+"""
+import datetime
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+CAMINHO_HISTORICO_PADRAO = os.path.join(os.path.expanduser('~'), '.cache', 'e2e-tester', 'historico.sqlite3')
+
+JANELA_BASE = 20
+RECENTES = 5
+LIMIAR_REGRESSAO = 0.2
+MINIMO_MS = 50
+PERCENTIS = (50, 95)
+# Modo incremental: até quando uma aprovação dispensa executar a suíte de novo.
+VALIDADE_APROVACAO = 24 * 3600
+# Índice, na tabela metricas, das métricas lidas logo após a navegação inicial.
+INDICE_NAVEGACAO = -1
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS execucoes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    inicio TEXT NOT NULL,
+    suite TEXT NOT NULL,
+    hash_suite TEXT NOT NULL,
+    navegador TEXT NOT NULL,
+    perfil TEXT NOT NULL DEFAULT 'padrao',
+    url TEXT NOT NULL,
+    sucesso INTEGER NOT NULL,
+    duracao REAL NOT NULL,
+    erro TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS passos (
+    execucao INTEGER NOT NULL REFERENCES execucoes (id) ON DELETE CASCADE,
+    indice INTEGER NOT NULL,
+    elemento TEXT NOT NULL,
+    acao TEXT NOT NULL,
+    sucesso INTEGER NOT NULL,
+    duracao REAL NOT NULL,
+    erro TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (execucao, indice)
+);
+CREATE TABLE IF NOT EXISTS metricas (
+    execucao INTEGER NOT NULL REFERENCES execucoes (id) ON DELETE CASCADE,
+    indice INTEGER NOT NULL,
+    nome TEXT NOT NULL,
+    valor REAL NOT NULL,
+    PRIMARY KEY (execucao, indice, nome)
+);
+"""
+# Criado depois da migração da coluna perfil, que ele usa.
+INDICE = "CREATE INDEX IF NOT EXISTS execucoes_chave ON execucoes (hash_suite, navegador, perfil, url, id)"
+
+
+def percentil(valores, p):
+    """Percentil com interpolação linear entre os valores ordenados."""
+    ordenados = sorted(valores)
+    if not ordenados:
+        return 0.0
+    posicao = (len(ordenados) - 1) * p / 100
+    inferior = int(posicao)
+    superior = min(inferior + 1, len(ordenados) - 1)
+    return ordenados[inferior] + (ordenados[superior] - ordenados[inferior]) * (posicao - inferior)
+
+
+@dataclass
+class Regressao:
+    """Passo cuja latência no percentil `metrica` piorou em relação à linha de base."""
+    suite: str
+    navegador: str
+    perfil: str
+    url: str
+    indice: int
+    elemento: str
+    metrica: str
+    base_ms: float
+    atual_ms: float
+
+    @property
+    def variacao(self):
+        return self.atual_ms / self.base_ms - 1 if self.base_ms else float('inf')
+
+
+class HistoricoExecucoes:
+    """Banco SQLite com as execuções; pode ser usado por várias threads."""
+
+    def __init__(self, caminho=CAMINHO_HISTORICO_PADRAO):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with self._conectar() as conexao:
+            conexao.executescript(ESQUEMA)
+            colunas = {linha[1] for linha in conexao.execute('PRAGMA table_info(execucoes)')}
+            if 'perfil' not in colunas:
+                conexao.execute("ALTER TABLE execucoes ADD COLUMN perfil TEXT NOT NULL DEFAULT 'padrao'")
+                conexao.execute('DROP INDEX IF EXISTS execucoes_chave')
+            if 'erro' not in colunas:
+                conexao.execute("ALTER TABLE execucoes ADD COLUMN erro TEXT NOT NULL DEFAULT ''")
+            conexao.execute(INDICE)
+
+    @contextmanager
+    def _conectar(self):
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        try:
+            conexao.execute('PRAGMA foreign_keys = ON')
+            with conexao:
+                yield conexao
+        finally:
+            conexao.close()
+
+    def registrar(self, plano, resultado, navegador=None):
+        """Grava a execução do plano; execuções canceladas não entram no histórico.
+
+        Uma execução interrompida por erro crítico antes do primeiro passo
+        (navegador que não abriu, página que não carregou) é gravada como
+        falha, sem passos, para que o modo incremental a execute de novo.
+        Devolve o id da execução, ou None se ela não foi gravada. Uma falha
+        do banco não interrompe a execução: fica só registrada no log.
+        """
+        if resultado.cancelado:
+            return None
+        # resultado.passos segue a ordem de plano.passos (para no primeiro erro crítico).
+        # Passos pulados não foram executados: não têm duração a registrar.
+        passos = [(passo.indice, resultado_passo.elemento, resultado_passo.acao, int(resultado_passo.sucesso),
+                   resultado_passo.duracao, resultado_passo.erro)
+                  for passo, resultado_passo in zip(plano.passos, resultado.passos) if not resultado_passo.pulado]
+        if not passos and not resultado.erro:
+            return None
+        metricas = [(INDICE_NAVEGACAO, nome, valor) for nome, valor in resultado.metricas_navegacao.items()]
+        metricas += [(passo.indice, nome, valor)
+                     for passo, resultado_passo in zip(plano.passos, resultado.passos)
+                     for nome, valor in resultado_passo.metricas.items()]
+        try:
+            with self._lock, self._conectar() as conexao:
+                cursor = conexao.execute(
+                    'INSERT INTO execucoes (inicio, suite, hash_suite, navegador, perfil, url, sucesso, duracao, '
+                    'erro) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (datetime.datetime.now().isoformat(timespec='seconds'), plano.nome, plano.hash_conteudo,
+                     navegador or plano.navegador or '', plano.perfil.nome, plano.url, int(resultado.sucesso),
+                     sum(passo[4] for passo in passos), resultado.erro))
+                execucao = cursor.lastrowid
+                conexao.executemany(
+                    'INSERT INTO passos (execucao, indice, elemento, acao, sucesso, duracao, erro) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?)', [(execucao,) + passo for passo in passos])
+                conexao.executemany('INSERT INTO metricas (execucao, indice, nome, valor) VALUES (?, ?, ?, ?)',
+                                    [(execucao,) + metrica for metrica in metricas])
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao gravar a execução no histórico {self.caminho}: {e}")
+            return None
+        return execucao
+
+    def ultima_execucao(self, hash_suite, navegador, perfil, url):
+        """(início, sucesso) da execução mais recente com esse conteúdo, ou None."""
+        with self._conectar() as conexao:
+            linha = conexao.execute(
+                'SELECT inicio, sucesso FROM execucoes WHERE hash_suite = ? AND navegador = ? AND perfil = ? '
+                'AND url = ? ORDER BY id DESC LIMIT 1', (hash_suite, navegador, perfil, url)).fetchone()
+        return (datetime.datetime.fromisoformat(linha[0]), bool(linha[1])) if linha else None
+
+    def motivo_execucao(self, plano, navegador=None, validade=VALIDADE_APROVACAO):
+        """Por que o plano precisa rodar no modo incremental; '' se a última aprovação ainda vale.
+
+        Roda de novo a suíte alterada (ou nunca executada com esse navegador,
+        perfil e URL), a que falhou na última execução e a aprovada há mais de
+        `validade` segundos.
+        """
+        ultima = self.ultima_execucao(plano.hash_conteudo, navegador or plano.navegador or '', plano.perfil.nome,
+                                      plano.url)
+        if ultima is None:
+            return 'nova ou alterada desde a última execução'
+        inicio, sucesso = ultima
+        if not sucesso:
+            return 'falhou na última execução'
+        idade = (datetime.datetime.now() - inicio).total_seconds()
+        if validade is not None and idade > validade:
+            return f"última aprovação há {idade / 3600:.0f} h"
+        return ''
+
+    def chaves(self):
+        """(hash_suite, navegador, perfil, url, nome da suíte) de cada suíte com histórico."""
+        with self._conectar() as conexao:
+            # Com MAX(id) no SELECT, o nome da suíte vem da execução mais recente.
+            return [linha[:5] for linha in conexao.execute(
+                'SELECT hash_suite, navegador, perfil, url, suite, MAX(id) FROM execucoes '
+                'GROUP BY hash_suite, navegador, perfil, url ORDER BY MAX(id) DESC')]
+
+    def duracoes(self, hash_suite, navegador, perfil, url, limite):
+        """{(indice, elemento): [duração em segundos, da mais recente para a mais antiga]}.
+
+        Considera as `limite` execuções mais recentes e só os passos que
+        passaram: a duração de um passo com erro mede o timeout, não o site.
+        """
+        with self._conectar() as conexao:
+            linhas = conexao.execute(
+                'SELECT p.indice, p.elemento, p.duracao FROM passos p JOIN ('
+                '    SELECT id FROM execucoes WHERE hash_suite = ? AND navegador = ? AND perfil = ? AND url = ? '
+                '    ORDER BY id DESC LIMIT ?) e ON p.execucao = e.id '
+                'WHERE p.sucesso = 1 ORDER BY p.execucao DESC',
+                (hash_suite, navegador, perfil, url, limite)).fetchall()
+        duracoes = {}
+        for indice, elemento, duracao in linhas:
+            duracoes.setdefault((indice, elemento), []).append(duracao)
+        return duracoes
+
+    def metricas(self, hash_suite, navegador, perfil, url, limite):
+        """{(indice, elemento, nome): [valores, do mais recente para o mais antigo]}.
+
+        Considera as `limite` execuções mais recentes. As métricas da
+        navegação inicial têm o índice INDICE_NAVEGACAO e elemento vazio.
+        """
+        with self._conectar() as conexao:
+            linhas = conexao.execute(
+                "SELECT m.indice, COALESCE(p.elemento, ''), m.nome, m.valor FROM metricas m JOIN ("
+                '    SELECT id FROM execucoes WHERE hash_suite = ? AND navegador = ? AND perfil = ? AND url = ? '
+                '    ORDER BY id DESC LIMIT ?) e ON m.execucao = e.id '
+                'LEFT JOIN passos p ON p.execucao = m.execucao AND p.indice = m.indice ORDER BY m.execucao DESC',
+                (hash_suite, navegador, perfil, url, limite)).fetchall()
+        metricas = {}
+        for indice, elemento, nome, valor in linhas:
+            metricas.setdefault((indice, elemento, nome), []).append(valor)
+        return metricas
+
+    def resumo_metricas(self, janela=JANELA_BASE):
+        """p50/p95 de cada métrica de página, por suíte e passo, nas `janela` execuções mais recentes."""
+        resumo = []
+        for hash_suite, navegador, perfil, url, suite in self.chaves():
+            for (indice, elemento, nome), valores in sorted(self.metricas(hash_suite, navegador, perfil, url,
+                                                                          janela).items()):
+                resumo.append(dict({'suite': suite, 'navegador': navegador, 'perfil': perfil, 'url': url,
+                                    'indice': indice, 'elemento': elemento, 'metrica': nome,
+                                    'amostras': len(valores)},
+                                   **{f"p{p}": percentil(valores, p) for p in PERCENTIS}))
+        return resumo
+
+    def regressoes(self, hash_suite, navegador, perfil, url, suite='', janela=JANELA_BASE, recentes=RECENTES,
+                   limiar=LIMIAR_REGRESSAO, minimo_ms=MINIMO_MS):
+        """Passos em que p50 ou p95 das `recentes` últimas execuções supera a base.
+
+        A base são as `janela` execuções anteriores às recentes. Só há
+        regressão quando o aumento passa de `limiar` (fração) e de `minimo_ms`,
+        e quando a base tem pelo menos `recentes` amostras do passo.
+        """
+        resultado = []
+        for (indice, elemento), duracoes in sorted(self.duracoes(hash_suite, navegador, perfil, url,
+                                                                 janela + recentes).items()):
+            atuais, base = duracoes[:recentes], duracoes[recentes:]
+            if not atuais or len(base) < recentes:
+                continue
+            for p in PERCENTIS:
+                base_ms = percentil(base, p) * 1000
+                atual_ms = percentil(atuais, p) * 1000
+                if atual_ms > base_ms * (1 + limiar) and atual_ms - base_ms > minimo_ms:
+                    resultado.append(Regressao(suite, navegador, perfil, url, indice, elemento, f"p{p}",
+                                               base_ms, atual_ms))
+        return resultado
+
+    def relatorio(self, **parametros):
+        """Regressões de todas as suítes do histórico."""
+        regressoes = []
+        for hash_suite, navegador, perfil, url, suite in self.chaves():
+            regressoes.extend(self.regressoes(hash_suite, navegador, perfil, url, suite, **parametros))
+        return regressoes
+
+
+def tabela_metricas(resumo):
+    """Texto com uma linha por métrica de cada passo, para o terminal."""
+    linhas = [f"{'Suíte':<24} {'Navegador':<9} {'Passo':<30} {'Métrica':<24} {'Amostras':>8} {'p50':>10} "
+              f"{'p95':>10}"]
+    for linha in resumo:
+        passo = ('navegação inicial' if linha['indice'] == INDICE_NAVEGACAO
+                 else f"{linha['indice'] + 1}. {linha['elemento']}")
+        linhas.append(f"{linha['suite'][:24]:<24} {linha['navegador']:<9} {passo[:30]:<30} {linha['metrica']:<24} "
+                      f"{linha['amostras']:>8} {linha['p50']:>10.4g} {linha['p95']:>10.4g}")
+    return "\n".join(linhas)
+
+
+def tabela_regressoes(regressoes):
+    """Texto com uma linha por regressão, para o terminal."""
+    linhas = [f"{'Suíte':<24} {'Navegador':<9} {'Perfil':<10} {'Passo':<30} {'Métrica':<7} {'Base (ms)':>10} "
+              f"{'Atual (ms)':>10} {'Variação':>9}"]
+    for regressao in regressoes:
+        passo = f"{regressao.indice + 1}. {regressao.elemento}"
+        linhas.append(f"{regressao.suite[:24]:<24} {regressao.navegador:<9} {regressao.perfil[:10]:<10} "
+                      f"{passo[:30]:<30} "
+                      f"{regressao.metrica:<7} {regressao.base_ms:>10.0f} {regressao.atual_ms:>10.0f} "
+                      f"{regressao.variacao:>+9.0%}")
+    return "\n".join(linhas)
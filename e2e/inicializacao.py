@@ -0,0 +1,43 @@
+"""Tempo de inicialização da interface, por etapa.
+
+As dependências pesadas (Selenium, webdriver_manager, Faker) só são
+importadas no primeiro uso; o relatório aponta quando alguma delas volta a
+ser carregada antes de a janela aparecer.
+"""
+import sys
+import time
+
+MODULOS_ADIADOS = ('selenium', 'webdriver_manager', 'faker')
+
+
+class MedidorInicializacao:
+    """Marca o fim de cada etapa desde `inicio` (time.perf_counter)."""
+
+    def __init__(self, inicio=None):
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.etapas = []
+        self._ultima = self.inicio
+
+    def marcar(self, etapa):
+        agora = time.perf_counter()
+        self.etapas.append((etapa, (agora - self._ultima) * 1000))
+        self._ultima = agora
+
+    @property
+    def total_ms(self):
+        return (self._ultima - self.inicio) * 1000
+
+    @staticmethod
+    def modulos_adiados_carregados():
+        return [modulo for modulo in MODULOS_ADIADOS if modulo in sys.modules]
+
+    def relatorio(self):
+        return {
+            'etapas_ms': {etapa: round(ms, 1) for etapa, ms in self.etapas},
+            'total_ms': round(self.total_ms, 1),
+            'modulos_adiados_carregados': self.modulos_adiados_carregados(),
+        }
+
+    def resumo(self):
+        etapas = ", ".join(f"{etapa} {ms:.0f} ms" for etapa, ms in self.etapas)
+        return f"⏱️ Janela exibida em {self.total_ms:.0f} ms ({etapas})"
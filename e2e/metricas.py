@@ -0,0 +1,132 @@
+"""Métricas de desempenho da página, lidas no próprio navegador.
+
+Depois da navegação inicial e de cada clique, um único execute_script lê o
+que a página registrou desde a leitura anterior: Navigation Timing (uma vez
+por documento, quando o carregamento termina), Resource Timing, tarefas
+longas (> 50 ms na thread principal), primeira pintura com conteúdo (FCP),
+maior pintura com conteúdo (LCP) e deslocamento acumulado de layout (CLS).
+
+Os observadores (PerformanceObserver com `buffered`) ficam instalados no
+documento na primeira leitura e recebem também as entradas anteriores a
+ela; navegadores que não conhecem algum tipo de entrada (o Firefox não tem
+tarefas longas nem layout-shift) simplesmente não devolvem essa métrica.
+"""
+from selenium.common.exceptions import WebDriverException
+
+SCRIPT_COLETAR_METRICAS = """/* coletarMetricas */
+var p = window.performance;
+if (!p || !p.getEntriesByType) { return null; }
+var m = window.__e2eMetricas;
+if (!m) {
+    m = window.__e2eMetricas = {observadores: [], pendentes: [], recursos: 0, navegacao: false, fcp: false,
+                                lcp: 0, lcpInformado: 0};
+    var tipos = (window.PerformanceObserver && PerformanceObserver.supportedEntryTypes) || [];
+    ['longtask', 'layout-shift', 'largest-contentful-paint'].forEach(function (tipo) {
+        if (tipos.indexOf(tipo) < 0) { return; }
+        var observador = new PerformanceObserver(function (lista) {
+            Array.prototype.push.apply(m.pendentes, lista.getEntries());
+        });
+        observador.observe({type: tipo, buffered: true});
+        m.observadores.push(observador);
+    });
+}
+var metricas = {};
+var navegacao = p.getEntriesByType('navigation')[0];
+if (!m.navegacao && navegacao && navegacao.loadEventEnd > 0) {
+    m.navegacao = true;
+    metricas.ttfb_ms = navegacao.responseStart;
+    metricas.dom_carregado_ms = navegacao.domContentLoadedEventEnd;
+    metricas.carregamento_ms = navegacao.loadEventEnd;
+    metricas.bytes_documento = navegacao.transferSize || 0;
+}
+if (!m.fcp) {
+    p.getEntriesByType('paint').forEach(function (entrada) {
+        if (entrada.name === 'first-contentful-paint') {
+            m.fcp = true;
+            metricas.fcp_ms = entrada.startTime;
+        }
+    });
+}
+var recursos = p.getEntriesByType('resource').slice(m.recursos);
+m.recursos += recursos.length;
+metricas.recursos = recursos.length;
+metricas.bytes_recursos = 0;
+metricas.recurso_mais_lento_ms = 0;
+recursos.forEach(function (entrada) {
+    metricas.bytes_recursos += entrada.transferSize || 0;
+    metricas.recurso_mais_lento_ms = Math.max(metricas.recurso_mais_lento_ms, entrada.duration);
+});
+m.observadores.forEach(function (observador) {
+    Array.prototype.push.apply(m.pendentes, observador.takeRecords());
+});
+var pendentes = m.pendentes;
+m.pendentes = [];
+if (m.observadores.length) {
+    metricas.tarefas_longas = 0;
+    metricas.tarefas_longas_ms = 0;
+    metricas.cls = 0;
+}
+pendentes.forEach(function (entrada) {
+    if (entrada.entryType === 'longtask') {
+        metricas.tarefas_longas += 1;
+        metricas.tarefas_longas_ms += entrada.duration;
+    } else if (entrada.entryType === 'layout-shift') {
+        if (!entrada.hadRecentInput) { metricas.cls += entrada.value; }
+    } else if (entrada.entryType === 'largest-contentful-paint') {
+        m.lcp = Math.max(m.lcp, entrada.renderTime || entrada.loadTime || entrada.startTime);
+    }
+});
+if (m.lcp > m.lcpInformado) {
+    m.lcpInformado = m.lcp;
+    metricas.lcp_ms = m.lcp;
+}
+return metricas;
+"""
+
+# Nome da métrica -> (rótulo, unidade), na ordem em que aparecem nos relatórios.
+# Métricas sem unidade de tempo são contagens, bytes ou, no caso do CLS, a pontuação.
+METRICAS = {
+    'ttfb_ms': ('TTFB', 'ms'),
+    'dom_carregado_ms': ('DOMContentLoaded', 'ms'),
+    'carregamento_ms': ('Carregamento', 'ms'),
+    'fcp_ms': ('FCP', 'ms'),
+    'lcp_ms': ('LCP', 'ms'),
+    'cls': ('CLS', ''),
+    'tarefas_longas': ('Tarefas longas', ''),
+    'tarefas_longas_ms': ('Tempo em tarefas longas', 'ms'),
+    'recursos': ('Recursos', ''),
+    'bytes_recursos': ('Bytes de recursos', 'B'),
+    'recurso_mais_lento_ms': ('Recurso mais lento', 'ms'),
+    'bytes_documento': ('Bytes do documento', 'B'),
+}
+
+
+def coletar_metricas(driver):
+    """Métricas registradas pela página desde a leitura anterior; {} se não houver.
+
+    Só nomes de METRICAS, com valores numéricos; os tempos de navegação e
+    pintura são contados a partir do início da navegação do documento.
+    """
+    try:
+        metricas = driver.execute_script(SCRIPT_COLETAR_METRICAS)
+    except WebDriverException:
+        # A página pode estar trocando de documento bem no meio da leitura.
+        return {}
+    if not isinstance(metricas, dict):
+        return {}
+    return {nome: round(float(valor), 4 if nome == 'cls' else 1) for nome, valor in metricas.items()
+            if nome in METRICAS and isinstance(valor, (int, float)) and not isinstance(valor, bool)}
+
+
+def formatar_metrica(nome, valor):
+    rotulo, unidade = METRICAS[nome]
+    if unidade == 'ms':
+        return f"{rotulo} {valor:.0f} ms"
+    if unidade == 'B':
+        return f"{rotulo} {valor / 1024:.0f} KB"
+    return f"{rotulo} {valor:.3f}" if nome == 'cls' else f"{rotulo} {valor:.0f}"
+
+
+def resumo_metricas(metricas):
+    """Texto curto para o log, com as métricas que a página informou."""
+    return ", ".join(formatar_metrica(nome, metricas[nome]) for nome in METRICAS if nome in metricas)
@@ -0,0 +1,164 @@
+"""Perfis de desempenho do navegador.
+
+Um perfil reúne as opções que deixam o navegador mais rápido para suítes que
+só verificam formulários e textos: modo headless, estratégia de carregamento
+da página, bloqueio de imagens, fontes, mídia e hosts de terceiros, extensões
+desativadas e tamanho de janela fixo. A suíte escolhe um perfil pelo nome
+(chave 'perfil') ou define o seu, partindo de um perfil existente:
+
+    "perfil": {"base": "rapido", "carregamento": "none", "hosts_bloqueados": ["*.cdn-lento.com"]}
+"""
+import logging
+from dataclasses import dataclass, fields, replace
+from typing import Optional
+
+PERFIL_PADRAO = 'padrao'
+CARREGAMENTOS = ['normal', 'eager', 'none']
+BLOQUEIOS = ['imagens', 'fontes', 'midia', 'terceiros']
+
+# Padrões de URL usados no bloqueio pelo DevTools (Chrome e Edge).
+PADROES_BLOQUEIO = {
+    'imagens': ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.bmp', '*.avif'],
+    'fontes': ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot', '*fonts.googleapis.com*', '*fonts.gstatic.com*'],
+    'midia': ['*.mp4', '*.webm', '*.ogg', '*.mp3', '*.wav', '*.m4a', '*.mov', '*.m3u8'],
+    # Análise, anúncios, chats e redes sociais comuns.
+    'terceiros': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+                  '*googlesyndication.com*', '*facebook.net*', '*connect.facebook.com*', '*hotjar.com*',
+                  '*clarity.ms*', '*segment.io*', '*mixpanel.com*', '*intercom.io*', '*zendesk.com*',
+                  '*youtube.com/embed*', '*platform.twitter.com*', '*linkedin.com/insight*'],
+}
+
+
+class ErroPerfil(ValueError):
+    """Perfil desconhecido ou com opções inválidas."""
+
+
+@dataclass(frozen=True)
+class PerfilNavegador:
+    nome: str = PERFIL_PADRAO
+    headless: bool = False
+    carregamento: str = 'normal'
+    bloquear: tuple = ()
+    hosts_bloqueados: tuple = ()
+    sem_extensoes: bool = False
+    janela: Optional[tuple] = None
+
+    @property
+    def padroes_bloqueados(self):
+        """Padrões de URL bloqueados: os das categorias em `bloquear` e os hosts extras."""
+        padroes = [padrao for categoria in self.bloquear for padrao in PADROES_BLOQUEIO[categoria]]
+        padroes.extend(f"*{host}*" if '*' not in host else host for host in self.hosts_bloqueados)
+        return padroes
+
+
+PERFIS = {
+    PERFIL_PADRAO: PerfilNavegador(),
+    'headless': PerfilNavegador('headless', headless=True, janela=(1366, 768)),
+    'rapido': PerfilNavegador('rapido', headless=True, carregamento='eager',
+                              bloquear=('imagens', 'fontes', 'midia'), sem_extensoes=True, janela=(1366, 768)),
+    'leve': PerfilNavegador('leve', headless=True, carregamento='eager', bloquear=tuple(BLOQUEIOS),
+                            sem_extensoes=True, janela=(1366, 768)),
+}
+
+
+def resolver_perfil(definicao):
+    """Converte o valor da chave 'perfil' (nome ou objeto) em PerfilNavegador.
+
+    Lança ErroPerfil se o nome for desconhecido ou alguma opção for inválida.
+    """
+    if definicao is None or definicao == '':
+        return PERFIS[PERFIL_PADRAO]
+    if isinstance(definicao, PerfilNavegador):
+        return definicao
+    if isinstance(definicao, str):
+        if definicao not in PERFIS:
+            raise ErroPerfil(f"perfil desconhecido '{definicao}' (disponíveis: {', '.join(PERFIS)})")
+        return PERFIS[definicao]
+    if not isinstance(definicao, dict):
+        raise ErroPerfil("perfil deve ser um nome ou um objeto com as opções")
+
+    opcoes = dict(definicao)
+    base = resolver_perfil(opcoes.pop('base', PERFIL_PADRAO))
+    conhecidas = {campo.name for campo in fields(PerfilNavegador)}
+    desconhecidas = sorted(set(opcoes) - conhecidas)
+    if desconhecidas:
+        raise ErroPerfil(f"opções de perfil desconhecidas: {', '.join(desconhecidas)}")
+
+    for chave in ('headless', 'sem_extensoes'):
+        if chave in opcoes and not isinstance(opcoes[chave], bool):
+            raise ErroPerfil(f"perfil: {chave} deve ser true ou false")
+    if opcoes.get('carregamento', base.carregamento) not in CARREGAMENTOS:
+        raise ErroPerfil(f"perfil: carregamento deve ser um de {', '.join(CARREGAMENTOS)}")
+    if 'bloquear' in opcoes:
+        bloquear = opcoes['bloquear']
+        if not isinstance(bloquear, list) or any(categoria not in BLOQUEIOS for categoria in bloquear):
+            raise ErroPerfil(f"perfil: bloquear deve ser uma lista com {', '.join(BLOQUEIOS)}")
+        opcoes['bloquear'] = tuple(bloquear)
+    if 'hosts_bloqueados' in opcoes:
+        hosts = opcoes['hosts_bloqueados']
+        if not isinstance(hosts, list) or not all(isinstance(host, str) and host for host in hosts):
+            raise ErroPerfil("perfil: hosts_bloqueados deve ser uma lista de hosts")
+        opcoes['hosts_bloqueados'] = tuple(hosts)
+    if opcoes.get('janela') is not None:
+        janela = opcoes['janela']
+        if (not isinstance(janela, list) or len(janela) != 2
+                or not all(isinstance(medida, int) and not isinstance(medida, bool) and medida > 0
+                           for medida in janela)):
+            raise ErroPerfil("perfil: janela deve ser [largura, altura] em pixels")
+        opcoes['janela'] = tuple(janela)
+
+    opcoes.setdefault('nome', f"{base.nome}+personalizado" if base.nome != PERFIL_PADRAO else 'personalizado')
+    return replace(base, **opcoes)
+
+
+def opcoes_navegador(navegador, perfil):
+    """Options do Selenium para o navegador, com as opções do perfil aplicadas."""
+    from selenium import webdriver
+
+    if navegador == 'Firefox':
+        options = webdriver.FirefoxOptions()
+        options.add_argument('--log-level=fatal')
+        if perfil.headless:
+            options.add_argument('-headless')
+        if perfil.janela:
+            options.add_argument(f'--width={perfil.janela[0]}')
+            options.add_argument(f'--height={perfil.janela[1]}')
+        if 'imagens' in perfil.bloquear:
+            options.set_preference('permissions.default.image', 2)
+        if 'fontes' in perfil.bloquear:
+            options.set_preference('browser.display.use_document_fonts', 0)
+        if 'midia' in perfil.bloquear:
+            options.set_preference('media.autoplay.default', 5)
+            options.set_preference('media.play-stand-alone', False)
+    else:
+        options = webdriver.ChromeOptions() if navegador == 'Chrome' else webdriver.EdgeOptions()
+        options.add_argument('--log-level=3')
+        if navegador == 'Chrome':
+            options.add_argument('--disable-gpu')
+            options.add_argument('--no-sandbox')
+        if perfil.headless:
+            options.add_argument('--headless=new')
+        if perfil.janela:
+            options.add_argument(f'--window-size={perfil.janela[0]},{perfil.janela[1]}')
+        if perfil.sem_extensoes:
+            options.add_argument('--disable-extensions')
+            options.add_argument('--disable-component-extensions-with-background-pages')
+        if 'imagens' in perfil.bloquear:
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+
+    options.page_load_strategy = perfil.carregamento
+    return options
+
+
+def aplicar_perfil(driver, navegador, perfil):
+    """Ajustes feitos com o navegador já aberto: bloqueio de URLs pelo DevTools."""
+    padroes = perfil.padroes_bloqueados
+    if not padroes:
+        return
+    if not hasattr(driver, 'execute_cdp_cmd'):
+        if perfil.hosts_bloqueados or 'terceiros' in perfil.bloquear:
+            logging.warning(f"Bloqueio de hosts não suportado no {navegador}; perfil {perfil.nome} "
+                            "aplicado sem ele")
+        return
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': padroes})
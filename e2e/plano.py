@@ -0,0 +1,272 @@
+"""Compilação de suítes em planos de execução validados.
+
+A suíte (vinda da tabela ou do JSON) é convertida uma única vez em uma tupla
+imutável de Passo, com estratégia de seleção, ação e gerador de valor já
+resolvidos. Qualquer erro de configuração é reportado aqui, antes de abrir o
+navegador.
+"""
+import hashlib
+import json
+from typing import NamedTuple, Optional
+
+from .estado import VALIDADE_PADRAO
+from .perfis import ErroPerfil, PerfilNavegador, resolver_perfil
+
+TIPOS_SELETOR = ['ID', 'Name', 'XPath', 'CSS Selector', 'Class Name', 'Link Text']
+ACOES = ['Inserir Texto', 'Clicar', 'Verificar Texto', 'Verificar Existência']
+
+# Estratégias de localização do WebDriver (valores de selenium.webdriver.common.by.By),
+# escritas aqui para que compilar uma suíte não importe o Selenium.
+METODOS_SELECAO = {
+    'ID': 'id',
+    'Name': 'name',
+    'XPath': 'xpath',
+    'CSS Selector': 'css selector',
+    'Class Name': 'class name',
+    'Link Text': 'link text'
+}
+
+PREFIXO_ALEATORIO = 'random:'
+PREFIXO_DADOS = 'dados:'
+TIMEOUT_PADRAO = 20
+GERADORES = ['nome', 'email', 'telefone', 'endereço', 'número',
+             'cpf', 'cnpj', 'cep', 'data', 'senha', 'uuid', 'empresa']
+GERADOR_PADRAO = 'texto'
+
+# Modos de resolução de elementos e de espera do ExecutorTestes; ficam aqui, e
+# não em execucao.py, para que a linha de comando os liste sem importar o Selenium.
+RESOLUCAO_PADRAO = 'padrao'
+RESOLUCAO_LOTE = 'lote'
+MODOS_RESOLUCAO = [RESOLUCAO_PADRAO, RESOLUCAO_LOTE]
+
+ESPERA_POLLING = 'polling'
+ESPERA_EVENTOS = 'eventos'
+MODOS_ESPERA = [ESPERA_POLLING, ESPERA_EVENTOS]
+
+
+class ErroValidacao(Exception):
+    """Suíte com configuração inválida; `erros` lista cada problema."""
+
+    def __init__(self, erros):
+        super().__init__("\n".join(erros))
+        self.erros = erros
+
+
+class Passo(NamedTuple):
+    indice: int
+    elemento: str
+    por: str
+    seletor: str
+    acao: str
+    valor: str
+    gerador: Optional[str] = None
+    timeout: Optional[float] = None
+    coluna: Optional[str] = None
+    dependencias: tuple = ()
+
+
+class PlanoExecucao(NamedTuple):
+    nome: str
+    url: str
+    navegador: str
+    passos: tuple
+    timeout: float = TIMEOUT_PADRAO
+    locale: Optional[str] = None
+    falha_rapida: bool = False
+    max_falhas_consecutivas: Optional[int] = None
+    perfil: PerfilNavegador = PerfilNavegador()
+    salvar_estado: Optional[str] = None
+    restaurar_estado: Optional[str] = None
+    validade_estado: float = VALIDADE_PADRAO
+
+    def timeout_do_passo(self, passo):
+        return passo.timeout if passo.timeout is not None else self.timeout
+
+    @property
+    def colunas(self):
+        """Colunas do conjunto de dados usadas pelos passos (valores 'dados:coluna')."""
+        return {passo.coluna for passo in self.passos if passo.coluna}
+
+    @property
+    def hash_conteudo(self):
+        """Identifica o conteúdo dos passos; URL e navegador ficam de fora."""
+        conteudo = json.dumps([list(passo) for passo in self.passos], ensure_ascii=False)
+        return hashlib.sha1(conteudo.encode('utf-8')).hexdigest()[:16]
+
+
+def locale_disponivel(locale):
+    """Se o Faker tem o locale; a lista só é importada quando uma suíte define um."""
+    from faker.config import AVAILABLE_LOCALES
+    return locale in AVAILABLE_LOCALES
+
+
+def _validar_timeout(timeout, contexto, erros):
+    if timeout is None:
+        return None
+    if isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout <= 0:
+        erros.append(f"{contexto}: timeout deve ser um número de segundos maior que zero")
+        return None
+    return float(timeout)
+
+
+def _resolver_dependencias(indice, elemento, depende_de, anteriores, erros):
+    """Converte 'depende_de' (nome de elemento ou número do passo, ou lista deles) em índices.
+
+    Só valem passos anteriores; um nome repetido se refere à ocorrência mais
+    recente antes do passo.
+    """
+    if depende_de is None or depende_de == '':
+        return ()
+    referencias = depende_de if isinstance(depende_de, list) else [depende_de]
+    dependencias = []
+    for referencia in referencias:
+        if isinstance(referencia, int) and not isinstance(referencia, bool):
+            if not 1 <= referencia <= indice:
+                erros.append(f"Passo {indice + 1} ({elemento}): depende_de {referencia} não é um passo anterior")
+                continue
+            dependencias.append(referencia - 1)
+        elif isinstance(referencia, str) and referencia in anteriores:
+            dependencias.append(anteriores[referencia])
+        else:
+            erros.append(f"Passo {indice + 1} ({elemento}): depende_de '{referencia}' não é um elemento anterior")
+    return tuple(sorted(set(dependencias)))
+
+
+def _validar_estados(salvar_estado, restaurar_estado, erros):
+    """Normaliza 'salvar_estado' e 'restaurar_estado'; devolve (salvar, restaurar, validade).
+
+    'restaurar_estado' é o nome do estado ou um objeto com nome, validade (em
+    segundos) e suite (arquivo da suíte que captura o estado).
+    """
+    if salvar_estado is not None and (not isinstance(salvar_estado, str) or not salvar_estado.strip()):
+        erros.append("Suíte: salvar_estado deve ser o nome do estado")
+        salvar_estado = None
+    validade = VALIDADE_PADRAO
+    if isinstance(restaurar_estado, dict):
+        desconhecidas = sorted(set(restaurar_estado) - {'nome', 'validade', 'suite'})
+        if desconhecidas:
+            erros.append(f"Suíte: opções de restaurar_estado desconhecidas: {', '.join(desconhecidas)}")
+        validade = restaurar_estado.get('validade', VALIDADE_PADRAO)
+        if isinstance(validade, bool) or not isinstance(validade, (int, float)) or validade <= 0:
+            erros.append("Suíte: restaurar_estado: validade deve ser um número de segundos maior que zero")
+            validade = VALIDADE_PADRAO
+        if not isinstance(restaurar_estado.get('suite', ''), str):
+            erros.append("Suíte: restaurar_estado: suite deve ser o caminho de um arquivo de suíte")
+        restaurar_estado = restaurar_estado.get('nome')
+    if restaurar_estado is not None and (not isinstance(restaurar_estado, str) or not restaurar_estado.strip()):
+        erros.append("Suíte: restaurar_estado deve ser o nome do estado ou um objeto com nome e validade")
+        restaurar_estado = None
+    if salvar_estado and salvar_estado == restaurar_estado:
+        erros.append(f"Suíte: o estado '{salvar_estado}' não pode ser salvo e restaurado pela mesma suíte")
+    return salvar_estado or None, restaurar_estado or None, float(validade)
+
+
+def resolver_gerador(tipo):
+    """Converte o texto após 'random:' no nome de um gerador conhecido."""
+    tipo = tipo.lower()
+    for gerador in GERADORES:
+        if gerador in tipo:
+            return gerador
+    return GERADOR_PADRAO
+
+
+def compilar_passo(indice, dados):
+    """Compila um elemento da suíte; devolve (Passo, lista de erros)."""
+    erros = []
+    if not isinstance(dados, dict):
+        return None, [f"Passo {indice + 1}: formato inválido"]
+
+    elemento = dados.get('elemento', '') or f"passo {indice + 1}"
+    if not isinstance(elemento, str):
+        erros.append(f"Passo {indice + 1}: o nome do elemento deve ser texto")
+        elemento = f"passo {indice + 1}"
+    # Números, listas ou null vindos do JSON: viram erro de validação, não AttributeError adiante.
+    for campo in ('tipo_seletor', 'seletor', 'acao', 'valor'):
+        if dados.get(campo) is not None and not isinstance(dados[campo], str):
+            erros.append(f"Passo {indice + 1} ({elemento}): '{campo}' deve ser texto")
+    if erros:
+        return None, erros
+    tipo_seletor = dados.get('tipo_seletor') or ''
+    seletor = dados.get('seletor') or ''
+    acao = dados.get('acao') or ''
+    valor = dados.get('valor') or ''
+
+    if tipo_seletor not in METODOS_SELECAO:
+        erros.append(f"Passo {indice + 1} ({elemento}): tipo de seletor desconhecido '{tipo_seletor}'")
+    if not seletor:
+        erros.append(f"Passo {indice + 1} ({elemento}): seletor vazio")
+    if acao not in ACOES:
+        erros.append(f"Passo {indice + 1} ({elemento}): ação desconhecida '{acao}'")
+    timeout = _validar_timeout(dados.get('timeout'), f"Passo {indice + 1} ({elemento})", erros)
+
+    gerador = None
+    coluna = None
+    if valor.lower().startswith(PREFIXO_ALEATORIO):
+        gerador = resolver_gerador(valor.split(':')[1])
+    elif valor.lower().startswith(PREFIXO_DADOS):
+        coluna = valor[len(PREFIXO_DADOS):].strip()
+        if not coluna:
+            erros.append(f"Passo {indice + 1} ({elemento}): coluna do conjunto de dados não informada")
+
+    if erros:
+        return None, erros
+    return Passo(indice, elemento, METODOS_SELECAO[tipo_seletor], seletor, acao, valor, gerador, timeout,
+                 coluna), []
+
+
+def compilar(elementos, url='', nome='', navegador='', timeout=None, locale=None, falha_rapida=False,
+             max_falhas_consecutivas=None, perfil=None, salvar_estado=None, restaurar_estado=None):
+    """Compila e valida a lista de elementos; lança ErroValidacao.
+
+    `timeout` é o tempo máximo de espera por elemento na suíte; cada passo
+    pode ter o seu próprio na chave 'timeout'. `locale` (ex.: 'pt_BR') é o
+    idioma dos valores `random:`. Com `falha_rapida`, os passos seguintes a
+    uma falha são pulados; com `max_falhas_consecutivas`, isso acontece após
+    essa quantidade de falhas seguidas. Cada passo pode declarar na chave
+    'depende_de' os passos que precisam ter passado para que ele execute.
+    `perfil` é o perfil de desempenho do navegador (nome ou objeto, ver
+    perfis.py). Com `salvar_estado`, o estado da sessão (cookies e storage)
+    é gravado com esse nome ao fim de uma execução bem-sucedida; com
+    `restaurar_estado`, ele é restaurado antes do primeiro passo (ver
+    estado.py).
+    """
+    erros = []
+    passos = []
+    if not url:
+        erros.append("URL do teste não informada")
+    timeout = _validar_timeout(timeout, "Suíte", erros) or TIMEOUT_PADRAO
+    if locale and not locale_disponivel(locale):
+        erros.append(f"Suíte: locale desconhecido '{locale}'")
+    if not isinstance(falha_rapida, bool):
+        erros.append("Suíte: falha_rapida deve ser true ou false")
+    if max_falhas_consecutivas is not None and (isinstance(max_falhas_consecutivas, bool)
+                                               or not isinstance(max_falhas_consecutivas, int)
+                                               or max_falhas_consecutivas < 1):
+        erros.append("Suíte: max_falhas_consecutivas deve ser um número inteiro maior que zero")
+    try:
+        perfil = resolver_perfil(perfil)
+    except ErroPerfil as e:
+        erros.append(f"Suíte: {e}")
+    salvar_estado, restaurar_estado, validade_estado = _validar_estados(salvar_estado, restaurar_estado, erros)
+
+    anteriores = {}
+    for indice, dados in enumerate(elementos):
+        passo, erros_passo = compilar_passo(indice, dados)
+        erros.extend(erros_passo)
+        if passo:
+            dependencias = _resolver_dependencias(indice, passo.elemento, dados.get('depende_de'),
+                                                  anteriores, erros)
+            passos.append(passo._replace(dependencias=dependencias))
+            anteriores[passo.elemento] = indice
+
+    if erros:
+        raise ErroValidacao(erros)
+    return PlanoExecucao(nome, url, navegador, tuple(passos), timeout, locale or None, falha_rapida,
+                         max_falhas_consecutivas, perfil, salvar_estado, restaurar_estado, validade_estado)
+
+
+def compilar_suite(suite):
+    return compilar(suite.elementos, suite.url, suite.nome, suite.navegador, suite.opcoes.get('timeout'),
+                    suite.opcoes.get('locale'), suite.opcoes.get('falha_rapida', False),
+                    suite.opcoes.get('max_falhas_consecutivas'), suite.opcoes.get('perfil'),
+                    suite.opcoes.get('salvar_estado'), suite.opcoes.get('restaurar_estado'))
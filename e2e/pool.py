@@ -0,0 +1,179 @@
+"""Pool de sessões de navegador aquecidas, reutilizadas entre execuções.
+
+Abrir o navegador costuma custar vários segundos; o pool mantém as sessões
+vivas e, antes de entregá-las de novo, limpa cookies, storage e janelas.
+Sessões velhas demais, muito usadas ou que não respondem são descartadas.
+Como o perfil de desempenho é definido na abertura do navegador, uma sessão
+só é reaproveitada por execuções com o mesmo navegador e perfil.
+
+O storage do navegador é separado por origem. O sessionStorage some junto
+com a aba, que é trocada por uma nova a cada reuso; o localStorage (e, no
+Chromium, IndexedDB, Cache Storage e service workers) é limpo em cada origem
+registrada na sessão: as navegações feitas pelo executor e a página em que
+a sessão foi devolvida. Origens alcançadas só no meio da execução, por um
+clique ou redirecionamento, não são conhecidas e podem manter o localStorage.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+SCRIPT_LIMPAR_STORAGE = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+return window.location.origin;
+"""
+
+# Tipos de storage apagados via CDP (Storage.clearDataForOrigin) no Chromium;
+# os cookies são apagados à parte, para todos os domínios de uma vez.
+TIPOS_STORAGE_CDP = 'local_storage,indexeddb,websql,cache_storage,service_workers'
+
+# Timeout de script padrão do WebDriver (W3C), restaurado a cada reuso, já que
+# a espera por eventos o ajusta para as suas fatias.
+TIMEOUT_SCRIPT_PADRAO = 30
+
+
+def origem_url(url):
+    """'https://exemplo.com:8443' para uma URL http(s); None para as demais."""
+    partes = urlsplit(url or '')
+    if partes.scheme not in ('http', 'https') or not partes.netloc:
+        return None
+    return f"{partes.scheme}://{partes.netloc}"
+
+
+def _configurar_driver(navegador, perfil=None):
+    # O motor (e com ele o Selenium) só é importado ao abrir o primeiro navegador.
+    from .execucao import configurar_driver
+    return configurar_driver(navegador, perfil=perfil)
+
+
+@dataclass
+class SessaoNavegador:
+    navegador: str
+    driver: object
+    perfil: object = None
+    criada_em: float = field(default_factory=time.monotonic)
+    usos: int = 0
+    tamanho_janela: dict = None
+    origens: set = field(default_factory=set)
+
+    @property
+    def idade(self):
+        return time.monotonic() - self.criada_em
+
+
+class PoolSessoes:
+    """Entrega e recebe de volta sessões de navegador.
+
+    `max_idade` (segundos) e `max_usos` limitam a vida de cada sessão;
+    `max_ociosas` limita quantas sessões paradas ficam abertas por navegador
+    e perfil. `fabrica(navegador, perfil)` abre um navegador novo.
+    """
+
+    def __init__(self, fabrica=_configurar_driver, max_idade=900, max_usos=50, max_ociosas=4):
+        self.fabrica = fabrica
+        self.max_idade = max_idade
+        self.max_usos = max_usos
+        self.max_ociosas = max_ociosas
+        self._ociosas = {}
+        self._lock = threading.Lock()
+
+    def obter(self, navegador, perfil=None):
+        """Devolve uma sessão limpa, reaproveitada ou recém-criada.
+
+        Lança ErroDriver se for preciso criar uma sessão e o navegador falhar.
+        """
+        while True:
+            with self._lock:
+                ociosas = self._ociosas.get((navegador, perfil), [])
+                sessao = ociosas.pop() if ociosas else None
+            if sessao is None:
+                break
+            if self._expirada(sessao) or not self._saudavel(sessao) or not self._resetar(sessao):
+                self._encerrar(sessao)
+                continue
+            logging.info(f"Reutilizando sessão de {navegador} (uso {sessao.usos + 1})")
+            return sessao
+
+        sessao = SessaoNavegador(navegador, self.fabrica(navegador, perfil=perfil), perfil)
+        try:
+            sessao.tamanho_janela = sessao.driver.get_window_size()
+        except Exception:
+            pass
+        return sessao
+
+    def devolver(self, sessao, saudavel=True):
+        """Recebe a sessão de volta; sessões com problema são encerradas."""
+        sessao.usos += 1
+        if not saudavel or self._expirada(sessao):
+            self._encerrar(sessao)
+            return
+
+        # O storage é por origem: limpa enquanto ainda está na página testada.
+        try:
+            sessao.origens.discard(sessao.driver.execute_script(SCRIPT_LIMPAR_STORAGE))
+        except Exception:
+            pass
+
+        with self._lock:
+            ociosas = self._ociosas.setdefault((sessao.navegador, sessao.perfil), [])
+            if len(ociosas) < self.max_ociosas:
+                ociosas.append(sessao)
+                return
+        self._encerrar(sessao)
+
+    def encerrar_todas(self):
+        with self._lock:
+            sessoes = [sessao for ociosas in self._ociosas.values() for sessao in ociosas]
+            self._ociosas.clear()
+        for sessao in sessoes:
+            self._encerrar(sessao)
+
+    def _expirada(self, sessao):
+        return sessao.usos >= self.max_usos or sessao.idade >= self.max_idade
+
+    def _saudavel(self, sessao):
+        try:
+            return bool(sessao.driver.window_handles)
+        except Exception:
+            return False
+
+    def _resetar(self, sessao):
+        driver = sessao.driver
+        try:
+            # Uma aba nova não herda o sessionStorage de nenhuma origem.
+            janelas = driver.window_handles
+            driver.switch_to.new_window('tab')
+            nova = driver.current_window_handle
+            for janela in janelas:
+                driver.switch_to.window(janela)
+                driver.close()
+            driver.switch_to.window(nova)
+
+            if hasattr(driver, 'execute_cdp_cmd'):
+                for origem in sessao.origens:
+                    driver.execute_cdp_cmd('Storage.clearDataForOrigin',
+                                           {'origin': origem, 'storageTypes': TIPOS_STORAGE_CDP})
+                driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            else:
+                for origem in sessao.origens:
+                    driver.get(origem)
+                    driver.execute_script(SCRIPT_LIMPAR_STORAGE)
+            sessao.origens.clear()
+            driver.delete_all_cookies()
+            driver.get('about:blank')
+            driver.set_script_timeout(TIMEOUT_SCRIPT_PADRAO)
+
+            if sessao.tamanho_janela:
+                driver.set_window_size(sessao.tamanho_janela['width'], sessao.tamanho_janela['height'])
+            return True
+        except Exception as e:
+            logging.warning(f"Falha ao limpar sessão de {sessao.navegador}: {e}")
+            return False
+
+    def _encerrar(self, sessao):
+        try:
+            sessao.driver.quit()
+        except Exception as e:
+            logging.warning(f"Erro ao fechar navegador: {e}")
@@ -0,0 +1,103 @@
+"""Medição de tempo por etapa da execução (spans) e exportação de trace.
+
+Os spans são gravados no formato de eventos de trace do Chrome, que pode ser
+aberto em chrome://tracing ou no Perfetto (https://ui.perfetto.dev). Cada
+thread (sessão de navegador) aparece em uma linha própria.
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+
+CATEGORIA_DRIVER = 'driver'
+CATEGORIA_NAVEGACAO = 'navegacao'
+CATEGORIA_ELEMENTO = 'elemento'
+CATEGORIA_ESPERA = 'espera'
+CATEGORIA_ACAO = 'acao'
+CATEGORIA_SCREENSHOT = 'screenshot'
+CATEGORIA_WEBDRIVER = 'webdriver'
+CATEGORIA_SUITE = 'suite'
+
+
+class Rastreador:
+    """Acumula spans de várias threads e os exporta ao final."""
+
+    def __init__(self):
+        self.spans = []
+        self._threads = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, nome, categoria, **args):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(nome, categoria, inicio, time.perf_counter(), args)
+
+    def registrar(self, nome, categoria, inicio, fim, args=None):
+        thread = threading.current_thread()
+        with self._lock:
+            self._threads[thread.ident] = thread.name
+            self.spans.append((nome, categoria, inicio, fim, thread.ident, args or {}))
+
+    def eventos_chrome(self):
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+            threads = dict(self._threads)
+        origem = min((span[2] for span in spans), default=0)
+
+        eventos = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': nome}}
+                   for tid, nome in threads.items()]
+        for nome, categoria, inicio, fim, tid, args in spans:
+            eventos.append({
+                'name': nome,
+                'cat': categoria,
+                'ph': 'X',
+                'ts': round((inicio - origem) * 1e6, 1),
+                'dur': round((fim - inicio) * 1e6, 1),
+                'pid': pid,
+                'tid': tid,
+                'args': args,
+            })
+        return eventos
+
+    def exportar(self, caminho):
+        """Grava o trace em JSON (formato de eventos de trace do Chrome)."""
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            json.dump({'traceEvents': self.eventos_chrome(), 'displayTimeUnit': 'ms'}, arquivo,
+                      ensure_ascii=False)
+
+    def resumo(self):
+        """Agrupa os spans por categoria e nome: [(categoria, nome, qtd, total, média, máx)]."""
+        duracoes = defaultdict(list)
+        with self._lock:
+            for nome, categoria, inicio, fim, _, _ in self.spans:
+                duracoes[(categoria, nome)].append(fim - inicio)
+
+        linhas = [(categoria, nome, len(valores), sum(valores), sum(valores) / len(valores), max(valores))
+                  for (categoria, nome), valores in duracoes.items()]
+        return sorted(linhas, key=lambda linha: linha[3], reverse=True)
+
+    def tabela_resumo(self):
+        linhas = [f"{'Categoria':<12} {'Span':<32} {'Qtd':>6} {'Total (ms)':>12} {'Média (ms)':>11} {'Máx (ms)':>10}"]
+        for categoria, nome, quantidade, total, media, maximo in self.resumo():
+            linhas.append(f"{categoria:<12} {nome[:32]:<32} {quantidade:>6} {total * 1000:>12.1f} "
+                          f"{media * 1000:>11.1f} {maximo * 1000:>10.1f}")
+        return "\n".join(linhas)
+
+
+class RastreadorNulo:
+    """Usado quando o rastreamento está desligado; não guarda nada."""
+
+    def span(self, nome, categoria, **args):
+        return contextlib.nullcontext()
+
+    def registrar(self, nome, categoria, inicio, fim, args=None):
+        pass
+
+
+RASTREADOR_NULO = RastreadorNulo()
@@ -0,0 +1,105 @@
+"""Configuração do logging: escrita em segundo plano, rotação e log estruturado.
+
+Os registros são apenas enfileirados na thread que os gera (QueueHandler);
+uma thread própria (QueueListener) os formata e grava no log legível
+(`e2e_tester.log`), no log estruturado em JSONL (`e2e_tester.jsonl`, um
+objeto por linha) e, opcionalmente, na saída padrão. Os dois arquivos são
+rotacionados por tamanho.
+"""
+import atexit
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+
+ARQUIVO_LOG = 'e2e_tester.log'
+ARQUIVO_JSONL = 'e2e_tester.jsonl'
+MAX_BYTES_LOG = 10 * 1024 * 1024
+BACKUPS_LOG = 5
+FORMATO_LOG = '%(asctime)s - %(levelname)s: %(message)s'
+
+LOGGER_EVENTOS = 'e2e.eventos'
+
+_eventos = logging.getLogger(LOGGER_EVENTOS)
+_listener = None
+
+
+class FormatadorJSON(logging.Formatter):
+    """Formata o registro como um objeto JSON em uma linha.
+
+    Registros criados por registrar_evento levam também o nome do evento e
+    seus campos.
+    """
+
+    def format(self, record):
+        registro = {
+            'ts': datetime.datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'nivel': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'mensagem': record.getMessage(),
+        }
+        evento = getattr(record, 'evento', None)
+        if evento:
+            registro['evento'] = evento
+            registro.update(getattr(record, 'dados', {}))
+        return json.dumps(registro, ensure_ascii=False, default=str)
+
+
+def registrar_evento(evento, mensagem, nivel=logging.INFO, **dados):
+    """Registra um evento da execução (passo, suíte...) com campos estruturados."""
+    if _eventos.isEnabledFor(nivel):
+        _eventos.log(nivel, mensagem, extra={'evento': evento, 'dados': dados})
+
+
+def configurar_logging(arquivo=ARQUIVO_LOG, arquivo_jsonl=ARQUIVO_JSONL, console=False,
+                       max_bytes=MAX_BYTES_LOG, backups=BACKUPS_LOG, nivel=logging.INFO):
+    """Direciona o logging para a fila gravada em segundo plano.
+
+    `arquivo_jsonl=None` desativa o log estruturado. Pode ser chamada de novo
+    para trocar a configuração; a gravação pendente é concluída antes.
+    """
+    global _listener
+    encerrar_logging()
+
+    legivel = logging.handlers.RotatingFileHandler(arquivo, maxBytes=max_bytes, backupCount=backups,
+                                                   encoding='utf-8', delay=True)
+    legivel.setFormatter(logging.Formatter(FORMATO_LOG))
+    handlers = [legivel]
+    if arquivo_jsonl:
+        estruturado = logging.handlers.RotatingFileHandler(arquivo_jsonl, maxBytes=max_bytes,
+                                                           backupCount=backups, encoding='utf-8', delay=True)
+        estruturado.setFormatter(FormatadorJSON())
+        handlers.append(estruturado)
+    if console:
+        saida = logging.StreamHandler(sys.stdout)
+        saida.setFormatter(logging.Formatter(FORMATO_LOG))
+        handlers.append(saida)
+
+    fila = queue.SimpleQueue()
+    raiz = logging.getLogger()
+    for handler in list(raiz.handlers):
+        raiz.removeHandler(handler)
+        handler.close()
+    raiz.addHandler(logging.handlers.QueueHandler(fila))
+    raiz.setLevel(nivel)
+
+    _listener = logging.handlers.QueueListener(fila, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def encerrar_logging():
+    """Grava os registros ainda na fila e fecha os arquivos."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(encerrar_logging)
@@ -0,0 +1,115 @@
+"""Resolução de elementos em lote, com menos idas e voltas ao WebDriver.
+
+No modo padrão cada passo custa pelo menos três comandos antes da ação
+(presença, scrollIntoView e visibilidade). Aqui um único script injetado
+localiza o elemento e verifica a visibilidade; na mesma chamada também são
+localizados os passos seguintes, até o próximo clique (que pode alterar o
+DOM), e os que já estiverem visíveis ficam guardados para uso imediato.
+"""
+import time
+
+from selenium.common.exceptions import TimeoutException
+
+TAMANHO_MAXIMO_LOTE = 10
+
+# Funções JS compartilhadas pelos scripts de localização (ver também espera.py).
+FUNCOES_LOCALIZACAO = """
+function buscar(por, seletor) {
+    switch (por) {
+        case 'id': return document.getElementById(seletor);
+        case 'name': return document.getElementsByName(seletor)[0] || null;
+        case 'xpath': return document.evaluate(seletor, document, null,
+            XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        case 'css selector': return document.querySelector(seletor);
+        case 'class name': return document.getElementsByClassName(seletor)[0] || null;
+        case 'link text':
+            return Array.prototype.find.call(document.links, function (a) {
+                return a.textContent.replace(/\\s+/g, ' ').trim() === seletor;
+            }) || null;
+    }
+    return null;
+}
+function visivel(el) {
+    var estilo = window.getComputedStyle(el);
+    if (estilo.display === 'none' || estilo.visibility === 'hidden' || estilo.opacity === '0') {
+        return false;
+    }
+    var retangulo = el.getBoundingClientRect();
+    return retangulo.width > 0 && retangulo.height > 0;
+}
+function localizar(localizador) {
+    var el = null;
+    try { el = buscar(localizador[0], localizador[1]); } catch (e) {}
+    return el && visivel(el) ? el : null;
+}
+"""
+
+SCRIPT_RESOLVER = FUNCOES_LOCALIZACAO + """
+return arguments[0].map(localizar);
+"""
+
+# Comandos mínimos do modo padrão: presença + scroll + visibilidade + ação.
+COMANDOS_LOCALIZACAO_PADRAO = 3
+COMANDOS_ACAO = {'Inserir Texto': 2, 'Clicar': 1, 'Verificar Texto': 1, 'Verificar Existência': 0}
+
+
+def comandos_modo_padrao(passo):
+    return COMANDOS_LOCALIZACAO_PADRAO + COMANDOS_ACAO.get(passo.acao, 0)
+
+
+class ResolvedorLote:
+    """Localiza os elementos dos passos de um plano com scripts em lote.
+
+    `verificar_cancelamento` é chamado a cada tentativa e deve lançar uma
+    exceção para interromper a espera. Com uma `espera` (EsperaEventos), se o
+    elemento não estiver na página a espera é feita por eventos do DOM em vez
+    de novas consultas a cada `intervalo`.
+    """
+
+    def __init__(self, driver, passos, verificar_cancelamento=None, timeout=20, intervalo=0.5,
+                 espera=None):
+        self.driver = driver
+        self.passos = passos
+        self.verificar_cancelamento = verificar_cancelamento or (lambda: None)
+        self.timeout = timeout
+        self.intervalo = intervalo
+        self.espera = espera
+        self._encontrados = {}
+
+    def localizar(self, passo, timeout=None, usar_lote=True):
+        """Devolve o WebElement visível do passo; lança TimeoutException."""
+        elemento = self._encontrados.pop(passo.indice, None) if usar_lote else None
+        if elemento is not None:
+            return elemento
+
+        timeout = self.timeout if timeout is None else timeout
+        lote = self._lote(passo) if usar_lote else [passo]
+        localizadores = [[item.por, item.seletor] for item in lote]
+        limite = time.monotonic() + timeout
+        while True:
+            self.verificar_cancelamento()
+            elementos = self.driver.execute_script(SCRIPT_RESOLVER, localizadores)
+            if elementos and elementos[0] is not None:
+                for item, elemento in zip(lote[1:], elementos[1:]):
+                    if elemento is not None:
+                        self._encontrados[item.indice] = elemento
+                return elementos[0]
+            if self.espera:
+                return self.espera.aguardar(passo, max(0, limite - time.monotonic()))
+            if time.monotonic() >= limite:
+                raise TimeoutException(f"Elemento não encontrado ou invisível: {passo.seletor}")
+            time.sleep(self.intervalo)
+
+    def descartar(self):
+        """Esquece os elementos já localizados (ex.: após mudança no DOM)."""
+        self._encontrados.clear()
+
+    def _lote(self, passo):
+        lote = [passo]
+        if passo.acao == 'Clicar':
+            return lote
+        for seguinte in self.passos[passo.indice + 1:passo.indice + TAMANHO_MAXIMO_LOTE]:
+            lote.append(seguinte)
+            if seguinte.acao == 'Clicar':
+                break
+        return lote
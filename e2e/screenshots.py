@@ -0,0 +1,196 @@
+"""Gravação de screenshots de erro em segundo plano.
+
+A captura continua no passo que falhou (o navegador precisa estar no estado
+do erro), mas compressão, gravação em disco e limpeza dos arquivos antigos
+ficam em uma thread própria, sem atrasar os passos seguintes.
+"""
+import datetime
+import hashlib
+import logging
+import os
+import queue
+import re
+import struct
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass
+from typing import Optional
+
+ASSINATURA_PNG = b'\x89PNG\r\n\x1a\n'
+
+
+@dataclass
+class ConfiguracaoScreenshots:
+    """Opções das screenshots de erro.
+
+    `recorte_elemento` captura só o elemento do passo quando ele foi
+    localizado; `compressao` (0-9) recomprime o PNG sem perdas; os limites
+    `max_arquivos`, `max_megabytes` e `max_dias` removem as screenshots mais
+    antigas da pasta (None desativa o limite).
+    """
+    recorte_elemento: bool = False
+    compressao: Optional[int] = None
+    max_arquivos: Optional[int] = None
+    max_megabytes: Optional[float] = 500
+    max_dias: Optional[float] = None
+
+
+def recomprimir_png(dados, nivel=9):
+    """Recomprime os dados de imagem (IDAT) do PNG; devolve o menor dos dois."""
+    if not dados.startswith(ASSINATURA_PNG):
+        return dados
+    blocos = []
+    posicao = len(ASSINATURA_PNG)
+    while posicao + 8 <= len(dados):
+        tamanho, tipo = struct.unpack('>I4s', dados[posicao:posicao + 8])
+        blocos.append((tipo, dados[posicao + 8:posicao + 8 + tamanho]))
+        posicao += 12 + tamanho
+
+    idat = b''.join(conteudo for tipo, conteudo in blocos if tipo == b'IDAT')
+    if not idat:
+        return dados
+    try:
+        recomprimido = zlib.compress(zlib.decompress(idat), nivel)
+    except zlib.error:
+        return dados
+    if len(recomprimido) >= len(idat):
+        return dados
+
+    saida = [ASSINATURA_PNG]
+    idat_gravado = False
+    for tipo, conteudo in blocos:
+        if tipo == b'IDAT':
+            if idat_gravado:
+                continue
+            conteudo, idat_gravado = recomprimido, True
+        saida.append(struct.pack('>I4s', len(conteudo), tipo) + conteudo
+                     + struct.pack('>I', zlib.crc32(tipo + conteudo) & 0xffffffff))
+    return b''.join(saida)
+
+
+def podar_screenshots(diretorio, max_arquivos=None, max_bytes=None, max_idade=None):
+    """Remove as screenshots (*.png) mais antigas de `diretorio` e subpastas.
+
+    `max_idade` em segundos. Devolve a quantidade de arquivos removidos.
+    """
+    arquivos = []
+    for raiz, _, nomes in os.walk(diretorio):
+        for nome in nomes:
+            if nome.lower().endswith('.png'):
+                caminho = os.path.join(raiz, nome)
+                try:
+                    info = os.stat(caminho)
+                except OSError:
+                    continue
+                arquivos.append((info.st_mtime, info.st_size, caminho))
+    arquivos.sort(reverse=True)
+
+    agora = time.time()
+    total = 0
+    removidos = 0
+    for quantidade, (modificado, tamanho, caminho) in enumerate(arquivos, 1):
+        total += tamanho
+        if ((max_arquivos is not None and quantidade > max_arquivos)
+                or (max_bytes is not None and total > max_bytes)
+                or (max_idade is not None and agora - modificado > max_idade)):
+            try:
+                os.remove(caminho)
+                removidos += 1
+            except OSError as e:
+                logging.warning(f"Não foi possível remover screenshot antiga {caminho}: {e}")
+    return removidos
+
+
+def _nome_seguro(texto):
+    return re.sub(r'[^\w-]+', '_', texto).strip('_')[:40] or 'passo'
+
+
+class GravadorScreenshots:
+    """Fila de screenshots gravada por uma thread em segundo plano.
+
+    Cada execução tem um identificador próprio e cada arquivo leva o número do
+    passo, então falhas no mesmo segundo não se sobrescrevem. Imagens idênticas
+    às já gravadas na execução não são gravadas de novo.
+    """
+
+    def __init__(self, diretorio, configuracao=None, log=None):
+        self.diretorio = diretorio
+        self.configuracao = configuracao or ConfiguracaoScreenshots()
+        self.log = log or logging.info
+        self.id_execucao = f"{datetime.datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+        self._fila = queue.Queue()
+        self._nomes = set()
+        self._gravadas = {}
+        self._thread = None
+
+    def nome_arquivo(self, passo=None, elemento=''):
+        """Caminho único para a screenshot de um passo (ou da suíte, sem passo)."""
+        base = f"erro_{self.id_execucao}_" + (
+            f"p{passo + 1:03d}_{_nome_seguro(elemento)}" if passo is not None else 'suite')
+        nome, sequencia = base, 1
+        while nome in self._nomes:
+            sequencia += 1
+            nome = f"{base}_{sequencia}"
+        self._nomes.add(nome)
+        return os.path.join(self.diretorio, f"{nome}.png")
+
+    def enviar(self, png, caminho):
+        """Agenda a gravação dos bytes PNG em `caminho`.
+
+        Devolve o caminho onde a imagem ficará: o de uma screenshot idêntica
+        já gravada nesta execução, se houver.
+        """
+        resumo = hashlib.sha1(png).hexdigest()
+        if resumo in self._gravadas:
+            return self._gravadas[resumo]
+        self._gravadas[resumo] = caminho
+
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._processar, name='gravador-screenshots', daemon=True)
+            self._thread.start()
+        self._fila.put((png, caminho))
+        return caminho
+
+    def fechar(self):
+        """Aguarda as gravações pendentes e aplica os limites de retenção."""
+        if self._thread is not None:
+            self._fila.put(None)
+            self._thread.join()
+            self._thread = None
+            self._podar()
+
+    def _processar(self):
+        while True:
+            item = self._fila.get()
+            if item is None:
+                return
+            png, caminho = item
+            try:
+                self._gravar(png, caminho)
+            except Exception as e:
+                logging.error(f"Erro ao gravar screenshot {caminho}: {e}")
+                self.log(f"❌ Falha ao gravar screenshot: {e}")
+
+    def _gravar(self, png, caminho):
+        if self.configuracao.compressao is not None:
+            png = recomprimir_png(png, self.configuracao.compressao)
+
+        os.makedirs(self.diretorio, exist_ok=True)
+        temporario = f"{caminho}.tmp"
+        with open(temporario, 'wb') as arquivo:
+            arquivo.write(png)
+        os.replace(temporario, caminho)
+        logging.info(f"Screenshot de erro salvo: {caminho}")
+
+    def _podar(self):
+        configuracao = self.configuracao
+        if not os.path.isdir(self.diretorio):
+            return
+        removidos = podar_screenshots(
+            self.diretorio, configuracao.max_arquivos,
+            configuracao.max_megabytes * 1024 * 1024 if configuracao.max_megabytes is not None else None,
+            configuracao.max_dias * 86400 if configuracao.max_dias is not None else None)
+        if removidos:
+            self.log(f"🧹 {removidos} screenshot(s) antiga(s) removida(s)")
@@ -0,0 +1,51 @@
+"""Arquivo de suíte: leitura e gravação do formato salvo pela aplicação.
+
+Não depende do Selenium: a interface carrega e edita suítes sem importar o
+motor de execução, que só é carregado na primeira execução.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+
+NAVEGADORES = ['Chrome', 'Firefox', 'Edge']
+NAVEGADOR_PADRAO = 'Chrome'
+
+CAMPOS_SUITE = ('url', 'navegador', 'elementos')
+CAMPOS_ELEMENTO = ('elemento', 'tipo_seletor', 'seletor', 'acao', 'valor')
+
+
+@dataclass
+class Suite:
+    """Suíte de testes; `opcoes` guarda as demais chaves do arquivo (ex.: timeout)."""
+    nome: str
+    elementos: list
+    url: str = ''
+    navegador: str = ''
+    opcoes: dict = field(default_factory=dict)
+
+    def para_dict(self):
+        dados = {'url': self.url, 'navegador': self.navegador}
+        dados.update(self.opcoes)
+        dados['elementos'] = self.elementos
+        return dados
+
+
+def carregar_suite(caminho):
+    """Lê uma suíte salva pela aplicação.
+
+    Aceita o formato atual (objeto com url, navegador e elementos) e o formato
+    antigo (apenas a lista de elementos).
+    """
+    with open(caminho, 'r', encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    if isinstance(dados, list):
+        return Suite(nome, dados)
+    opcoes = {chave: valor for chave, valor in dados.items() if chave not in CAMPOS_SUITE}
+    return Suite(nome, dados.get('elementos', []), dados.get('url', ''), dados.get('navegador', ''), opcoes)
+
+
+def salvar_suite(suite, caminho):
+    with open(caminho, 'w', encoding='utf-8') as arquivo:
+        json.dump(suite.para_dict(), arquivo, indent=4, ensure_ascii=False)
@@ -1,28 +1,38 @@
+import time
+
+_INICIO = time.perf_counter()
+
 import sys
-import random
-import json
 import os
+import json
+import sqlite3
 import logging
+import argparse
+import threading
+from collections import deque
+
+from e2e.inicializacao import MedidorInicializacao
+
+# Selenium, webdriver_manager e Faker ficam fora destas importações: são
+# carregados na primeira execução (e no primeiro valor 'random:').
+inicializacao = MedidorInicializacao(_INICIO)
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
-                             QLabel, QLineEdit, QPushButton, QTextEdit, QComboBox, 
-                             QTableWidget, QTableWidgetItem, QFileDialog, QMessageBox, 
-                             QWidget, QFrame, QHeaderView, QSizePolicy, QSpacerItem)
-from PyQt5.QtCore import Qt, QSize
+                             QLabel, QLineEdit, QPushButton, QPlainTextEdit, QComboBox, 
+                             QTableView, QStyledItemDelegate, QAbstractItemView, QFileDialog, QMessageBox, 
+                             QWidget, QFrame, QHeaderView, QSizePolicy, QSpacerItem,
+                             QCheckBox)
+from PyQt5.QtCore import Qt, QSize, QThread, QTimer, pyqtSignal, QAbstractTableModel, QModelIndex
 from PyQt5.QtGui import QFont, QColor, QPalette, QIcon
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from selenium.webdriver.edge.service import Service as EdgeService
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.firefox import GeckoDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import WebDriverException, ElementNotInteractableException
-from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.common.keys import Keys
-from faker import Faker
+inicializacao.marcar('PyQt5')
+
+from e2e.estado import ArmazemEstados
+from e2e.historico import HistoricoExecucoes
+from e2e.perfis import PERFIL_PADRAO, PERFIS
+from e2e.plano import ACOES, TIPOS_SELETOR, ErroValidacao, compilar_suite
+from e2e.pool import PoolSessoes
+from e2e.registro import ARQUIVO_LOG, configurar_logging
+from e2e.suite import NAVEGADORES, Suite, carregar_suite, salvar_suite
+inicializacao.marcar('e2e')
 
 COLORS = {
     'primary': '#3B82F6',
@@ -38,14 +48,12 @@ COLORS = {
     'background': '#F9FAFB'
 }
 
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(levelname)s: %(message)s',
-    handlers=[
-        logging.FileHandler('e2e_tester.log'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Item do seletor de perfil para um perfil definido por extenso no arquivo da suíte.
+PERFIL_DA_SUITE = 'definido na suíte'
+
+# O log da tela guarda só as últimas linhas; o histórico completo fica nos arquivos de log.
+LIMITE_LINHAS_LOG = 5000
+INTERVALO_LOG_MS = 100
 
 class StyledComboBox(QComboBox):
     def __init__(self, parent=None):
@@ -130,11 +138,11 @@ class StyledLineEdit(QLineEdit):
             }}
         """)
 
-class StyledTableWidget(QTableWidget):
+class StyledTableView(QTableView):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 border: 1px solid {COLORS['border']};
                 border-radius: 5px;
                 background-color: {COLORS['white']};
@@ -142,7 +150,7 @@ class StyledTableWidget(QTableWidget):
                 selection-background-color: {COLORS['primary']};
                 selection-color: {COLORS['white']};
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 5px;
                 border-bottom: 1px solid {COLORS['border']};
             }}
@@ -166,11 +174,11 @@ class StyledTableWidget(QTableWidget):
             }}
         """)
 
-class StyledTextEdit(QTextEdit):
+class StyledPlainTextEdit(QPlainTextEdit):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet(f"""
-            QTextEdit {{
+            QPlainTextEdit {{
                 border: 1px solid {COLORS['border']};
                 border-radius: 5px;
                 padding: 5px;
@@ -220,12 +228,178 @@ class CardFrame(QFrame):
     def addLayout(self, layout):
         self.layout.addLayout(layout)
 
+class ModeloElementos(QAbstractTableModel):
+    """Passos da suíte como modelo da tabela.
+
+    Os elementos ficam em uma lista de dicionários (com as chaves extras, como
+    timeout, preservadas) e as linhas são entregues à view aos poucos, conforme
+    a rolagem, em blocos de TAMANHO_BLOCO.
+    """
+    COLUNAS = [('elemento', 'Elemento'), ('tipo_seletor', 'Tipo de Seletor'), ('seletor', 'Seletor'),
+               ('acao', 'Ação'), ('valor', 'Valor')]
+    TAMANHO_BLOCO = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._elementos = []
+        self._carregadas = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._carregadas
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUNAS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._carregadas < len(self._elementos)
+
+    def fetchMore(self, parent=QModelIndex()):
+        quantidade = min(self.TAMANHO_BLOCO, len(self._elementos) - self._carregadas)
+        if quantidade <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._carregadas, self._carregadas + quantidade - 1)
+        self._carregadas += quantidade
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        return self._elementos[index.row()].get(self.COLUNAS[index.column()][0], '')
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        self._elementos[index.row()][self.COLUNAS[index.column()][0]] = value
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.COLUNAS[section][1]
+        return section + 1
+
+    def carregar(self, elementos):
+        self.beginResetModel()
+        self._elementos = [dict(elemento) for elemento in elementos]
+        self._carregadas = min(self.TAMANHO_BLOCO, len(self._elementos))
+        self.endResetModel()
+
+    def elementos(self):
+        return [dict(elemento) for elemento in self._elementos]
+
+    def adicionar(self):
+        # A nova linha vai para o fim: as linhas ainda não entregues à view vêm antes.
+        while self.canFetchMore():
+            self.fetchMore()
+        linha = len(self._elementos)
+        self.beginInsertRows(QModelIndex(), linha, linha)
+        self._elementos.append({'elemento': '', 'tipo_seletor': TIPOS_SELETOR[0], 'seletor': '',
+                                'acao': ACOES[0], 'valor': ''})
+        self._carregadas += 1
+        self.endInsertRows()
+        return linha
+
+    def remover(self, linha):
+        self.beginRemoveRows(QModelIndex(), linha, linha)
+        del self._elementos[linha]
+        self._carregadas -= 1
+        self.endRemoveRows()
+
+
+class DelegateOpcoes(QStyledItemDelegate):
+    """Editor com lista de opções criado só enquanto a célula é editada."""
+
+    def __init__(self, opcoes, parent=None):
+        super().__init__(parent)
+        self.opcoes = opcoes
+
+    def createEditor(self, parent, option, index):
+        editor = StyledComboBox(parent)
+        editor.addItems(self.opcoes)
+        editor.activated.connect(lambda: self.commitData.emit(editor))
+        return editor
+
+    def setEditorData(self, editor, index):
+        editor.setCurrentIndex(editor.findText(index.data(Qt.EditRole) or ''))
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.EditRole)
+
+
+class ExecucaoWorker(QThread):
+    """Executa a suíte fora da thread da interface.
+
+    As mensagens de log são acumuladas e a interface as drena em lotes, a
+    cada INTERVALO_LOG_MS. O buffer guarda no máximo LIMITE_LINHAS_LOG
+    mensagens (as que a tela comporta); as mais antigas são descartadas e
+    contadas. Com um `historico`, o resultado é gravado nele ao final.
+    """
+    erro_driver = pyqtSignal(str)
+
+    def __init__(self, executor, plano, parent=None, historico=None):
+        super().__init__(parent)
+        self.executor = executor
+        self.plano = plano
+        self.historico = historico
+        self.resultado = None
+        self._buffer = deque(maxlen=LIMITE_LINHAS_LOG)
+        self._descartadas = 0
+        self._lock = threading.Lock()
+        executor.log = self._log
+
+    def _log(self, mensagem):
+        with self._lock:
+            if len(self._buffer) == self._buffer.maxlen:
+                self._descartadas += 1
+            self._buffer.append(mensagem)
+
+    def coletar_mensagens(self):
+        with self._lock:
+            mensagens = list(self._buffer)
+            self._buffer.clear()
+            descartadas, self._descartadas = self._descartadas, 0
+        if descartadas:
+            mensagens.insert(0, f"… {descartadas} mensagem(ns) omitida(s) (veja {ARQUIVO_LOG})")
+        return mensagens
+
+    def cancelar(self):
+        self.executor.cancelar()
+
+    def run(self):
+        from e2e.execucao import ErroDriver
+        try:
+            self.resultado = self.executor.executar_plano(self.plano)
+            if self.historico:
+                self.historico.registrar(self.plano, self.resultado, self.executor.navegador)
+        except ErroDriver as e:
+            if self.historico:
+                from e2e.execucao import ResultadoSuite
+                self.historico.registrar(self.plano, ResultadoSuite(self.plano.nome, erro=str(e)),
+                                         self.executor.navegador)
+            self.erro_driver.emit(str(e))
+        except Exception as erro:
+            erro_msg = f"❌ Erro crítico durante execução dos testes: {erro}"
+            logging.error(erro_msg)
+            self._log(erro_msg)
+
 class TesteAutomatizadoE2E(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.faker = Faker()
-        self.driver = None
+        self.worker = None
+        self.opcoes_suite = {}
+        self.pool = PoolSessoes(max_ociosas=1)
+        self.estados = ArmazemEstados()
         self.screenshot_dir = 'error_screenshots'
+        try:
+            self.historico = HistoricoExecucoes()
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"Histórico de execuções indisponível: {e}")
+            self.historico = None
         
         if not os.path.exists(self.screenshot_dir):
             os.makedirs(self.screenshot_dir)
@@ -259,10 +433,18 @@ class TesteAutomatizadoE2E(QMainWindow):
 
         elementos_card = CardFrame("Elementos para Teste")
         
-        self.tabela_elementos = StyledTableWidget()
-        self.tabela_elementos.setColumnCount(5)
-        self.tabela_elementos.setHorizontalHeaderLabels(['Elemento', 'Tipo de Seletor', 'Seletor', 'Ação', 'Valor'])
+        self.modelo_elementos = ModeloElementos(self)
+        self.tabela_elementos = StyledTableView()
+        self.tabela_elementos.setModel(self.modelo_elementos)
+        self.tabela_elementos.setItemDelegateForColumn(1, DelegateOpcoes(TIPOS_SELETOR, self.tabela_elementos))
+        self.tabela_elementos.setItemDelegateForColumn(3, DelegateOpcoes(ACOES, self.tabela_elementos))
+        self.tabela_elementos.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked
+                                              | QAbstractItemView.EditKeyPressed | QAbstractItemView.AnyKeyPressed)
+        self.tabela_elementos.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.tabela_elementos.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Altura fixa: a view não precisa medir cada linha ao rolar.
+        self.tabela_elementos.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.tabela_elementos.verticalHeader().setDefaultSectionSize(36)
         self.tabela_elementos.setAlternatingRowColors(True)
         
         elementos_card.addWidget(self.tabela_elementos)
@@ -294,292 +476,230 @@ class TesteAutomatizadoE2E(QMainWindow):
         execucao_layout = QHBoxLayout()
         
         self.tipo_navegador = StyledComboBox()
-        self.tipo_navegador.addItems(['Chrome', 'Firefox', 'Edge'])
+        self.tipo_navegador.addItems(NAVEGADORES)
         
         navegador_label = QLabel('Navegador:')
         navegador_label.setStyleSheet(f"color: {COLORS['dark']};")
+
+        self.perfil_navegador = StyledComboBox()
+        self.perfil_navegador.addItems(list(PERFIS))
+        self.perfil_navegador.setToolTip('Perfil de desempenho: headless, carregamento da página e bloqueio de '
+                                         'imagens, fontes, mídia e hosts de terceiros')
+
+        perfil_label = QLabel('Perfil:')
+        perfil_label.setStyleSheet(f"color: {COLORS['dark']};")
+
+        self.reutilizar_navegador = QCheckBox('Manter navegador aberto entre execuções')
+        self.reutilizar_navegador.setStyleSheet(f"color: {COLORS['dark']};")
+        self.reutilizar_navegador.toggled.connect(self._alternar_reutilizacao)
+
+        self.falha_rapida = QCheckBox('Parar na primeira falha')
+        self.falha_rapida.setStyleSheet(f"color: {COLORS['dark']};")
+        self.falha_rapida.setToolTip('Os passos seguintes a uma falha são pulados, sem esperar pelo timeout de cada um')
+
+        self.metricas_pagina = QCheckBox('Métricas da página')
+        self.metricas_pagina.setStyleSheet(f"color: {COLORS['dark']};")
+        self.metricas_pagina.setToolTip('Registra carregamento, FCP, LCP, CLS, tarefas longas e recursos após a '
+                                        'navegação e cada clique')
         
-        executar_btn = StyledButton('Executar Testes', 'success')
-        executar_btn.clicked.connect(self.executar_testes)
-        executar_btn.setMinimumWidth(150)
+        self.executar_btn = StyledButton('Executar Testes', 'success')
+        self.executar_btn.clicked.connect(self.executar_testes)
+        self.executar_btn.setMinimumWidth(150)
+
+        self.parar_btn = StyledButton('Parar', 'danger')
+        self.parar_btn.clicked.connect(self.parar_testes)
+        self.parar_btn.setEnabled(False)
         
         execucao_layout.addWidget(navegador_label)
         execucao_layout.addWidget(self.tipo_navegador)
+        execucao_layout.addWidget(perfil_label)
+        execucao_layout.addWidget(self.perfil_navegador)
+        execucao_layout.addWidget(self.reutilizar_navegador)
+        execucao_layout.addWidget(self.falha_rapida)
+        execucao_layout.addWidget(self.metricas_pagina)
         execucao_layout.addStretch()
-        execucao_layout.addWidget(executar_btn)
+        execucao_layout.addWidget(self.parar_btn)
+        execucao_layout.addWidget(self.executar_btn)
         
         execucao_card.addLayout(execucao_layout)
         main_layout.addWidget(execucao_card)
         
         log_card = CardFrame("Log de Execução")
         
-        self.log_area = StyledTextEdit()
+        self.log_area = StyledPlainTextEdit()
         self.log_area.setReadOnly(True)
+        self.log_area.setMaximumBlockCount(LIMITE_LINHAS_LOG)
         self.log_area.setMinimumHeight(150)
+
+        self.timer_log = QTimer(self)
+        self.timer_log.setInterval(INTERVALO_LOG_MS)
+        self.timer_log.timeout.connect(self._descarregar_log)
         
         log_card.addWidget(self.log_area)
         main_layout.addWidget(log_card)
 
     def adicionar_elemento(self):
-        linhas = self.tabela_elementos.rowCount()
-        self.tabela_elementos.insertRow(linhas)
-        
-        self.tabela_elementos.setItem(linhas, 0, QTableWidgetItem(""))
-        
-        seletor_combo = StyledComboBox()
-        seletor_combo.addItems(['ID', 'Name', 'XPath', 'CSS Selector', 'Class Name', 'Link Text'])
-        self.tabela_elementos.setCellWidget(linhas, 1, seletor_combo)
-        
-        self.tabela_elementos.setItem(linhas, 2, QTableWidgetItem(""))
-        
-        acoes_combo = StyledComboBox()
-        acoes_combo.addItems(['Inserir Texto', 'Clicar', 'Verificar Texto', 'Verificar Existência'])
-        self.tabela_elementos.setCellWidget(linhas, 3, acoes_combo)
-        
-        self.tabela_elementos.setItem(linhas, 4, QTableWidgetItem(""))
+        linha = self.modelo_elementos.adicionar()
+        self.tabela_elementos.scrollTo(self.modelo_elementos.index(linha, 0))
 
     def remover_elemento(self):
-        linha_atual = self.tabela_elementos.currentRow()
+        linha_atual = self.tabela_elementos.currentIndex().row()
         if linha_atual >= 0:
-            self.tabela_elementos.removeRow(linha_atual)
+            self.modelo_elementos.remover(linha_atual)
+
+    def _suite_atual(self):
+        opcoes = dict(self.opcoes_suite)
+        opcoes.pop('falha_rapida', None)
+        if self.falha_rapida.isChecked():
+            opcoes['falha_rapida'] = True
+        perfil = self.perfil_navegador.currentText()
+        if perfil != PERFIL_DA_SUITE:
+            opcoes.pop('perfil', None)
+            if perfil != PERFIL_PADRAO:
+                opcoes['perfil'] = perfil
+        return Suite('', self.modelo_elementos.elementos(), self.url_input.text(),
+                     self.tipo_navegador.currentText(), opcoes)
+
+    def _mostrar_perfil(self, perfil):
+        indice_suite = self.perfil_navegador.findText(PERFIL_DA_SUITE)
+        if indice_suite >= 0:
+            self.perfil_navegador.removeItem(indice_suite)
+        if isinstance(perfil, dict):
+            self.perfil_navegador.addItem(PERFIL_DA_SUITE)
+            self.perfil_navegador.setCurrentText(PERFIL_DA_SUITE)
+        else:
+            self.perfil_navegador.setCurrentText(perfil if perfil in PERFIS else PERFIL_PADRAO)
 
     def salvar_configuracao(self):
-        configuracao = []
-        for linha in range(self.tabela_elementos.rowCount()):
-            elemento = {
-                'elemento': self.tabela_elementos.item(linha, 0).text() if self.tabela_elementos.item(linha, 0) else '',
-                'tipo_seletor': self.tabela_elementos.cellWidget(linha, 1).currentText(),
-                'seletor': self.tabela_elementos.item(linha, 2).text() if self.tabela_elementos.item(linha, 2) else '',
-                'acao': self.tabela_elementos.cellWidget(linha, 3).currentText(),
-                'valor': self.tabela_elementos.item(linha, 4).text() if self.tabela_elementos.item(linha, 4) else ''
-            }
-            configuracao.append(elemento)
+        suite = self._suite_atual()
 
         nome_arquivo, _ = QFileDialog.getSaveFileName(self, 'Salvar Configuração', '', 'JSON (*.json)')
         if nome_arquivo:
-            with open(nome_arquivo, 'w') as arquivo:
-                json.dump(configuracao, arquivo, indent=4)
+            salvar_suite(suite, nome_arquivo)
             
-            self.log_area.append(f"✅ Configuração salva em: {nome_arquivo}")
+            self.log_area.appendPlainText(f"✅ Configuração salva em: {nome_arquivo}")
 
     def carregar_configuracao(self):
         nome_arquivo, _ = QFileDialog.getOpenFileName(self, 'Carregar Configuração', '', 'JSON (*.json)')
         if nome_arquivo:
-            with open(nome_arquivo, 'r') as arquivo:
-                configuracao = json.load(arquivo)
-            
-            self.tabela_elementos.setRowCount(0)
-            for elemento in configuracao:
-                linha = self.tabela_elementos.rowCount()
-                self.tabela_elementos.insertRow(linha)
-                
-                item_elemento = QTableWidgetItem(elemento['elemento'])
-                self.tabela_elementos.setItem(linha, 0, item_elemento)
-
-                seletor_combo = StyledComboBox()
-                seletor_combo.addItems(['ID', 'Name', 'XPath', 'CSS Selector', 'Class Name', 'Link Text'])
-                indice = seletor_combo.findText(elemento['tipo_seletor'])
-                seletor_combo.setCurrentIndex(indice)
-                self.tabela_elementos.setCellWidget(linha, 1, seletor_combo)
-
-                item_seletor = QTableWidgetItem(elemento['seletor'])
-                self.tabela_elementos.setItem(linha, 2, item_seletor)
-
-                acoes_combo = StyledComboBox()
-                acoes_combo.addItems(['Inserir Texto', 'Clicar', 'Verificar Texto', 'Verificar Existência'])
-                indice = acoes_combo.findText(elemento['acao'])
-                acoes_combo.setCurrentIndex(indice)
-                self.tabela_elementos.setCellWidget(linha, 3, acoes_combo)
-
-                item_valor = QTableWidgetItem(elemento['valor'])
-                self.tabela_elementos.setItem(linha, 4, item_valor)
+            suite = carregar_suite(nome_arquivo)
+            if suite.url:
+                self.url_input.setText(suite.url)
+            if suite.navegador:
+                self.tipo_navegador.setCurrentText(suite.navegador)
+            self.opcoes_suite = suite.opcoes
+            self.estados.registrar_suite(suite, nome_arquivo)
+            self.falha_rapida.setChecked(suite.opcoes.get('falha_rapida') is True)
+            self._mostrar_perfil(suite.opcoes.get('perfil'))
+            self.modelo_elementos.carregar(suite.elementos)
             
-            self.log_area.append(f"📂 Configuração carregada de: {nome_arquivo}")
-
-    def _gerar_valor_aleatorio(self, tipo):
-        """Gera valores aleatórios baseados no tipo de campo"""
-        if 'nome' in tipo.lower():
-            return self.faker.name()
-        elif 'email' in tipo.lower():
-            return self.faker.email()
-        elif 'telefone' in tipo.lower():
-            return self.faker.phone_number()
-        elif 'endereço' in tipo.lower():
-            return self.faker.address()
-        elif 'número' in tipo.lower():
-            return str(self.faker.random_number(digits=5))
-        return self.faker.text(max_nb_chars=20)
-
-    def _configurar_driver(self, navegador):
-        """Configuração robusta de WebDrivers"""
-        try:
-            if navegador == 'Chrome':
-                service = ChromeService(ChromeDriverManager().install())
-                options = webdriver.ChromeOptions()
-                options.add_argument('--log-level=3')
-                options.add_argument('--disable-gpu')
-                options.add_argument('--no-sandbox')
-                return webdriver.Chrome(service=service, options=options)
-            
-            elif navegador == 'Firefox':
-                service = FirefoxService(GeckoDriverManager().install())
-                options = webdriver.FirefoxOptions()
-                options.add_argument('--log-level=fatal')
-                return webdriver.Firefox(service=service, options=options)
-            
-            elif navegador == 'Edge':
-                service = EdgeService(EdgeChromiumDriverManager().install())
-                options = webdriver.EdgeOptions()
-                options.add_argument('--log-level=3')
-                return webdriver.Edge(service=service, options=options)
-        
-        except WebDriverException as e:
-            logging.error(f"Erro ao configurar WebDriver: {e}")
-            QMessageBox.critical(self, "Erro de Driver", 
-                                 f"Não foi possível iniciar o navegador {navegador}. "
-                                 "Verifique a instalação do driver.")
-            return None
+            self.log_area.appendPlainText(f"📂 Configuração carregada de: {nome_arquivo}")
 
-    def _salvar_screenshot(self, erro_msg):
-        """Salva screenshot de erro com timestamp"""
-        if not self.driver:
+    def executar_testes(self):
+        if self.worker and self.worker.isRunning():
             return
 
+        navegador = self.tipo_navegador.currentText()
         try:
-            import datetime
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            nome_arquivo = f"{self.screenshot_dir}/erro_{timestamp}.png"
-            
-            self.driver.save_screenshot(nome_arquivo)
-            
-            self.log_area.append(f"🖼️ Screenshot de erro salvo em: {nome_arquivo}")
-            logging.info(f"Screenshot de erro salvo: {nome_arquivo}")
-        
-        except Exception as e:
-            logging.error(f"Erro ao salvar screenshot: {e}")
-            self.log_area.append(f"❌ Falha ao salvar screenshot: {e}")
+            plano = compilar_suite(self._suite_atual())
+        except ErroValidacao as e:
+            QMessageBox.warning(self, "Configuração Inválida", str(e))
+            return
+        if plano.colunas:
+            # Sem o conjunto de dados, o texto 'dados:coluna' seria digitado literalmente na página.
+            QMessageBox.warning(self, "Suíte com Conjunto de Dados",
+                                f"Os passos usam colunas de um conjunto de dados "
+                                f"({', '.join(sorted(plano.colunas))}). Execute a suíte pela linha de comando:\n\n"
+                                f"python -m e2e executar suite.json --dados ARQUIVO.csv")
+            return
 
-    def executar_testes(self):
-        try:
-            self.log_area.clear()
-            self.log_area.append("🚀 Iniciando execução dos testes...")
-            
-            navegador = self.tipo_navegador.currentText()
-            
-            self.log_area.append(f"🔧 Configurando navegador: {navegador}")
-            self.driver = self._configurar_driver(navegador)
-            
-            if not self.driver:
-                return
-
-            url = self.url_input.text()
-            self.driver.get(url)
-            self.log_area.append(f"🌐 Navegando para: {url}")
-
-            wait = WebDriverWait(self.driver, 20)
-            actions = ActionChains(self.driver)
-
-            for linha in range(self.tabela_elementos.rowCount()):
-                elemento = self.tabela_elementos.item(linha, 0).text()
-                tipo_seletor = self.tabela_elementos.cellWidget(linha, 1).currentText()
-                seletor = self.tabela_elementos.item(linha, 2).text()
-                acao = self.tabela_elementos.cellWidget(linha, 3).currentText()
-                valor = self.tabela_elementos.item(linha, 4).text()
-
-                self.log_area.append(f"⏳ Processando elemento: {elemento}")
-
-                metodos_selecao = {
-                    'ID': By.ID,
-                    'Name': By.NAME,
-                    'XPath': By.XPATH,
-                    'CSS Selector': By.CSS_SELECTOR,
-                    'Class Name': By.CLASS_NAME,
-                    'Link Text': By.LINK_TEXT
-                }
-
-                try:
-                    elemento_web = wait.until(
-                        EC.presence_of_element_located((metodos_selecao[tipo_seletor], seletor))
-                    )
-
-                    self.driver.execute_script("arguments[0].scrollIntoView(true);", elemento_web)
-                    wait.until(EC.visibility_of(elemento_web))
-
-                    def safe_interaction():
-                        valor_processado = valor
-                        if valor.lower().startswith('random:'):
-                            valor_processado = self._gerar_valor_aleatorio(valor.split(':')[1])
-
-                        try:
-                            if acao == 'Inserir Texto':
-                                self.driver.execute_script("arguments[0].value = '';", elemento_web)
-                                elemento_web.send_keys(valor_processado)
-                                self.log_area.append(f"✏️ Inserindo texto em {elemento}: {valor_processado}")
-                            
-                            elif acao == 'Clicar':
-                                self.driver.execute_script("arguments[0].click();", elemento_web)
-                                self.log_area.append(f"👆 Clicando em {elemento}")
-                            
-                            elif acao == 'Verificar Texto':
-                                texto_atual = elemento_web.text
-                                if valor in texto_atual:
-                                    self.log_area.append(f"✅ Verificação de texto OK para {elemento}")
-                                else:
-                                    erro_msg = f"❌ Falha na verificação de texto para {elemento}"
-                                    self.log_area.append(erro_msg)
-                                    self._salvar_screenshot(erro_msg)
-                            
-                            elif acao == 'Verificar Existência':
-                                if elemento_web:
-                                    self.log_area.append(f"✅ Elemento {elemento} existe")
-
-                        except Exception as erro_interacao:
-                            erro_msg = f"❌ Erro na interação com {elemento}: {erro_interacao}"
-                            self.log_area.append(erro_msg)
-                            logging.error(erro_msg)
-                            self._salvar_screenshot(erro_msg)
-
-                    safe_interaction()
-
-                except Exception as e:
-                    erro_msg = f"❌ Erro no elemento {elemento}: {str(e)}"
-                    self.log_area.append(erro_msg)
-                    logging.error(erro_msg)
-                    self._salvar_screenshot(erro_msg)
-
-            self.log_area.append("✅ Testes concluídos!")
+        self.log_area.clear()
+        self.log_area.appendPlainText("🚀 Iniciando execução dos testes...")
+        
+        from e2e.execucao import ExecutorTestes
+        pool = self.pool if self.reutilizar_navegador.isChecked() else None
+        executor = ExecutorTestes(navegador, self.screenshot_dir, pool=pool, estados=self.estados,
+                                  metricas=self.metricas_pagina.isChecked())
+
+        self.worker = ExecucaoWorker(executor, plano, self, historico=self.historico)
+        self.worker.erro_driver.connect(self._mostrar_erro_driver)
+        self.worker.finished.connect(self._execucao_finalizada)
+
+        self.executar_btn.setEnabled(False)
+        self.parar_btn.setEnabled(True)
+        self.worker.start()
+        self.timer_log.start()
+
+    def parar_testes(self):
+        if self.worker and self.worker.isRunning():
+            self.parar_btn.setEnabled(False)
+            self.log_area.appendPlainText("⏹️ Cancelando execução...")
+            self.worker.cancelar()
+
+    def _descarregar_log(self):
+        if self.worker:
+            mensagens = self.worker.coletar_mensagens()
+            if mensagens:
+                self.log_area.appendPlainText("\n".join(mensagens))
+
+    def _alternar_reutilizacao(self, ativo):
+        if not ativo and not (self.worker and self.worker.isRunning()):
+            self.pool.encerrar_todas()
+
+    def _mostrar_erro_driver(self, mensagem):
+        QMessageBox.critical(self, "Erro de Driver", mensagem)
+
+    def _execucao_finalizada(self):
+        self.timer_log.stop()
+        self._descarregar_log()
+        if not self.reutilizar_navegador.isChecked():
+            self.pool.encerrar_todas()
+        self.executar_btn.setEnabled(True)
+        self.parar_btn.setEnabled(False)
+
+    def closeEvent(self, event):
+        if self.worker and self.worker.isRunning():
+            self.worker.cancelar()
+            self.worker.wait()
+        self.pool.encerrar_todas()
+        super().closeEvent(event)
+
+def _janela_exibida(app, imprimir_relatorio):
+    inicializacao.marcar('primeira exibição')
+    logging.info(inicializacao.resumo())
+    adiados = inicializacao.modulos_adiados_carregados()
+    if adiados:
+        logging.warning(f"Módulos carregados antes do primeiro uso na inicialização: {', '.join(adiados)}")
+    if imprimir_relatorio:
+        print(json.dumps(inicializacao.relatorio(), ensure_ascii=False), flush=True)
+        app.quit()
 
-        except Exception as erro:
-            erro_msg = f"❌ Erro crítico durante execução dos testes: {erro}"
-            logging.error(erro_msg)
-            self.log_area.append(erro_msg)
-            
-            if self.driver:
-                self._salvar_screenshot(erro_msg)
-        
-        finally:
-            if self.driver:
-                try:
-                    self.driver.quit()
-                    self.log_area.append("🔒 Navegador encerrado")
-                except Exception as e:
-                    logging.warning(f"Erro ao fechar navegador: {e}")
 
 def main():
-    app = QApplication(sys.argv)
+    parser = argparse.ArgumentParser(description='Sistema de Testes Automatizados E2E')
+    parser.add_argument('--relatorio-inicializacao', action='store_true',
+                        help='Mostra o tempo de cada etapa da inicialização em JSON e fecha ao exibir a janela')
+    args, argumentos_qt = parser.parse_known_args()
+
+    configurar_logging(console=True)
+    app = QApplication(sys.argv[:1] + argumentos_qt)
     app.setAttribute(Qt.AA_EnableHighDpiScaling)
     app.setAttribute(Qt.AA_UseHighDpiPixmaps)
     
     font = QFont("Segoe UI", 9)
     app.setFont(font)
+    inicializacao.marcar('QApplication')
 
     try:
         teste_app = TesteAutomatizadoE2E()
+        inicializacao.marcar('criação da janela')
         teste_app.show()
+        # Executado quando o laço de eventos processa a exibição da janela.
+        QTimer.singleShot(0, lambda: _janela_exibida(app, args.relatorio_inicializacao))
         sys.exit(app.exec_())
     except Exception as e:
         logging.critical(f"Erro fatal na aplicação: {e}")
         QMessageBox.critical(None, "Erro Crítico", str(e))
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
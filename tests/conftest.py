@@ -0,0 +1,38 @@
+"""Fixtures compartilhadas: site de teste e WebDriver local dos benchmarks.
+
+Os testes que precisam de um navegador usam o WebDriver local
+(benchmarks/webdriver_local.py), que responde ao protocolo sem abrir um
+navegador de verdade.
+"""
+import pytest
+
+from benchmarks.site import SiteTeste
+from benchmarks.webdriver_local import ServidorWebDriver
+from e2e.pool import PoolSessoes
+
+
+@pytest.fixture(scope='session')
+def site():
+    servidor = SiteTeste().iniciar()
+    yield servidor
+    servidor.encerrar()
+
+
+@pytest.fixture(scope='session')
+def servidor_webdriver():
+    servidor = ServidorWebDriver().iniciar()
+    yield servidor
+    servidor.encerrar()
+
+
+@pytest.fixture
+def pool_local(servidor_webdriver):
+    """PoolSessoes cujas sessões são abertas no WebDriver local."""
+    from selenium import webdriver
+
+    def fabrica(navegador, perfil=None):
+        return webdriver.Remote(command_executor=servidor_webdriver.url, options=webdriver.ChromeOptions())
+
+    pool = PoolSessoes(fabrica=fabrica)
+    yield pool
+    pool.encerrar_todas()
@@ -0,0 +1,123 @@
+import json
+
+import pytest
+
+from benchmarks.site import gerar_elementos
+from e2e.conjuntos import ExecucaoConjunto, ler_linhas, linhas_concluidas, validar_colunas
+from e2e.dados import PoolDados
+from e2e.plano import ErroValidacao, compilar
+
+LINHAS = [{'nome': 'Ana'}, {'nome': 'Bruno'}, {'nome': 'Carla'}, {'nome': 'Davi'}, {'nome': 'Eva'}]
+
+
+@pytest.fixture
+def plano(site):
+    # Passo 1 vem da coluna 'nome'; o passo 2 é um random:email.
+    elementos = gerar_elementos(3)
+    elementos[0]['valor'] = 'dados:nome'
+    return compilar(elementos, site.url_suite(3), 'Cadastro', 'Chrome')
+
+
+def _gravar_jsonl(caminho, registros):
+    caminho.write_text(''.join(f"{json.dumps(registro)}\n" for registro in registros), encoding='utf-8')
+    return str(caminho)
+
+
+def _executar(plano, caminho_dados, caminho_resultados, pool, semente, retomar=False, monkeypatch=None):
+    """Executa o conjunto; devolve (resumo, {linha: valores usados})."""
+    execucao = ExecucaoConjunto(plano, caminho_dados, str(caminho_resultados), pool=pool, retomar=retomar,
+                                screenshot_dir=str(caminho_resultados.parent / 'screenshots'),
+                                opcoes_executor={'dados': PoolDados(semente)})
+    usados = {}
+    executar_linha = execucao._executar_linha
+
+    def espiar(numero, valores):
+        usados[numero] = dict(valores)
+        return executar_linha(numero, valores)
+    monkeypatch.setattr(execucao, '_executar_linha', espiar)
+    return execucao.executar(), usados
+
+
+def test_ler_linhas_csv_e_jsonl(tmp_path):
+    csv = tmp_path / 'dados.csv'
+    csv.write_text('﻿nome,email\nAna,a@x.test\nBruno,b@x.test\n', encoding='utf-8')
+    assert list(ler_linhas(str(csv))) == [(1, {'nome': 'Ana', 'email': 'a@x.test'}, ''),
+                                          (2, {'nome': 'Bruno', 'email': 'b@x.test'}, '')]
+
+    jsonl = tmp_path / 'dados.jsonl'
+    jsonl.write_text('{"nome": "Ana"}\n\n{quebrado\n[1, 2]\n{"nome": "Eva"}\n', encoding='utf-8')
+    linhas = list(ler_linhas(str(jsonl)))
+    assert [(numero, registro) for numero, registro, _ in linhas] == [
+        (1, {'nome': 'Ana'}), (2, {}), (3, {}), (4, {'nome': 'Eva'})]
+    assert linhas[1][2].startswith('JSON inválido')
+    assert linhas[2][2] == 'o registro não é um objeto JSON'
+
+    with pytest.raises(ValueError, match='não suportado'):
+        list(ler_linhas(str(tmp_path / 'dados.xlsx')))
+
+
+def test_validar_colunas(plano, tmp_path):
+    validar_colunas(plano, _gravar_jsonl(tmp_path / 'ok.jsonl', LINHAS))
+    with pytest.raises(ErroValidacao, match="Coluna 'nome'"):
+        validar_colunas(plano, _gravar_jsonl(tmp_path / 'outro.jsonl', [{'email': 'a@x.test'}]))
+
+
+def test_linhas_concluidas_ignora_registro_incompleto(tmp_path):
+    resultados = tmp_path / 'resultados.jsonl'
+    resultados.write_text('{"linha": 1}\n{"linha": 2}\n{"linha": 3, "pas', encoding='utf-8')
+    assert linhas_concluidas(str(resultados)) == {1, 2}
+    assert linhas_concluidas(str(tmp_path / 'nao_existe.jsonl')) == set()
+
+
+def test_executa_uma_vez_por_linha(plano, tmp_path, pool_local, monkeypatch):
+    dados = _gravar_jsonl(tmp_path / 'dados.jsonl', [{'nome': 'Ana'}, {'outra': 'x'}, {'nome': 'Carla'}])
+    with open(dados, 'a', encoding='utf-8') as arquivo:
+        arquivo.write('{quebrado\n')
+    resultados = tmp_path / 'resultados.jsonl'
+
+    resumo, usados = _executar(plano, dados, resultados, pool_local, 1, monkeypatch=monkeypatch)
+
+    assert resumo == {'linhas': 4, 'aprovadas': 2, 'falhas': 2, 'puladas': 0, 'cancelado': False, 'erro': ''}
+    assert sorted(usados) == [1, 3]
+    assert usados[1][0] == 'Ana' and usados[3][0] == 'Carla'
+    registros = {registro['linha']: registro for registro in map(json.loads, resultados.read_text().splitlines())}
+    assert sorted(registros) == [1, 2, 3, 4]
+    assert registros[2]['erro'] == "Coluna 'nome' ausente na linha"
+    assert registros[4]['erro'].startswith('JSON inválido')
+
+
+def test_retomar_pula_linhas_concluidas_e_mantem_os_random(plano, tmp_path, pool_local, monkeypatch):
+    registros = LINHAS[:2] + [{'outra': 'x'}] + LINHAS[2:]
+    dados = _gravar_jsonl(tmp_path / 'dados.jsonl', registros)
+
+    completo = tmp_path / 'completo' / 'resultados.jsonl'
+    _, esperados = _executar(plano, dados, completo, pool_local, 42, monkeypatch=monkeypatch)
+    assert len({valores[1] for valores in esperados.values()}) == len(esperados)
+
+    # Simula uma interrupção durante a linha 4: três linhas gravadas e um registro pela metade.
+    interrompido = tmp_path / 'interrompido' / 'resultados.jsonl'
+    interrompido.parent.mkdir()
+    gravadas = completo.read_text(encoding='utf-8').splitlines(keepends=True)[:3]
+    interrompido.write_text(''.join(gravadas) + '{"linha": 4, "pas', encoding='utf-8')
+
+    resumo, usados = _executar(plano, dados, interrompido, pool_local, 42, retomar=True, monkeypatch=monkeypatch)
+
+    assert resumo['puladas'] == 3
+    assert resumo['linhas'] == 3
+    assert sorted(usados) == [4, 5, 6]
+    assert usados == {numero: esperados[numero] for numero in (4, 5, 6)}
+    # Linhas com erro de dados são gravadas na hora; as demais, quando terminam.
+    numeros = [json.loads(texto)['linha'] for texto in interrompido.read_text(encoding='utf-8').splitlines()]
+    assert sorted(numeros) == [1, 2, 3, 4, 5, 6]
+
+
+def test_erro_de_leitura_interrompe_o_conjunto(plano, tmp_path, pool_local, monkeypatch):
+    # O arquivo é decodificado em blocos: o texto longo afasta o byte inválido das linhas anteriores.
+    dados = tmp_path / 'dados.jsonl'
+    dados.write_bytes(b'{"nome": "Ana"}\n{"nome": "Bia"}\n{"nome": "Caio", "obs": "' + b'x' * 100000
+                      + b'\xff"}\n')
+    resumo, usados = _executar(plano, str(dados), tmp_path / 'resultados.jsonl', pool_local, 1,
+                               monkeypatch=monkeypatch)
+    assert resumo['erro']
+    assert resumo['linhas'] == 2
+    assert sorted(usados) == [1, 2]
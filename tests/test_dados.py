@@ -0,0 +1,79 @@
+import re
+import threading
+
+from e2e.dados import TIPOS_UNICOS, PoolDados, _digitos_verificadores
+from e2e.plano import compilar
+
+URL = 'http://exemplo.test/'
+
+
+def _plano(*valores, locale=None):
+    return compilar([{'elemento': f"Campo {i}", 'tipo_seletor': 'ID', 'seletor': f"campo_{i}",
+                      'acao': 'Inserir Texto', 'valor': valor} for i, valor in enumerate(valores)], URL,
+                    locale=locale)
+
+
+def test_mesma_semente_reproduz_os_valores():
+    plano = _plano('random:nome', 'random:email', 'random:cpf', 'fixo')
+    primeira, segunda = PoolDados(7), PoolDados(7)
+    assert [primeira.reservar(plano) for _ in range(3)] == [segunda.reservar(plano) for _ in range(3)]
+    assert PoolDados(8).reservar(plano) != PoolDados(7).reservar(plano)
+
+
+def test_reserva_so_os_passos_random():
+    valores = PoolDados(1).reservar(_plano('fixo', 'random:telefone', 'dados:coluna'))
+    assert list(valores) == [1]
+
+
+def test_preparar_nao_altera_a_sequencia():
+    plano = _plano('random:email', 'random:uuid')
+    preparado = PoolDados(3, tamanho_bloco=2)
+    preparado.preparar([plano, plano])
+    sob_demanda = PoolDados(3, tamanho_bloco=2)
+    assert [preparado.reservar(plano) for _ in range(4)] == [sob_demanda.reservar(plano) for _ in range(4)]
+
+
+def test_semente_sorteada_fica_registrada():
+    dados = PoolDados()
+    assert isinstance(dados.semente, int)
+    assert PoolDados(dados.semente).proximo('nome') == dados.proximo('nome')
+
+
+def test_cada_locale_tem_a_sua_sequencia():
+    dados = PoolDados(5)
+    assert dados.reservar(_plano('random:nome', locale='pt_BR')) == PoolDados(5, 'pt_BR').reservar(
+        _plano('random:nome'))
+    # Consumir em um locale não avança a sequência do outro.
+    assert dados.proximo('nome') == PoolDados(5).proximo('nome')
+
+
+def test_tipos_unicos_nao_se_repetem_entre_threads():
+    dados = PoolDados(11, tamanho_bloco=16)
+    valores = {tipo: [] for tipo in TIPOS_UNICOS}
+
+    def consumir():
+        for _ in range(50):
+            for tipo in TIPOS_UNICOS:
+                valores[tipo].append(dados.proximo(tipo))
+
+    threads = [threading.Thread(target=consumir) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for tipo, gerados in valores.items():
+        assert len(gerados) == 200
+        assert len(set(gerados)) == 200, tipo
+
+
+def test_cpf_e_cnpj_tem_digitos_verificadores_validos():
+    dados = PoolDados(13)
+    for _ in range(20):
+        cpf = [int(digito) for digito in re.sub(r'\D', '', dados.proximo('cpf'))]
+        assert cpf[9] == _digitos_verificadores(cpf[:9], range(10, 1, -1))
+        assert cpf[10] == _digitos_verificadores(cpf[:10], range(11, 1, -1))
+
+        cnpj = [int(digito) for digito in re.sub(r'\D', '', dados.proximo('cnpj'))]
+        pesos = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+        assert cnpj[12] == _digitos_verificadores(cnpj[:12], pesos)
+        assert cnpj[13] == _digitos_verificadores(cnpj[:13], [6] + pesos)
@@ -0,0 +1,128 @@
+import datetime
+import sqlite3
+
+import pytest
+
+from e2e.execucao import ResultadoPasso, ResultadoSuite
+from e2e.historico import INDICE_NAVEGACAO, HistoricoExecucoes, percentil, tabela_metricas, tabela_regressoes
+from e2e.plano import compilar
+
+URL = 'http://exemplo.test/'
+
+
+@pytest.fixture
+def historico(tmp_path):
+    return HistoricoExecucoes(str(tmp_path / 'historico.sqlite3'))
+
+
+@pytest.fixture
+def plano():
+    return compilar([{'elemento': nome, 'tipo_seletor': 'ID', 'seletor': nome, 'acao': 'Clicar'}
+                     for nome in ('Entrar', 'Salvar')], URL, 'Cadastro', 'Chrome')
+
+
+def _resultado(plano, *duracoes, sucesso=True, **campos):
+    passos = [ResultadoPasso(passo.elemento, passo.acao, sucesso, '' if sucesso else 'timeout', duracao=duracao)
+              for passo, duracao in zip(plano.passos, duracoes)]
+    return ResultadoSuite(plano.nome, passos, **campos)
+
+
+def test_percentil_interpola():
+    assert percentil([], 50) == 0.0
+    assert percentil([1, 2, 3, 4], 50) == 2.5
+    assert percentil([10, 0], 95) == pytest.approx(9.5)
+
+
+def test_registra_execucao_com_passos(historico, plano):
+    assert historico.registrar(plano, _resultado(plano, 0.1, 0.2)) is not None
+    assert historico.duracoes(plano.hash_conteudo, 'Chrome', 'padrao', URL, 10) == {
+        (0, 'Entrar'): [0.1], (1, 'Salvar'): [0.2]}
+    assert historico.motivo_execucao(plano) == ''
+
+
+def test_execucao_cancelada_ou_vazia_nao_entra(historico, plano):
+    assert historico.registrar(plano, _resultado(plano, 0.1, cancelado=True)) is None
+    assert historico.registrar(plano, _resultado(plano)) is None
+    assert historico.chaves() == []
+
+
+def test_erro_antes_do_primeiro_passo_fica_como_falha(historico, plano):
+    assert historico.registrar(plano, _resultado(plano, erro='navegador não abriu')) is not None
+    assert historico.motivo_execucao(plano) == 'falhou na última execução'
+    assert historico.duracoes(plano.hash_conteudo, 'Chrome', 'padrao', URL, 10) == {}
+
+
+def test_motivo_execucao(historico, plano):
+    assert historico.motivo_execucao(plano) == 'nova ou alterada desde a última execução'
+    historico.registrar(plano, _resultado(plano, 0.1, 0.2, sucesso=False))
+    assert historico.motivo_execucao(plano) == 'falhou na última execução'
+    historico.registrar(plano, _resultado(plano, 0.1, 0.2))
+    assert historico.motivo_execucao(plano) == ''
+    # Outro navegador (ou URL) é outra chave.
+    assert historico.motivo_execucao(plano, navegador='Firefox') == 'nova ou alterada desde a última execução'
+
+    with historico._conectar() as conexao:
+        antigo = (datetime.datetime.now() - datetime.timedelta(days=2)).isoformat(timespec='seconds')
+        conexao.execute('UPDATE execucoes SET inicio = ?', (antigo,))
+    assert historico.motivo_execucao(plano).startswith('última aprovação há')
+    assert historico.motivo_execucao(plano, validade=None) == ''
+
+
+def test_regressao_so_acima_do_limiar_e_do_minimo(historico, plano):
+    for _ in range(10):
+        historico.registrar(plano, _resultado(plano, 0.100, 0.100))
+    for _ in range(5):
+        historico.registrar(plano, _resultado(plano, 0.300, 0.110))
+
+    regressoes = historico.relatorio(janela=10, recentes=5)
+    assert {(regressao.elemento, regressao.metrica) for regressao in regressoes} == {
+        ('Entrar', 'p50'), ('Entrar', 'p95')}
+    assert regressoes[0].base_ms == pytest.approx(100)
+    assert regressoes[0].atual_ms == pytest.approx(300)
+    assert regressoes[0].variacao == pytest.approx(2.0)
+    assert 'Cadastro' in tabela_regressoes(regressoes)
+
+
+def test_passos_com_falha_nao_entram_na_base(historico, plano):
+    for _ in range(10):
+        historico.registrar(plano, _resultado(plano, 20.0, 20.0, sucesso=False))
+    for _ in range(5):
+        historico.registrar(plano, _resultado(plano, 0.1, 0.1))
+    assert historico.relatorio(janela=10, recentes=5) == []
+
+
+def test_metricas_por_passo_e_da_navegacao(historico, plano):
+    for carregamento in (100.0, 200.0, 300.0):
+        resultado = _resultado(plano, 0.1, 0.2, metricas_navegacao={'carregamento_ms': carregamento})
+        resultado.passos[1].metricas = {'cls': 0.1}
+        historico.registrar(plano, resultado)
+
+    metricas = historico.metricas(plano.hash_conteudo, 'Chrome', 'padrao', URL, 2)
+    assert metricas == {(INDICE_NAVEGACAO, '', 'carregamento_ms'): [300.0, 200.0], (1, 'Salvar', 'cls'): [0.1, 0.1]}
+
+    resumo = {(linha['indice'], linha['metrica']): linha for linha in historico.resumo_metricas()}
+    assert resumo[(INDICE_NAVEGACAO, 'carregamento_ms')]['p50'] == 200.0
+    assert resumo[(INDICE_NAVEGACAO, 'carregamento_ms')]['amostras'] == 3
+    assert 'navegação inicial' in tabela_metricas(historico.resumo_metricas())
+
+
+def test_migra_banco_sem_perfil_e_sem_erro(tmp_path, plano):
+    caminho = str(tmp_path / 'antigo.sqlite3')
+    conexao = sqlite3.connect(caminho)
+    conexao.executescript("""
+        CREATE TABLE execucoes (id INTEGER PRIMARY KEY AUTOINCREMENT, inicio TEXT NOT NULL, suite TEXT NOT NULL,
+                                hash_suite TEXT NOT NULL, navegador TEXT NOT NULL, url TEXT NOT NULL,
+                                sucesso INTEGER NOT NULL, duracao REAL NOT NULL);
+        CREATE INDEX execucoes_chave ON execucoes (hash_suite, navegador, url, id);
+    """)
+    conexao.execute("INSERT INTO execucoes (inicio, suite, hash_suite, navegador, url, sucesso, duracao) "
+                    "VALUES (?, 'Cadastro', ?, 'Chrome', ?, 1, 0.3)",
+                    (datetime.datetime.now().isoformat(timespec='seconds'), plano.hash_conteudo, URL))
+    conexao.commit()
+    conexao.close()
+
+    historico = HistoricoExecucoes(caminho)
+    # A execução antiga passa a ter o perfil padrão e continua valendo.
+    assert historico.motivo_execucao(plano) == ''
+    assert historico.registrar(plano, _resultado(plano, erro='falhou ao abrir')) is not None
+    assert historico.motivo_execucao(plano) == 'falhou na última execução'
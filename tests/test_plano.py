@@ -0,0 +1,114 @@
+import pytest
+
+from e2e.plano import GERADOR_PADRAO, TIMEOUT_PADRAO, ErroValidacao, compilar, compilar_suite
+from e2e.suite import Suite
+
+URL = 'http://exemplo.test/'
+
+
+def _elemento(**campos):
+    return dict({'elemento': 'Campo', 'tipo_seletor': 'ID', 'seletor': 'campo', 'acao': 'Inserir Texto',
+                 'valor': 'texto'}, **campos)
+
+
+def _erros(elementos, **opcoes):
+    with pytest.raises(ErroValidacao) as excecao:
+        compilar(elementos, URL, **opcoes)
+    return excecao.value.erros
+
+
+def test_compila_passos_com_estrategia_gerador_e_coluna():
+    plano = compilar([
+        _elemento(valor='random:Email'),
+        _elemento(elemento='Nome', tipo_seletor='CSS Selector', seletor='#nome', valor='dados: nome '),
+        _elemento(elemento='Enviar', tipo_seletor='Link Text', seletor='Enviar', acao='Clicar', valor='',
+                  timeout=3),
+        _elemento(elemento='Outro', valor='random:algo desconhecido'),
+    ], URL, 'Cadastro', 'Firefox')
+
+    assert [passo.por for passo in plano.passos] == ['id', 'css selector', 'link text', 'id']
+    assert plano.passos[0].gerador == 'email'
+    assert plano.passos[3].gerador == GERADOR_PADRAO
+    assert plano.passos[1].coluna == 'nome'
+    assert plano.colunas == {'nome'}
+    assert plano.timeout_do_passo(plano.passos[2]) == 3.0
+    assert plano.timeout_do_passo(plano.passos[0]) == TIMEOUT_PADRAO
+    assert (plano.nome, plano.url, plano.navegador) == ('Cadastro', URL, 'Firefox')
+
+
+def test_hash_conteudo_ignora_url_e_navegador():
+    elementos = [_elemento()]
+    assert (compilar(elementos, URL, navegador='Chrome').hash_conteudo
+            == compilar(elementos, 'http://outro.test/', navegador='Edge').hash_conteudo)
+    assert compilar(elementos, URL).hash_conteudo != compilar([_elemento(valor='outro')], URL).hash_conteudo
+
+
+def test_reune_todos_os_erros_antes_de_abrir_o_navegador():
+    erros = _erros([
+        _elemento(tipo_seletor='Tag'),
+        _elemento(seletor=''),
+        _elemento(acao='Arrastar'),
+        _elemento(timeout=0),
+        _elemento(valor='dados:'),
+    ])
+    assert len(erros) == 5
+    assert "tipo de seletor desconhecido 'Tag'" in erros[0]
+    assert 'seletor vazio' in erros[1]
+    assert "ação desconhecida 'Arrastar'" in erros[2]
+    assert 'timeout' in erros[3]
+    assert 'coluna' in erros[4]
+
+
+@pytest.mark.parametrize('campo', ['tipo_seletor', 'seletor', 'acao', 'valor'])
+def test_campos_que_nao_sao_texto_viram_erro_de_validacao(campo):
+    erros = _erros([_elemento(**{campo: 42})])
+    assert erros == [f"Passo 1 (Campo): '{campo}' deve ser texto"]
+
+
+def test_passo_que_nao_e_objeto():
+    assert _erros(['campo']) == ["Passo 1: formato inválido"]
+
+
+def test_opcoes_da_suite_invalidas():
+    erros = _erros([_elemento()], timeout=-1, falha_rapida='sim', max_falhas_consecutivas=0,
+                   salvar_estado='login', restaurar_estado='login')
+    assert len(erros) == 4
+    assert _erros([_elemento()], max_falhas_consecutivas=True)
+    with pytest.raises(ErroValidacao, match='URL'):
+        compilar([_elemento()])
+
+
+def test_dependencias_por_nome_e_numero():
+    plano = compilar([
+        _elemento(elemento='Login'),
+        _elemento(elemento='Senha'),
+        _elemento(elemento='Entrar', depende_de=['Login', 2]),
+        _elemento(elemento='Login'),
+        _elemento(elemento='Sair', depende_de='Login'),
+    ], URL)
+    assert plano.passos[2].dependencias == (0, 1)
+    # Um nome repetido se refere à ocorrência mais recente.
+    assert plano.passos[4].dependencias == (3,)
+
+
+def test_dependencia_de_passo_posterior_ou_desconhecido():
+    erros = _erros([_elemento(elemento='A', depende_de=1), _elemento(elemento='B', depende_de='C')])
+    assert "depende_de 1 não é um passo anterior" in erros[0]
+    assert "depende_de 'C' não é um elemento anterior" in erros[1]
+
+
+def test_restaurar_estado_com_validade():
+    plano = compilar([_elemento()], URL, restaurar_estado={'nome': 'login', 'validade': 60})
+    assert (plano.restaurar_estado, plano.validade_estado) == ('login', 60.0)
+    erros = _erros([_elemento()], restaurar_estado={'nome': 'login', 'validade': 0, 'extra': 1})
+    assert len(erros) == 2
+
+
+def test_compilar_suite_usa_as_opcoes_gravadas():
+    suite = Suite('Login', [_elemento()], URL, 'Chrome',
+                  {'timeout': 5, 'falha_rapida': True, 'max_falhas_consecutivas': 2, 'perfil': 'rapido'})
+    plano = compilar_suite(suite)
+    assert plano.timeout == 5.0
+    assert plano.falha_rapida is True
+    assert plano.max_falhas_consecutivas == 2
+    assert plano.perfil.nome == 'rapido'
@@ -0,0 +1,54 @@
+from benchmarks.site import gerar_elementos
+from e2e.execucao import ExecutorTestes
+from e2e.plano import compilar
+from e2e.pool import origem_url
+
+
+def test_origem_url():
+    assert origem_url('https://exemplo.test:8443/a?b=1') == 'https://exemplo.test:8443'
+    assert origem_url('about:blank') is None
+    assert origem_url(None) is None
+
+
+def test_sessao_reutilizada_volta_limpa(site, servidor_webdriver, pool_local):
+    sessao = pool_local.obter('Chrome')
+    sessao.driver.get(site.url_suite(1))
+    # Outra origem visitada antes: sem CDP, o pool a visita de novo para limpar o storage.
+    sessao.origens.add(origem_url(servidor_webdriver.url))
+    navegador = servidor_webdriver.sessoes[sessao.driver.session_id]
+    navegador.storage['local']['token'] = 'abc'
+    navegador.storage['sessao']['carrinho'] = '1'
+    janela = sessao.driver.current_window_handle
+    pool_local.devolver(sessao)
+    assert sessao.origens == {origem_url(servidor_webdriver.url)}
+
+    reutilizada = pool_local.obter('Chrome')
+    assert reutilizada is sessao
+    assert reutilizada.usos == 1
+    assert navegador.storage == {'local': {}, 'sessao': {}}
+    assert reutilizada.origens == set()
+    assert reutilizada.driver.window_handles == [reutilizada.driver.current_window_handle]
+    assert reutilizada.driver.current_window_handle != janela
+    assert reutilizada.driver.current_url == 'about:blank'
+    pool_local.devolver(reutilizada)
+
+
+def test_sessao_com_problema_e_descartada(pool_local):
+    sessao = pool_local.obter('Chrome')
+    pool_local.devolver(sessao, saudavel=False)
+    assert pool_local.obter('Chrome') is not sessao
+
+
+def test_executor_registra_as_origens_visitadas(site, tmp_path, pool_local):
+    plano = compilar(gerar_elementos(3), site.url_suite(3), 'Origens', 'Chrome')
+    origens = []
+    devolver = pool_local.devolver
+
+    def espiar(sessao, saudavel=True):
+        origens.append(set(sessao.origens))
+        devolver(sessao, saudavel)
+    pool_local.devolver = espiar
+
+    resultado = ExecutorTestes('Chrome', str(tmp_path), pool=pool_local).executar_plano(plano)
+    assert resultado.sucesso
+    assert origens == [{origem_url(site.url)}]